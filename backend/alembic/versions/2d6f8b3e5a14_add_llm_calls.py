@@ -0,0 +1,49 @@
+"""add llm calls
+
+Revision ID: 2d6f8b3e5a14
+Revises: 7b4e9c1d2a63
+Create Date: 2026-10-16 15:42:18.204617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6f8b3e5a14'
+down_revision = '7b4e9c1d2a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_calls',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('pipeline_id', sa.Integer(), nullable=True),
+    sa.Column('operation', sa.String(length=32), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('cache', sa.String(length=16), nullable=False),
+    sa.Column('outcome', sa.String(length=16), nullable=False),
+    sa.Column('fallback_reason', sa.String(length=32), nullable=True),
+    sa.Column('coalesced', sa.Boolean(), nullable=False),
+    sa.Column('batched', sa.Boolean(), nullable=False),
+    sa.Column('streamed', sa.Boolean(), nullable=False),
+    sa.Column('hedged', sa.Boolean(), nullable=False),
+    sa.Column('retries', sa.SmallInteger(), nullable=False),
+    sa.Column('queue_wait_ms', sa.REAL(), nullable=True),
+    sa.Column('connect_ms', sa.REAL(), nullable=True),
+    sa.Column('first_token_ms', sa.REAL(), nullable=True),
+    sa.Column('latency_ms', sa.REAL(), nullable=True),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_llm_calls_created_at', 'llm_calls', ['created_at'], unique=False)
+    op.create_index('ix_llm_calls_pipeline_id_created_at', 'llm_calls', ['pipeline_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_calls_pipeline_id_created_at', table_name='llm_calls')
+    op.drop_index('ix_llm_calls_created_at', table_name='llm_calls')
+    op.drop_table('llm_calls')
@@ -0,0 +1,24 @@
+"""add pipeline lazy evaluation
+
+Revision ID: 3c1e5b7a9d20
+Revises: 9f3a7d6e193b
+Create Date: 2026-10-16 09:12:41.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1e5b7a9d20'
+down_revision = '9f3a7d6e193b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pipelines', sa.Column('lazy_evaluation', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('pipelines', 'lazy_evaluation')
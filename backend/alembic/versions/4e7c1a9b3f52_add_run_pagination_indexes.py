@@ -0,0 +1,35 @@
+"""add run pagination indexes
+
+Revision ID: 4e7c1a9b3f52
+Revises: 2d6f8b3e5a14
+Create Date: 2026-10-16 17:08:41.512093
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7c1a9b3f52'
+down_revision = '2d6f8b3e5a14'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_runs_created_at_id', ['created_at', 'id']),
+    ('ix_runs_pipeline_id_created_at_id', ['pipeline_id', 'created_at', 'id']),
+    ('ix_runs_application_id_created_at_id', ['application_id', 'created_at', 'id']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps runs writable while large tables are indexed; it
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'runs', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='runs', postgresql_concurrently=True)
@@ -0,0 +1,24 @@
+"""add pipeline deadline
+
+Revision ID: 5a8d2f4c6e31
+Revises: 3c1e5b7a9d20
+Create Date: 2026-10-16 10:03:27.204915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a8d2f4c6e31'
+down_revision = '3c1e5b7a9d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pipelines', sa.Column('deadline_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pipelines', 'deadline_ms')
@@ -0,0 +1,33 @@
+"""add sentiment verdicts
+
+Revision ID: 7b4e9c1d2a63
+Revises: 5a8d2f4c6e31
+Create Date: 2026-10-16 11:20:05.637102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4e9c1d2a63'
+down_revision = '5a8d2f4c6e31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sentiment_verdicts',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('normalized_purpose', sa.Text(), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('prompt_version', sa.String(length=20), nullable=False),
+    sa.Column('is_risky', sa.Boolean(), nullable=False),
+    sa.Column('assessment', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sentiment_verdicts')
@@ -0,0 +1,68 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable
+from fastapi import HTTPException, Query, Response
+
+# List endpoints return the cursor of the next page in this header, so the
+# body stays a plain list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Opaque cursor for the sort key values of the last row on a page"""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: dict[str, Callable[[Any], Any]]) -> dict[str, Any]:
+    """
+    Sort key values from a cursor made by ``encode_cursor``.
+
+    ``keys`` maps each expected key to a converter, e.g. ``int`` or
+    ``datetime.fromisoformat``. Anything else is rejected with 400.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        if not isinstance(position, dict) or set(position) != set(keys):
+            raise ValueError(cursor)
+        return {key: convert(position[key]) for key, convert in keys.items()}
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    rows: list[Any],
+    limit: int,
+    response: Response,
+    position: Callable[[Any], dict[str, Any]]
+) -> list[Any]:
+    """
+    Trim rows fetched with ``limit + 1`` to one page.
+
+    When there is a further page, its cursor (``position`` of the last row
+    kept) goes in the ``X-Next-Cursor`` header.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(position(rows[-1]))
+    return rows
+
+
+def reject_skip(
+    skip: int | None = Query(None, ge=0, deprecated=True, description="Removed, page with after")
+) -> None:
+    """
+    Refuse the offset parameter that list endpoints took before cursors.
+
+    Unknown query parameters are ignored, so without this an old client
+    paging with ``skip`` would get the first page on every request.
+    ``skip=0`` still means the first page and is allowed.
+    """
+    if skip:
+        raise HTTPException(
+            status_code=400,
+            detail=f"skip is no longer supported; pass the {NEXT_CURSOR_HEADER} header of the previous page as after"
+        )
@@ -1,3 +1,3 @@
-from app.api.routes import applications, pipelines, runs
+from app.api.routes import applications, pipelines, runs, telemetry
 
-__all__ = ["applications", "pipelines", "runs"]
+__all__ = ["applications", "pipelines", "runs", "telemetry"]
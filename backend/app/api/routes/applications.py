@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.api.pagination import MAX_PAGE_SIZE, decode_cursor, paginate, reject_skip
+from app.core.config import get_settings
 from app.core.database import get_db
 from app.models.application import Application
-from app.schemas.application import ApplicationCreate, ApplicationResponse
+from app.schemas.application import ApplicationCreate, ApplicationResponse, BulkApplicationResponse
+from app.services.bulk_ingest import TooManyRows, ingest_applications, iter_json_array, iter_ndjson
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -21,6 +26,42 @@ async def create_application(
     return db_application
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkApplicationResponse,
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": {"type": "array", "items": ApplicationCreate.model_json_schema()}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}}
+)
+async def create_applications_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many applications from a JSON array or an NDJSON stream"""
+    settings = get_settings()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        # Parsed as it arrives, so the whole body is never held at once
+        rows = iter_ndjson(request.stream())
+    else:
+        try:
+            rows = iter_json_array(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        return await ingest_applications(
+            db,
+            rows,
+            chunk_size=settings.APPLICATIONS_BULK_CHUNK_SIZE,
+            max_rows=settings.APPLICATIONS_BULK_MAX_ROWS
+        )
+    except TooManyRows as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
 @router.get("/{application_id}", response_model=ApplicationResponse)
 async def get_application(
     application_id: int,
@@ -38,15 +79,19 @@ async def get_application(
     return application
 
 
-@router.get("", response_model=list[ApplicationResponse])
+@router.get("", response_model=list[ApplicationResponse], dependencies=[Depends(reject_skip)])
 async def list_applications(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    after: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all applications"""
-    result = await db.execute(
-        select(Application).offset(skip).limit(limit)
-    )
-    applications = result.scalars().all()
-    return applications
+    """List applications in id order, one page per request (see X-Next-Cursor)"""
+    query = select(Application)
+
+    if after:
+        position = decode_cursor(after, {"id": int})
+        query = query.where(Application.id > position["id"])
+
+    result = await db.execute(query.order_by(Application.id).limit(limit + 1))
+    return paginate(result.scalars().all(), limit, response, lambda application: {"id": application.id})
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.api.pagination import MAX_PAGE_SIZE, decode_cursor, paginate, reject_skip
 from app.core.database import get_db
 from app.models.pipeline import Pipeline
 from app.schemas.pipeline import PipelineCreate, PipelineUpdate, PipelineResponse
 from app.services.step_registry import StepRegistry
+from app.services.pipeline_cache import pipeline_cache
 
 router = APIRouter(prefix="/pipelines", tags=["pipelines"])
 
@@ -36,7 +38,9 @@ async def create_pipeline(
         name=pipeline.name,
         description=pipeline.description,
         steps=steps_data,
-        terminal_rules=terminal_rules_data
+        terminal_rules=terminal_rules_data,
+        lazy_evaluation=pipeline.lazy_evaluation,
+        deadline_ms=pipeline.deadline_ms
     )
 
     db.add(db_pipeline)
@@ -67,18 +71,22 @@ async def get_pipeline(
     return pipeline
 
 
-@router.get("", response_model=list[PipelineResponse])
+@router.get("", response_model=list[PipelineResponse], dependencies=[Depends(reject_skip)])
 async def list_pipelines(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    after: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all pipelines"""
-    result = await db.execute(
-        select(Pipeline).offset(skip).limit(limit)
-    )
-    pipelines = result.scalars().all()
-    return pipelines
+    """List pipelines in id order, one page per request (see X-Next-Cursor)"""
+    query = select(Pipeline)
+
+    if after:
+        position = decode_cursor(after, {"id": int})
+        query = query.where(Pipeline.id > position["id"])
+
+    result = await db.execute(query.order_by(Pipeline.id).limit(limit + 1))
+    return paginate(result.scalars().all(), limit, response, lambda pipeline: {"id": pipeline.id})
 
 
 @router.put("/{pipeline_id}", response_model=PipelineResponse)
@@ -116,6 +124,7 @@ async def update_pipeline(
 
     await db.flush()
     await db.refresh(db_pipeline)
+    pipeline_cache.invalidate(pipeline_id)
 
     return db_pipeline
 
@@ -135,4 +144,5 @@ async def delete_pipeline(
         raise HTTPException(status_code=404, detail="Pipeline not found")
 
     await db.delete(pipeline)
+    pipeline_cache.invalidate(pipeline_id)
     return None
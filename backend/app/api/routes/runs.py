@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
+from typing import Literal
+from app.api.pagination import MAX_PAGE_SIZE, decode_cursor, paginate, reject_skip
 from app.core.database import get_db
-from app.models.application import Application
 from app.models.pipeline import Pipeline
 from app.models.run import Run
-from app.schemas.run import RunCreate, RunResponse
-from app.services.pipeline_executor import PipelineExecutor
+from app.core.config import get_settings
+from app.schemas.run import RunBatchCreate, RunBatchResponse, RunCreate, RunListItem, RunResponse, RunSummary
+from app.services.batch_runs import TooManyApplications, run_pipeline_batch
+from app.services.run_inputs import (
+    PipelineCompileError,
+    compile_plan,
+    executor_inputs,
+    insert_run,
+    load_run_inputs,
+)
+from app.services.run_listing import RunSort, cursor_keys, cursor_position, needs_join, run_list_query
+from app.services.streamed_reasons import attach_streamed_reasons, pending_reason_ids
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
@@ -15,47 +26,30 @@ router = APIRouter(prefix="/runs", tags=["runs"])
 @router.post("", response_model=RunResponse, status_code=201)
 async def create_run(
     run: RunCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Execute a pipeline on an application"""
-    # Fetch application
-    app_result = await db.execute(
-        select(Application).where(Application.id == run.application_id)
-    )
-    application = app_result.scalar_one_or_none()
+    # Application and pipeline version in one query, compiled plan from cache
+    try:
+        application, executor = await load_run_inputs(db, run.application_id, run.pipeline_id)
+    except PipelineCompileError as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {str(e)}")
 
-    if not application:
+    if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    # Fetch pipeline
-    pipe_result = await db.execute(
-        select(Pipeline).where(Pipeline.id == run.pipeline_id)
-    )
-    pipeline = pipe_result.scalar_one_or_none()
-
-    if not pipeline:
+    if executor is None:
         raise HTTPException(status_code=404, detail="Pipeline not found")
 
-    # Execute pipeline
-    executor = PipelineExecutor(
-        steps_config=pipeline.steps,
-        terminal_rules=pipeline.terminal_rules
-    )
-
     try:
-        final_status, step_logs = await executor.execute(
-            applicant_name=application.applicant_name,
-            amount=application.amount,
-            monthly_income=application.monthly_income,
-            declared_debts=application.declared_debts,
-            country=application.country,
-            loan_purpose=application.loan_purpose
-        )
+        final_status, step_logs = await executor.execute(**executor_inputs(application))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {str(e)}")
 
     # Create run record
-    db_run = Run(
+    db_run = await insert_run(
+        db,
         application_id=run.application_id,
         pipeline_id=run.pipeline_id,
         status=final_status,
@@ -63,13 +57,54 @@ async def create_run(
         completed_at=datetime.utcnow()
     )
 
-    db.add(db_run)
-    await db.flush()
-    await db.refresh(db_run)
+    # Reasons still streaming are written into the run once they arrive,
+    # after this session has committed
+    reason_ids = pending_reason_ids(step_logs)
+    if reason_ids:
+        background_tasks.add_task(attach_streamed_reasons, db_run["id"], reason_ids)
 
     return db_run
 
 
+@router.post("/batch", response_model=RunBatchResponse)
+async def create_runs_batch(
+    batch: RunBatchCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """Execute a pipeline on many applications, selected by id or by filter"""
+    pipe_result = await db.execute(
+        select(Pipeline).where(Pipeline.id == batch.pipeline_id)
+    )
+    pipeline = pipe_result.scalar_one_or_none()
+
+    if not pipeline:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+
+    try:
+        executor = compile_plan(pipeline)
+    except PipelineCompileError as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {str(e)}")
+
+    settings = get_settings()
+    try:
+        return await run_pipeline_batch(
+            db,
+            pipeline.id,
+            executor,
+            application_ids=batch.application_ids,
+            application_filter=batch.filter.model_dump() if batch.filter else None,
+            chunk_size=settings.RUNS_BATCH_CHUNK_SIZE,
+            concurrency=settings.RUNS_BATCH_CONCURRENCY,
+            on_pending_reasons=lambda run_id, reason_ids: background_tasks.add_task(
+                attach_streamed_reasons, run_id, reason_ids
+            ),
+            max_applications=settings.RUNS_BATCH_MAX_APPLICATIONS
+        )
+    except TooManyApplications as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
 @router.get("/{run_id}", response_model=RunResponse)
 async def get_run(
     run_id: int,
@@ -87,25 +122,60 @@ async def get_run(
     return run
 
 
-@router.get("", response_model=list[RunResponse])
+@router.get(
+    "",
+    response_model=list[RunListItem] | list[RunSummary],
+    dependencies=[Depends(reject_skip)]
+)
 async def list_runs(
+    response: Response,
     application_id: int | None = None,
     pipeline_id: int | None = None,
-    skip: int = 0,
-    limit: int = 100,
+    status: list[str] | None = Query(None),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    search: str | None = None,
+    sort: RunSort = "-created_at",
+    include_names: bool = False,
+    view: Literal["full", "summary"] = "full",
+    after: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all runs with optional filters"""
-    query = select(Run)
-
-    if application_id:
-        query = query.where(Run.application_id == application_id)
-
-    if pipeline_id:
-        query = query.where(Run.pipeline_id == pipeline_id)
-
-    query = query.offset(skip).limit(limit).order_by(Run.created_at.desc())
-
-    result = await db.execute(query)
-    runs = result.scalars().all()
-    return runs
+    """
+    List runs matching the filters, one page per request (see X-Next-Cursor).
+
+    ``view=summary`` leaves out step logs; get them from ``GET /runs/{id}``.
+    """
+    position = None
+    if after:
+        position = decode_cursor(after, cursor_keys(sort))
+        if position["sort"] != sort:
+            raise HTTPException(status_code=400, detail="Cursor belongs to a different sort order")
+
+    result = await db.execute(run_list_query(
+        sort=sort,
+        application_id=application_id,
+        pipeline_id=pipeline_id,
+        statuses=status,
+        created_from=created_from,
+        created_to=created_to,
+        search=search,
+        include_names=include_names,
+        summary=view == "summary",
+        after=position,
+        limit=limit
+    ))
+    if needs_join(sort, search, include_names):
+        rows = [tuple(row) for row in result.all()]
+    else:
+        rows = [(run, None, None) for run in result.scalars().all()]
+
+    page = paginate(rows, limit, response, lambda row: cursor_position(sort, *row))
+    item = RunSummary if view == "summary" else RunListItem
+    return [
+        item.model_validate(run).model_copy(
+            update={"applicant_name": applicant_name, "pipeline_name": pipeline_name} if include_names else {}
+        )
+        for run, applicant_name, pipeline_name in page
+    ]
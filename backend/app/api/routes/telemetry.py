@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, cast, func, literal_column, select
+from datetime import datetime, timedelta, timezone
+from app.core.database import get_db
+from app.models.llm_call import LlmCall
+from app.schemas.telemetry import LlmCallStats
+
+router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+
+
+def _percentile(fraction: float, column, name: str):
+    return func.percentile_cont(fraction).within_group(column).label(name)
+
+
+@router.get("/llm-calls", response_model=list[LlmCallStats])
+async def llm_call_stats(
+    pipeline_id: int | None = None,
+    operation: str = "sentiment",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """LLM call counts, tokens and latency percentiles per pipeline and day"""
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(days=7)
+
+    # Inlined so the grouped expression is identical in SELECT and GROUP BY
+    day = cast(func.timezone(literal_column("'UTC'"), LlmCall.created_at), Date).label("day")
+    query = (
+        select(
+            LlmCall.pipeline_id,
+            day,
+            func.count().label("calls"),
+            func.count().filter(LlmCall.cache.in_(("memory", "database"))).label("cache_hits"),
+            func.count().filter(LlmCall.outcome == "fallback").label("fallbacks"),
+            func.coalesce(func.sum(LlmCall.retries), 0).label("retries"),
+            func.coalesce(func.sum(LlmCall.prompt_tokens), 0).label("prompt_tokens"),
+            func.coalesce(func.sum(LlmCall.completion_tokens), 0).label("completion_tokens"),
+            _percentile(0.5, LlmCall.latency_ms, "latency_ms_p50"),
+            _percentile(0.95, LlmCall.latency_ms, "latency_ms_p95"),
+            _percentile(0.99, LlmCall.latency_ms, "latency_ms_p99"),
+            _percentile(0.5, LlmCall.first_token_ms, "first_token_ms_p50"),
+            _percentile(0.95, LlmCall.first_token_ms, "first_token_ms_p95"),
+            _percentile(0.95, LlmCall.queue_wait_ms, "queue_wait_ms_p95"),
+            # Reused connections report 0; only calls that opened one count
+            func.percentile_cont(0.95).within_group(func.nullif(LlmCall.connect_ms, 0)).label("connect_ms_p95"),
+        )
+        .where(LlmCall.operation == operation, LlmCall.created_at >= since)
+        .group_by(LlmCall.pipeline_id, day)
+        .order_by(day.desc(), LlmCall.pipeline_id)
+    )
+
+    if pipeline_id is not None:
+        query = query.where(LlmCall.pipeline_id == pipeline_id)
+
+    if until is not None:
+        query = query.where(LlmCall.created_at < until)
+
+    result = await db.execute(query)
+    return result.mappings().all()
@@ -1,6 +1,11 @@
+import time
+import uuid
+from typing import Any
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from app.core.config import get_settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from app.core.config import Settings, get_settings
+from app.core.metrics import metrics
 
 settings = get_settings()
 
@@ -9,11 +14,80 @@ ASYNC_DATABASE_URL = settings.DATABASE_URL.replace(
     "postgresql://", "postgresql+asyncpg://"
 )
 
-engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=True,
-    future=True
+pool_checkout_seconds = metrics.histogram(
+    "db_pool_checkout_seconds",
+    "Time a request waited for a database connection from the pool"
 )
+pool_checked_out = metrics.gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool"
+)
+pool_overflow = metrics.gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool size (negative while the pool is not full)"
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that reports how long each checkout took"""
+
+    def connect(self):
+        # Covers waiting for a free connection, opening a new one and the
+        # pre-ping, i.e. everything between asking and getting a connection
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+def report_pool_usage(pool: Pool) -> None:
+    """Set the pool gauges from the pool's current state, e.g. before /metrics is rendered"""
+    pool_checked_out.set(pool.checkedout())
+    pool_overflow.set(pool.overflow())
+
+
+def engine_options(settings: Settings, side: bool = False) -> dict[str, Any]:
+    """
+    Keyword arguments for create_async_engine from the DATABASE_* settings.
+
+    With ``side``, the options are for the small pool used by the verdict
+    cache and LLM telemetry: no overflow and a short checkout timeout.
+    """
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DATABASE_STATEMENT_CACHE_SIZE == 0:
+        # PgBouncer may hand each statement a different server connection, so
+        # generated names must never collide with ones prepared elsewhere
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    if side:
+        pool = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DATABASE_SIDE_POOL_SIZE,
+            "max_overflow": 0,
+            "pool_timeout": settings.DATABASE_SIDE_POOL_TIMEOUT_SECONDS,
+        }
+    else:
+        pool = {
+            "poolclass": TimedQueuePool,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        }
+
+    return {
+        "echo": settings.DATABASE_ECHO,
+        **pool,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+        "connect_args": connect_args,
+    }
+
+
+engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(settings))
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -21,6 +95,16 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Verdict cache lookups and LLM telemetry writes happen while a request holds
+# a connection from the main pool, so they get their own
+side_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(settings, side=True))
+
+side_session_maker = async_sessionmaker(
+    side_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
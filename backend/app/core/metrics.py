@@ -0,0 +1,184 @@
+import threading
+from typing import Any
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increment the counter for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Current value for the given label values"""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        if not self._values and not self.labelnames:
+            return [(self.name, {}, 0)]
+        with self._lock:
+            return [
+                (self.name, dict(zip(self.labelnames, key)), value)
+                for key, value in sorted(self._values.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Gauge(Counter):
+    """Value that can go up and down, optionally split by label values"""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Counter):
+    """Distribution of observed values in cumulative buckets, optionally split by label values"""
+
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label key: count per bucket (plus +Inf), sum of observations
+        self._observations: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._observations.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            counts[index] += 1
+            total[0] += value
+
+    def value(self, **labels: Any) -> float:
+        """Number of observations for the given label values"""
+        entry = self._observations.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def sum(self, **labels: Any) -> float:
+        """Sum of observations for the given label values"""
+        entry = self._observations.get(self._key(labels))
+        return entry[1][0] if entry else 0.0
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            samples = []
+            for key, (counts, total) in sorted(self._observations.items()):
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    samples.append((f"{self.name}_bucket", {**labels, "le": le}, cumulative))
+                samples.append((f"{self.name}_sum", labels, total[0]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+            return samples
+
+    def reset(self) -> None:
+        with self._lock:
+            self._observations.clear()
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: dict[str, Any] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Register (or return the existing) counter"""
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Register (or return the existing) gauge"""
+        if name not in self._metrics:
+            self._metrics[name] = Gauge(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Register (or return the existing) histogram"""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def get(self, name: str) -> Any:
+        """Return a registered metric by name"""
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric (used by tests)"""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
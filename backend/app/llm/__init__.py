@@ -0,0 +1,22 @@
+from app.llm.client import create_openai_client, get_openai_client, close_openai_client
+from app.llm.batcher import MicroBatcher
+from app.llm.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.llm.hedging import Hedger
+from app.llm.rate_limiter import RateLimitTimeout, SharedRateLimiter
+from app.llm.single_flight import SingleFlight
+from app.llm.verdict_cache import VerdictCache, verdict_cache_key
+
+__all__ = [
+    "create_openai_client",
+    "get_openai_client",
+    "close_openai_client",
+    "MicroBatcher",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Hedger",
+    "RateLimitTimeout",
+    "SharedRateLimiter",
+    "SingleFlight",
+    "VerdictCache",
+    "verdict_cache_key",
+]
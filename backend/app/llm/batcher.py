@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Sequence
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+batches_sent = metrics.counter(
+    "llm_batches_total",
+    "Combined LLM calls sent by a micro-batcher",
+    ("operation",)
+)
+batched_items = metrics.counter(
+    "llm_batched_items_total",
+    "Items answered by a combined LLM call",
+    ("operation",)
+)
+batch_fallback_items = metrics.counter(
+    "llm_batch_fallback_items_total",
+    "Items sent individually because a batch was a single item or its answer was missing or malformed",
+    ("operation",)
+)
+
+
+class MicroBatcher:
+    """
+    Collect items submitted within a short window into one upstream call.
+
+    A batch is sent when ``max_batch_size`` items are waiting or
+    ``max_wait_seconds`` after its first item arrived, whichever comes first.
+    ``send_batch`` returns one result per item, using None for items it could
+    not answer (partial or malformed responses); those items, and batches of a
+    single item, are sent individually with ``send_one``. An exception from
+    ``send_batch`` is delivered to every waiter in the batch.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[list[Any]], Awaitable[Sequence[Any | None]]],
+        send_one: Callable[[Any], Awaitable[Any]],
+        max_batch_size: int = 20,
+        max_wait_seconds: float = 0.02,
+        operation: str = "batch"
+    ):
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.operation = operation
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatching: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any, timeout: float | None = None) -> tuple[Any, bool]:
+        """Queue an item and wait for (result, answered_by_batch)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Retrieve exceptions nobody awaits (waiter timed out) to keep logs quiet
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def pending(self) -> int:
+        """Number of items waiting for the next batch"""
+        return len(self._pending)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        results: Sequence[Any | None] = [None] * len(batch)
+        if len(batch) > 1:
+            try:
+                results = await self.send_batch([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            batches_sent.inc(operation=self.operation)
+            if len(results) != len(batch):
+                logger.warning("Batch answered %d of %d items; ignoring it", len(results), len(batch))
+                results = [None] * len(batch)
+
+        fallbacks = []
+        for (item, future), result in zip(batch, results):
+            if result is None:
+                fallbacks.append((item, future))
+            elif not future.done():
+                batched_items.inc(operation=self.operation)
+                future.set_result((result, True))
+
+        if fallbacks:
+            batch_fallback_items.inc(len(fallbacks), operation=self.operation)
+            await asyncio.gather(*(self._send_single(item, future) for item, future in fallbacks))
+
+    async def _send_single(self, item: Any, future: asyncio.Future) -> None:
+        try:
+            result = await self.send_one(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result((result, False))
@@ -0,0 +1,14 @@
+from contextvars import ContextVar
+from typing import Any
+
+# Per-call annotations (rate limit wait, hedging, ...) gathered while an LLM
+# request runs and copied into the step log by the caller that set the dict.
+# Tasks started by the caller copy the context, so they update the same dict.
+current_call_info: ContextVar[dict[str, Any] | None] = ContextVar("llm_call_info", default=None)
+
+
+def record_call_info(**values: Any) -> None:
+    """Annotate the LLM call running in the current context, if anyone listens"""
+    info = current_call_info.get()
+    if info is not None:
+        info.update(values)
@@ -0,0 +1,182 @@
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+circuit_state = metrics.gauge(
+    "llm_circuit_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("breaker",)
+)
+circuit_rejected = metrics.counter(
+    "llm_circuit_rejected_total",
+    "Calls short-circuited while the breaker was open",
+    ("breaker",)
+)
+circuit_transitions = metrics.counter(
+    "llm_circuit_transitions_total",
+    "Circuit breaker state changes",
+    ("breaker", "state")
+)
+
+STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker driven by error rate and latency percentile.
+
+    Outcomes of the last ``window_size`` calls are kept. Once at least
+    ``min_calls`` are recorded, the breaker opens when the failure rate
+    reaches ``failure_rate_threshold`` or the ``latency_percentile`` latency
+    reaches ``latency_threshold_seconds``. While open, calls fail fast with
+    CircuitOpenError. After ``open_seconds`` up to ``half_open_max_calls``
+    probe calls are let through: a healthy probe closes the breaker, a failed
+    or slow one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 50,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        latency_percentile: float = 0.95,
+        latency_threshold_seconds: float = 10.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_percentile = latency_percentile
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self._window: deque[tuple[bool, float]] = deque(maxlen=window_size)
+        self.reset()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the open period ends"""
+        if self._state == "open" and self.clock() - self._opened_at >= self.open_seconds:
+            self._transition("half_open")
+        return self._state
+
+    def check(self) -> None:
+        """Fail fast while open, without taking a half-open probe"""
+        if self.state == "open":
+            circuit_rejected.inc(breaker=self.name)
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func through the breaker, recording its outcome and latency"""
+        self._acquire()
+        started = self.clock()
+        try:
+            result = await func()
+        except Exception:
+            self._record(False, self.clock() - started)
+            raise
+        except BaseException:
+            # Cancelled by the caller: no verdict on upstream health
+            self._release_probe()
+            raise
+        self._record(True, self.clock() - started)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """State and window statistics for health reporting"""
+        return {
+            "state": self.state,
+            "calls": len(self._window),
+            "failure_rate": round(self.failure_rate(), 4),
+            "latency_percentile": self.latency_percentile,
+            "latency_seconds": round(self.latency(), 4),
+        }
+
+    def failure_rate(self) -> float:
+        """Share of failed calls in the window"""
+        if not self._window:
+            return 0.0
+        return sum(1 for ok, _ in self._window if not ok) / len(self._window)
+
+    def latency(self) -> float:
+        """Configured latency percentile over the window (nearest rank)"""
+        if not self._window:
+            return 0.0
+        latencies = sorted(latency for _, latency in self._window)
+        rank = max(math.ceil(self.latency_percentile * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def reset(self) -> None:
+        """Close the breaker and forget recorded calls"""
+        self._window.clear()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._state = "closed"
+        circuit_state.set(STATE_VALUES["closed"], breaker=self.name)
+
+    def _acquire(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probes >= self.half_open_max_calls):
+            circuit_rejected.inc(breaker=self.name)
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+        if state == "half_open":
+            self._probes += 1
+
+    def _release_probe(self) -> None:
+        if self._state == "half_open" and self._probes:
+            self._probes -= 1
+
+    def _record(self, ok: bool, latency: float) -> None:
+        if self._state == "half_open":
+            self._release_probe()
+            healthy = ok and latency < self.latency_threshold_seconds
+            if healthy:
+                self._window.clear()
+            self._transition("closed" if healthy else "open")
+            return
+        if self._state == "open":
+            # A call started before the breaker opened
+            return
+
+        self._window.append((ok, latency))
+        if len(self._window) >= self.min_calls and (
+            self.failure_rate() >= self.failure_rate_threshold
+            or self.latency() >= self.latency_threshold_seconds
+        ):
+            self._transition("open")
+
+    def _transition(self, state: str) -> None:
+        if state == "open":
+            self._opened_at = self.clock()
+        if state != "half_open":
+            self._probes = 0
+        self._state = state
+        circuit_state.set(STATE_VALUES[state], breaker=self.name)
+        circuit_transitions.inc(breaker=self.name, state=state)
+
+
+settings = get_settings()
+
+sentiment_breaker = CircuitBreaker(
+    "sentiment",
+    window_size=settings.SENTIMENT_BREAKER_WINDOW_SIZE,
+    min_calls=settings.SENTIMENT_BREAKER_MIN_CALLS,
+    failure_rate_threshold=settings.SENTIMENT_BREAKER_FAILURE_RATE,
+    latency_percentile=settings.SENTIMENT_BREAKER_LATENCY_PERCENTILE,
+    latency_threshold_seconds=settings.SENTIMENT_BREAKER_LATENCY_THRESHOLD_SECONDS,
+    open_seconds=settings.SENTIMENT_BREAKER_OPEN_SECONDS,
+    half_open_max_calls=settings.SENTIMENT_BREAKER_HALF_OPEN_CALLS,
+)
+
+circuit_breakers = {sentiment_breaker.name: sentiment_breaker}
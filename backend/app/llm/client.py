@@ -0,0 +1,53 @@
+import httpx
+from openai import AsyncOpenAI
+from app.core.config import Settings, get_settings
+from app.llm.telemetry import trace_request
+
+# Application-scoped client, created in the FastAPI lifespan and shared by
+# every request so connections and TLS sessions are reused
+_client: AsyncOpenAI | None = None
+
+
+def create_openai_client(settings: Settings, base_url: str | None = None) -> AsyncOpenAI:
+    """Build an AsyncOpenAI client backed by a pooled, keep-alive HTTP client"""
+    http_client = httpx.AsyncClient(
+        http2=settings.OPENAI_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_TIMEOUT_SECONDS,
+            connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+        ),
+        # Counts attempts and times connection setup for call telemetry
+        event_hooks={"request": [trace_request]},
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=base_url or settings.OPENAI_BASE_URL,
+        http_client=http_client,
+    )
+
+
+def get_openai_client() -> AsyncOpenAI | None:
+    """
+    Return the shared OpenAI client, or None when no API key is configured.
+
+    The client is normally created at startup; outside the app (scripts,
+    tests) it is created on first use.
+    """
+    global _client
+    settings = get_settings()
+    if _client is None and settings.OPENAI_API_KEY:
+        _client = create_openai_client(settings)
+    return _client
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,125 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+hedged_requests = metrics.counter(
+    "llm_hedged_requests_total",
+    "Second requests sent because the first was slower than the hedge delay",
+    ("hedger",)
+)
+hedge_wins = metrics.counter(
+    "llm_hedge_wins_total",
+    "Hedged requests where the second request answered first",
+    ("hedger",)
+)
+hedge_budget_exhausted = metrics.counter(
+    "llm_hedge_budget_exhausted_total",
+    "Slow requests not hedged because the hedge budget was spent",
+    ("hedger",)
+)
+
+
+class Hedger:
+    """
+    Hedge slow requests with a second identical request.
+
+    The hedge delay is the ``percentile`` latency of the last ``window_size``
+    completed requests; nothing is hedged until ``min_samples`` are known.
+    Every request earns ``budget_ratio`` hedge credits (capped at
+    ``max_credits``) and each hedge spends one, so hedges stay below that
+    share of traffic. The first successful answer wins and the other request
+    is cancelled.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 0.95,
+        window_size: int = 200,
+        min_samples: int = 20,
+        budget_ratio: float = 0.05,
+        max_credits: float = 10.0,
+        min_delay_seconds: float = 0.05
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.max_credits = max_credits
+        self.min_delay_seconds = min_delay_seconds
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._credits = 0.0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while too few samples exist"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        rank = max(math.ceil(self.percentile * len(latencies)), 1)
+        return max(latencies[rank - 1], self.min_delay_seconds)
+
+    def record(self, latency: float) -> None:
+        """Add an observed request latency"""
+        self._latencies.append(latency)
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Run call, hedging it if slow; returns (result, hedged)"""
+        self._credits = min(self._credits + self.budget_ratio, self.max_credits)
+        delay = self.hedge_delay()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        attempts = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if self._credits >= 1:
+                        self._credits -= 1
+                        hedged_requests.inc(hedger=self.name)
+                        attempts.append(asyncio.ensure_future(call()))
+                    else:
+                        hedge_budget_exhausted.inc(hedger=self.name)
+
+            winner = await _first_success(attempts)
+            self.record(time.monotonic() - started)
+            if winner is not primary:
+                hedge_wins.inc(hedger=self.name)
+            return winner.result(), len(attempts) > 1
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+
+    def reset(self) -> None:
+        """Forget observed latencies and credits"""
+        self._latencies.clear()
+        self._credits = 0.0
+
+
+async def _first_success(attempts: list[asyncio.Future]) -> asyncio.Future:
+    """Wait for the first attempt that succeeds; raise the first error if all fail"""
+    pending = set(attempts)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for attempt in attempts:
+            if attempt in done and not attempt.cancelled() and attempt.exception() is None:
+                return attempt
+    for attempt in attempts:
+        if not attempt.cancelled() and attempt.exception() is not None:
+            raise attempt.exception()
+    raise asyncio.CancelledError()
+
+
+settings = get_settings()
+
+sentiment_hedger = Hedger(
+    "sentiment",
+    percentile=settings.SENTIMENT_HEDGE_PERCENTILE,
+    window_size=settings.SENTIMENT_HEDGE_WINDOW_SIZE,
+    min_samples=settings.SENTIMENT_HEDGE_MIN_SAMPLES,
+    budget_ratio=settings.SENTIMENT_HEDGE_BUDGET_RATIO,
+)
@@ -0,0 +1,203 @@
+import asyncio
+import fcntl
+import os
+import struct
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+rate_limit_wait_seconds = metrics.counter(
+    "llm_rate_limit_wait_seconds_total",
+    "Time LLM calls spent waiting for the shared rate limiter",
+    ("limiter",)
+)
+rate_limited_calls = metrics.counter(
+    "llm_rate_limited_calls_total",
+    "LLM calls that had to wait for a token or a concurrency slot",
+    ("limiter",)
+)
+rate_limit_timeouts = metrics.counter(
+    "llm_rate_limit_timeouts_total",
+    "LLM calls abandoned because the limiter wait exceeded its bound",
+    ("limiter",)
+)
+
+BUCKET_STATE = struct.Struct("dd")  # tokens, last refill (time.monotonic)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call cannot get a token or slot within its wait bound"""
+
+
+class SharedRateLimiter:
+    """
+    Token bucket plus concurrency cap shared by every worker on the host.
+
+    State lives in small files (under /dev/shm when available, i.e. shared
+    memory). The bucket is updated under an fcntl lock; tokens are reserved
+    ahead of time so waiters sleep exactly until their token instead of
+    polling. Each concurrency slot is a byte-range lock on the slots file, so
+    the kernel frees the slots of a worker that dies. ``time.monotonic`` is
+    the system-wide CLOCK_MONOTONIC on Linux, so all workers share one clock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float | None = None,
+        burst: int = 10,
+        max_concurrency: int | None = None,
+        max_wait_seconds: float = 5.0,
+        state_dir: str | None = None,
+        poll_interval: float = 0.005
+    ):
+        self.name = name
+        self.rate = requests_per_minute / 60 if requests_per_minute else None
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_wait_seconds = max_wait_seconds
+        self.state_dir = state_dir or _default_state_dir()
+        self.poll_interval = poll_interval
+        self._bucket_fd: int | None = None
+        self._slots_fd: int | None = None
+        # fcntl locks belong to the process, so slots held by other
+        # coroutines of this worker are tracked here
+        self._held_slots: set[int] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rate or self.max_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self, max_wait: float | None = None) -> AsyncIterator[float]:
+        """Wait for a token and a slot; yields the seconds spent waiting"""
+        if not self.enabled:
+            yield 0.0
+            return
+
+        started = time.monotonic()
+        budget = self.max_wait_seconds if max_wait is None else min(max_wait, self.max_wait_seconds)
+        slept = False
+
+        wait = None
+        if self.rate:
+            wait = self._reserve_token(budget)
+            if wait is None:
+                rate_limit_timeouts.inc(limiter=self.name)
+                raise RateLimitTimeout(f"Rate limiter '{self.name}' wait exceeds {budget:.3f}s")
+
+        slot = None
+        try:
+            if wait:
+                slept = True
+                await asyncio.sleep(wait)
+            if self.max_concurrency:
+                slot, polled = await self._acquire_slot(started + budget)
+                slept = slept or polled
+        except BaseException:
+            # No call is made, so the reserved token goes back to the bucket
+            if wait is not None:
+                self._return_token()
+            raise
+
+        # Time spent in lock calls alone is not reported as waiting
+        waited = time.monotonic() - started if slept else 0.0
+        if slept:
+            rate_limited_calls.inc(limiter=self.name)
+            rate_limit_wait_seconds.inc(waited, limiter=self.name)
+        try:
+            yield waited
+        finally:
+            if slot is not None:
+                self._release_slot(slot)
+
+    def _reserve_token(self, budget: float) -> float | None:
+        fd = self._bucket()
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            tokens, updated = BUCKET_STATE.unpack(os.pread(fd, BUCKET_STATE.size, 0))
+            now = time.monotonic()
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = max(0.0, (1 - tokens) / self.rate)
+            if wait > budget:
+                return None
+            # Tokens may go negative: each waiter owns a future token
+            os.pwrite(fd, BUCKET_STATE.pack(tokens - 1, now), 0)
+            return wait
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+    def _return_token(self) -> None:
+        fd = self._bucket()
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            tokens, updated = BUCKET_STATE.unpack(os.pread(fd, BUCKET_STATE.size, 0))
+            now = time.monotonic()
+            tokens = min(self.burst, tokens + (now - updated) * self.rate + 1)
+            os.pwrite(fd, BUCKET_STATE.pack(tokens, now), 0)
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+    async def _acquire_slot(self, deadline: float) -> tuple[int, bool]:
+        fd = self._slots()
+        polled = False
+        while True:
+            for slot in range(self.max_concurrency):
+                if slot in self._held_slots:
+                    continue
+                try:
+                    fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, slot)
+                except OSError:
+                    continue
+                self._held_slots.add(slot)
+                return slot, polled
+            if time.monotonic() >= deadline:
+                rate_limit_timeouts.inc(limiter=self.name)
+                raise RateLimitTimeout(f"No free '{self.name}' concurrency slot")
+            polled = True
+            await asyncio.sleep(self.poll_interval)
+
+    def _release_slot(self, slot: int) -> None:
+        fcntl.lockf(self._slots_fd, fcntl.LOCK_UN, 1, slot)
+        self._held_slots.discard(slot)
+
+    def _bucket(self) -> int:
+        if self._bucket_fd is None:
+            fd = self._open("bucket")
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < BUCKET_STATE.size:
+                    os.pwrite(fd, BUCKET_STATE.pack(self.burst, time.monotonic()), 0)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+            self._bucket_fd = fd
+        return self._bucket_fd
+
+    def _slots(self) -> int:
+        if self._slots_fd is None:
+            self._slots_fd = self._open("slots")
+        return self._slots_fd
+
+    def _open(self, kind: str) -> int:
+        os.makedirs(self.state_dir, exist_ok=True)
+        return os.open(os.path.join(self.state_dir, f"{self.name}.{kind}"), os.O_RDWR | os.O_CREAT, 0o600)
+
+
+def _default_state_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "loan-orchestrator")
+
+
+settings = get_settings()
+
+openai_rate_limiter = SharedRateLimiter(
+    "openai",
+    requests_per_minute=settings.OPENAI_RATE_LIMIT_RPM,
+    burst=settings.OPENAI_RATE_LIMIT_BURST,
+    max_concurrency=settings.OPENAI_MAX_CONCURRENT_REQUESTS,
+    max_wait_seconds=settings.OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS,
+    state_dir=settings.OPENAI_RATE_LIMIT_STATE_DIR,
+)
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+from app.core.metrics import metrics
+
+coalesced_requests = metrics.counter(
+    "llm_coalesced_requests_total",
+    "LLM requests that joined an identical in-flight request instead of calling upstream",
+    ("operation",)
+)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one upstream call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task and receive the same result or exception.
+    The shared task is shielded, so a waiter that times out or is cancelled
+    never cancels the call for the others.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+        timeout: float | None = None
+    ) -> tuple[Any, bool]:
+        """Run func once per in-flight key; return (result, joined_existing_call)"""
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if shared:
+            coalesced_requests.inc(operation=self.operation)
+        else:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        return await asyncio.wait_for(asyncio.shield(task), timeout), shared
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight"""
+        return len(self._in_flight)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved when every waiter gave up early
+        if not task.cancelled():
+            task.exception()
+
+
+sentiment_single_flight = SingleFlight("sentiment")
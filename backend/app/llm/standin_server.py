@@ -0,0 +1,290 @@
+"""
+OpenAI-compatible stand-in for the chat completions endpoint.
+
+Used to load test and benchmark the AI path of ``sentiment_check`` without a
+real key. Point the backend at it with ``OPENAI_BASE_URL``:
+
+    python -m app.llm.standin_server --config standin.json --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=standin uvicorn app.main:app
+
+In ``rules`` mode answers come from regex verdict rules. ``record`` mode
+forwards requests to a real upstream and appends each response to a cassette
+file; ``replay`` mode answers from that cassette for deterministic runs.
+Requests with ``"stream": true`` get the same answer as server-sent events,
+one chunk per word, ``token_interval_ms`` apart.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+MODES = ("rules", "record", "replay")
+BATCH_ITEM = re.compile(r"^\s*(\d+)\.\s*(.*)$")
+STREAM_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+class StandinConfig:
+    """Behaviour of the stand-in server, usually loaded from a JSON file"""
+
+    def __init__(
+        self,
+        mode: str = "rules",
+        latency: dict[str, Any] | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rules: list[dict[str, str]] | None = None,
+        default_verdict: str = "SAFE",
+        default_reason: str = "Legitimate purpose",
+        cassette: str | None = None,
+        upstream_base_url: str = "https://api.openai.com/v1",
+        token_interval_ms: float = 0.0,
+        seed: int | None = None
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode in ("record", "replay") and not cassette:
+            raise ValueError(f"{mode} mode needs a cassette path")
+        self.mode = mode
+        self.latency = latency or {"distribution": "fixed", "ms": 0}
+        if self.latency.get("distribution", "fixed") not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency['distribution']}")
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rules = [
+            (re.compile(rule["pattern"], re.IGNORECASE), rule["verdict"].upper(), rule.get("reason", ""))
+            for rule in rules or []
+        ]
+        self.default_verdict = default_verdict.upper()
+        self.default_reason = default_reason
+        self.cassette = cassette
+        self.upstream_base_url = upstream_base_url.rstrip("/")
+        self.token_interval_ms = token_interval_ms
+        self.seed = seed
+
+    @classmethod
+    def from_file(cls, path: str) -> "StandinConfig":
+        """Load a config from a JSON file"""
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+class Standin:
+    """Request handling state: random source, cassette and counters"""
+
+    def __init__(self, config: StandinConfig, upstream: httpx.AsyncClient | None = None):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.upstream = upstream
+        self.recordings: dict[str, dict[str, Any]] = {}
+        self.stats = {"requests": 0, "errors": 0, "replayed": 0, "recorded": 0, "replay_misses": 0}
+        if config.mode == "replay":
+            self.recordings = load_cassette(config.cassette)
+
+    def sample_latency(self) -> float:
+        """Seconds to wait before answering"""
+        latency = self.config.latency
+        distribution = latency.get("distribution", "fixed")
+        if distribution == "fixed":
+            ms = latency.get("ms", 0)
+        elif distribution == "uniform":
+            ms = self.random.uniform(latency["min_ms"], latency["max_ms"])
+        elif distribution == "normal":
+            ms = self.random.gauss(latency["mean_ms"], latency["stddev_ms"])
+        else:
+            ms = latency["median_ms"] * self.random.lognormvariate(0, latency.get("sigma", 0.5))
+        return max(ms, 0) / 1000
+
+    def verdict(self, purpose: str) -> tuple[str, str]:
+        """Verdict and reason for one loan purpose"""
+        for pattern, verdict, reason in self.config.rules:
+            if pattern.search(purpose):
+                return verdict, reason
+        return self.config.default_verdict, self.config.default_reason
+
+    def answer(self, body: dict[str, Any]) -> str:
+        """Message content for a chat completion request, using the verdict rules"""
+        prompt = next(
+            (m["content"] for m in reversed(body.get("messages", [])) if m.get("role") == "user"), ""
+        )
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            verdicts = []
+            for line in prompt.splitlines():
+                match = BATCH_ITEM.match(line)
+                if match:
+                    verdict, reason = self.verdict(match.group(2))
+                    verdicts.append({"id": int(match.group(1)), "verdict": verdict, "reason": reason})
+            return json.dumps({"verdicts": verdicts})
+
+        purpose = prompt.split(":", 1)[1].strip() if ":" in prompt else prompt
+        verdict, reason = self.verdict(purpose)
+        return f"{verdict} - {reason}" if reason else verdict
+
+
+def request_key(body: dict[str, Any]) -> str:
+    """Stable hash of the parts of a request that determine the answer"""
+    relevant = {
+        name: body.get(name)
+        for name in ("model", "messages", "temperature", "max_tokens", "response_format")
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_cassette(path: str) -> dict[str, dict[str, Any]]:
+    """Read recorded responses keyed by request hash"""
+    recordings = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    recordings[entry["key"]] = entry
+    except FileNotFoundError:
+        pass
+    return recordings
+
+
+def completion(model: str, content: str) -> dict[str, Any]:
+    """Chat completion response body in the OpenAI format"""
+    prompt_tokens, completion_tokens = 50, max(len(content) // 4, 1)
+    return {
+        "id": f"chatcmpl-standin-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+async def stream_chunks(response: dict[str, Any], token_interval: float):
+    """Server-sent events for a chat completion body, one chunk per word"""
+    content = response["choices"][0]["message"]["content"] or ""
+    base = {
+        "id": response["id"],
+        "object": "chat.completion.chunk",
+        "created": response["created"],
+        "model": response["model"],
+    }
+
+    def event(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+        chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    yield event({"role": "assistant", "content": ""})
+    for i, token in enumerate(STREAM_TOKEN.findall(content)):
+        if i and token_interval:
+            await asyncio.sleep(token_interval)
+        yield event({"content": token})
+    yield event({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+def error_response(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": "standin_error", "code": status_code}},
+    )
+
+
+def create_standin_app(config: StandinConfig, upstream: httpx.AsyncClient | None = None) -> FastAPI:
+    """Build the stand-in FastAPI app"""
+    app = FastAPI(title="OpenAI stand-in")
+    standin = Standin(config, upstream)
+    app.state.standin = standin
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        standin.stats["requests"] += 1
+        await asyncio.sleep(standin.sample_latency())
+
+        if standin.random.random() < config.error_rate:
+            standin.stats["errors"] += 1
+            return error_response(config.error_status, "Injected stand-in error")
+
+        key = request_key(body)
+        if config.mode == "replay":
+            entry = standin.recordings.get(key)
+            if entry is None:
+                standin.stats["replay_misses"] += 1
+                return error_response(404, "No recorded response for this request")
+            standin.stats["replayed"] += 1
+            status_code, response = entry["status_code"], entry["response"]
+        elif config.mode == "record":
+            status_code, response = await record(request, body, key)
+        else:
+            status_code, response = 200, completion(body.get("model", "standin"), standin.answer(body))
+
+        if body.get("stream") and status_code == 200:
+            return StreamingResponse(
+                stream_chunks(response, config.token_interval_ms / 1000),
+                media_type="text/event-stream"
+            )
+        return JSONResponse(status_code=status_code, content=response)
+
+    async def record(request: Request, body: dict[str, Any], key: str) -> tuple[int, dict[str, Any]]:
+        client = standin.upstream or httpx.AsyncClient(timeout=60)
+        started = time.perf_counter()
+        # Recorded unstreamed so the cassette serves both kinds of request
+        upstream_body = {name: value for name, value in body.items() if name not in ("stream", "stream_options")}
+        try:
+            response = await client.post(
+                f"{config.upstream_base_url}/chat/completions",
+                json=upstream_body,
+                headers={"Authorization": request.headers.get("authorization", "")},
+            )
+        finally:
+            if standin.upstream is None:
+                await client.aclose()
+        entry = {
+            "key": key,
+            "request": upstream_body,
+            "status_code": response.status_code,
+            "response": response.json(),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        with open(config.cassette, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        standin.recordings[key] = entry
+        standin.stats["recorded"] += 1
+        return response.status_code, entry["response"]
+
+    @app.get("/stats")
+    async def stats():
+        return standin.stats
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in server")
+    parser.add_argument("--config", help="JSON config file (defaults: rules mode, no latency)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    config = StandinConfig.from_file(args.config) if args.config else StandinConfig()
+    uvicorn.run(create_standin_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+from typing import Any
+from app.core.metrics import metrics
+from app.llm.telemetry import mark_first_token
+
+streamed_verdicts = metrics.counter(
+    "llm_streamed_verdicts_total",
+    "Streamed completions by whether the verdict was read before the stream ended",
+    ("outcome",)
+)
+
+
+async def read_leading_verdict(
+    stream: Any,
+    verdicts: tuple[str, ...],
+    keep_rest: bool = False
+) -> tuple[str, asyncio.Task | None]:
+    """
+    Read a streamed chat completion until its leading verdict word is known.
+
+    Returns the text read so far and, with ``keep_rest``, a task that keeps
+    reading and resolves to the full text. Otherwise the stream is closed so
+    the upstream stops generating. A stream that never starts with one of
+    ``verdicts`` is read to the end.
+    """
+    text = ""
+    try:
+        async for chunk in stream:
+            text += _chunk_text(chunk)
+            if text:
+                mark_first_token()
+            if leading_verdict(text, verdicts) is not None:
+                break
+        else:
+            streamed_verdicts.inc(outcome="complete")
+            return text, None
+    except BaseException:
+        # Cancelled (e.g. a hedge lost the race) or failed: free the connection
+        await stream.close()
+        raise
+
+    streamed_verdicts.inc(outcome="early")
+    if keep_rest:
+        return text, asyncio.ensure_future(_read_rest(stream, text))
+    await stream.close()
+    return text, None
+
+
+def leading_verdict(text: str, verdicts: tuple[str, ...]) -> str | None:
+    """The verdict word text starts with, once it is complete"""
+    head = text.lstrip().upper()
+    for verdict in verdicts:
+        if head.startswith(verdict):
+            return verdict
+    return None
+
+
+async def _read_rest(stream: Any, text: str) -> str:
+    try:
+        async for chunk in stream:
+            text += _chunk_text(chunk)
+    finally:
+        await stream.close()
+    return text
+
+
+def _chunk_text(chunk: Any) -> str:
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+class PendingReasons:
+    """
+    Completions still streaming after their verdict was used, by reason id.
+
+    The id goes into the step log so whoever stores the run can wait for the
+    full text and attach it later. Entries are dropped ``ttl_seconds`` after
+    their stream finishes, whether or not anyone collected them.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def register(self, task: asyncio.Task) -> str:
+        """Track a background read and return its reason id"""
+        reason_id = uuid.uuid4().hex
+        self._tasks[reason_id] = task
+        loop = asyncio.get_running_loop()
+        task.add_done_callback(
+            lambda _: loop.call_later(self.ttl_seconds, self._tasks.pop, reason_id, None)
+        )
+        return reason_id
+
+    async def collect(self, reason_id: str, timeout: float | None = None) -> str | None:
+        """Full text for a reason id, or None if unknown, failed or too slow"""
+        task = self._tasks.get(reason_id)
+        if task is None:
+            return None
+        try:
+            # Shielded so one slow collector does not cancel the read for others
+            return (await asyncio.wait_for(asyncio.shield(task), timeout)).strip()
+        except Exception:
+            return None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+pending_reasons = PendingReasons()
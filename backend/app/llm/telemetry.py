@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable
+import httpx
+import openai
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import get_settings
+from app.core.database import side_session_maker
+from app.core.metrics import metrics
+from app.llm.circuit_breaker import CircuitOpenError
+from app.llm.rate_limiter import RateLimitTimeout
+from app.models.llm_call import LlmCall
+
+logger = logging.getLogger(__name__)
+
+llm_calls = metrics.counter(
+    "llm_calls_total",
+    "LLM verdict lookups by cache tier and outcome",
+    ("operation", "cache", "outcome")
+)
+llm_fallbacks = metrics.counter(
+    "llm_call_fallbacks_total",
+    "LLM calls that failed and fell back, by reason",
+    ("operation", "reason")
+)
+llm_retries = metrics.counter(
+    "llm_call_retries_total",
+    "Upstream attempts retried by the OpenAI client",
+    ("operation",)
+)
+llm_tokens = metrics.counter(
+    "llm_call_tokens_total",
+    "Tokens reported by upstream responses",
+    ("operation", "kind")
+)
+llm_latency = metrics.histogram(
+    "llm_call_latency_seconds",
+    "Time from verdict lookup to answer or fallback",
+    ("operation",)
+)
+llm_queue_wait = metrics.histogram(
+    "llm_call_queue_wait_seconds",
+    "Time spent waiting for the shared rate limiter",
+    ("operation",)
+)
+llm_connect = metrics.histogram(
+    "llm_call_connect_seconds",
+    "Time spent opening upstream connections (TCP and TLS), for calls that opened one",
+    ("operation",)
+)
+llm_first_token = metrics.histogram(
+    "llm_call_first_token_seconds",
+    "Time from sending the request to the first answer token",
+    ("operation",)
+)
+llm_telemetry_dropped = metrics.counter(
+    "llm_telemetry_dropped_total",
+    "Telemetry rows discarded because the buffer was full or a write failed"
+)
+
+
+class CallTelemetry:
+    """
+    Measurements for one LLM-backed lookup, filled in as the call proceeds.
+
+    The caller creates one and sets ``current_telemetry``; the rate limiter,
+    the HTTP client hooks and the stream reader add what they observe. Times
+    are in milliseconds.
+    """
+
+    def __init__(self, operation: str, model: str, pipeline_id: int | None = None):
+        self.operation = operation
+        self.model = model
+        self.pipeline_id = pipeline_id
+        self.created_at = datetime.now(timezone.utc)
+        self.cache = "off"
+        self.outcome = "ok"
+        self.fallback_reason: str | None = None
+        self.coalesced = False
+        self.batched = False
+        self.streamed = False
+        self.hedged = False
+        self.attempts = 0
+        self.queue_wait_ms = 0.0
+        self.connect_ms = 0.0
+        self.first_token_ms: float | None = None
+        self.latency_ms: float | None = None
+        self.prompt_tokens: int | None = None
+        self.completion_tokens: int | None = None
+        self._started = time.perf_counter()
+        self._request_sent: float | None = None
+
+    @property
+    def retries(self) -> int:
+        """Upstream attempts beyond the first, not counting a hedge request"""
+        return max(self.attempts - 1 - int(self.hedged), 0)
+
+    def request_sent(self) -> None:
+        self._request_sent = time.perf_counter()
+
+    def first_token(self) -> None:
+        if self.first_token_ms is None and self._request_sent is not None:
+            self.first_token_ms = (time.perf_counter() - self._request_sent) * 1000
+
+    def finish(self) -> "CallTelemetry":
+        """Stop the latency clock"""
+        self.latency_ms = (time.perf_counter() - self._started) * 1000
+        return self
+
+    def to_row(self) -> dict[str, Any]:
+        """Column values for the ``llm_calls`` table"""
+        return {
+            "created_at": self.created_at,
+            "pipeline_id": self.pipeline_id,
+            "operation": self.operation,
+            "model": self.model,
+            "cache": self.cache,
+            "outcome": self.outcome,
+            "fallback_reason": self.fallback_reason,
+            "coalesced": self.coalesced,
+            "batched": self.batched,
+            "streamed": self.streamed,
+            "hedged": self.hedged,
+            "retries": self.retries,
+            "queue_wait_ms": _rounded(self.queue_wait_ms),
+            "connect_ms": _rounded(self.connect_ms),
+            "first_token_ms": _rounded(self.first_token_ms),
+            "latency_ms": _rounded(self.latency_ms),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+# Telemetry of the LLM lookup running in the current context. Tasks started
+# by the caller (coalescing, hedging) copy the context and share the object.
+current_telemetry: ContextVar[CallTelemetry | None] = ContextVar("llm_call_telemetry", default=None)
+
+
+def mark_request_sent() -> None:
+    """Note that a request is being sent upstream"""
+    telemetry = current_telemetry.get()
+    if telemetry is not None:
+        telemetry.request_sent()
+
+
+def mark_first_token() -> None:
+    """Note that the first answer token arrived"""
+    telemetry = current_telemetry.get()
+    if telemetry is not None:
+        telemetry.first_token()
+
+
+def add_queue_wait(seconds: float) -> None:
+    """Add time spent queueing before an upstream request"""
+    telemetry = current_telemetry.get()
+    if telemetry is not None:
+        telemetry.queue_wait_ms += seconds * 1000
+
+
+def record_usage(response: Any) -> None:
+    """Copy token counts from a chat completion response, when it reports them"""
+    telemetry = current_telemetry.get()
+    usage = getattr(response, "usage", None)
+    if telemetry is None or usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+        telemetry.prompt_tokens = (telemetry.prompt_tokens or 0) + prompt_tokens
+        telemetry.completion_tokens = (telemetry.completion_tokens or 0) + completion_tokens
+
+
+async def trace_request(request: httpx.Request) -> None:
+    """httpx request hook counting attempts and timing connection setup"""
+    telemetry = current_telemetry.get()
+    if telemetry is None:
+        return
+    telemetry.attempts += 1
+    request.extensions["trace"] = _connection_tracer(telemetry)
+
+
+def _connection_tracer(telemetry: CallTelemetry) -> Callable[[str, dict[str, Any]], Any]:
+    started: dict[str, float] = {}
+
+    async def trace(event: str, info: dict[str, Any]) -> None:
+        # e.g. connection.connect_tcp.started / connection.start_tls.complete
+        if not event.startswith("connection.") or event.count(".") != 2:
+            return
+        _, step, phase = event.split(".")
+        if step not in ("connect_tcp", "start_tls"):
+            return
+        if phase == "started":
+            started[step] = time.perf_counter()
+        elif step in started:
+            telemetry.connect_ms += (time.perf_counter() - started.pop(step)) * 1000
+
+    return trace
+
+
+def fallback_reason(error: BaseException) -> str:
+    """Short, low-cardinality reason for a failed LLM call"""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, RateLimitTimeout):
+        return "rate_limited"
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError)):
+        return "timeout"
+    if isinstance(error, openai.APIStatusError):
+        return f"http_{error.status_code}"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection"
+    return "error"
+
+
+class LlmCallRecorder:
+    """
+    Publish call telemetry as metrics and store it in ``llm_calls``.
+
+    Rows are buffered in memory and written with one multi-row insert when
+    ``flush_size`` rows are waiting, and every ``flush_interval_seconds`` by
+    the background loop started with the app. At most ``max_buffer`` rows are
+    kept; older rows are dropped if the database falls behind. Write errors
+    are logged and never fail a run.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        flush_size: int = 500,
+        flush_interval_seconds: float = 5.0,
+        max_buffer: int = 10000
+    ):
+        self.session_maker = session_maker
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max_buffer
+        self._rows: list[dict[str, Any]] = []
+        self._flushing: asyncio.Task | None = None
+        self._loop_task: asyncio.Task | None = None
+
+    def record(self, telemetry: CallTelemetry) -> None:
+        """Publish one finished call"""
+        operation = telemetry.operation
+        llm_calls.inc(operation=operation, cache=telemetry.cache, outcome=telemetry.outcome)
+        if telemetry.fallback_reason:
+            llm_fallbacks.inc(operation=operation, reason=telemetry.fallback_reason)
+        if telemetry.retries:
+            llm_retries.inc(telemetry.retries, operation=operation)
+        if telemetry.prompt_tokens is not None:
+            llm_tokens.inc(telemetry.prompt_tokens, operation=operation, kind="prompt")
+            llm_tokens.inc(telemetry.completion_tokens, operation=operation, kind="completion")
+        if telemetry.latency_ms is not None:
+            llm_latency.observe(telemetry.latency_ms / 1000, operation=operation)
+        if telemetry.attempts:
+            llm_queue_wait.observe(telemetry.queue_wait_ms / 1000, operation=operation)
+        if telemetry.connect_ms:
+            llm_connect.observe(telemetry.connect_ms / 1000, operation=operation)
+        if telemetry.first_token_ms is not None:
+            llm_first_token.observe(telemetry.first_token_ms / 1000, operation=operation)
+
+        if self.session_maker is None:
+            return
+        self._rows.append(telemetry.to_row())
+        if len(self._rows) > self.max_buffer:
+            dropped = len(self._rows) - self.max_buffer
+            del self._rows[:dropped]
+            llm_telemetry_dropped.inc(dropped)
+        if len(self._rows) >= self.flush_size and (self._flushing is None or self._flushing.done()):
+            self._flushing = asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> int:
+        """Write buffered rows; returns how many were written"""
+        rows, self._rows = self._rows, []
+        if not rows or self.session_maker is None:
+            return 0
+        try:
+            async with self.session_maker() as session:
+                await session.execute(insert(LlmCall), rows)
+                await session.commit()
+        except Exception:
+            logger.warning("Writing %d LLM telemetry rows failed", len(rows), exc_info=True)
+            llm_telemetry_dropped.inc(len(rows))
+            return 0
+        return len(rows)
+
+    def start(self) -> None:
+        """Start the periodic flush loop"""
+        if self.session_maker is not None and self._loop_task is None:
+            self._loop_task = asyncio.ensure_future(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write what is left"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        await self.flush()
+
+    def pending(self) -> int:
+        """Rows waiting to be written"""
+        return len(self._rows)
+
+    def clear(self) -> None:
+        """Drop buffered rows"""
+        self._rows.clear()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+
+def _rounded(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+settings = get_settings()
+
+llm_call_recorder = LlmCallRecorder(
+    session_maker=side_session_maker if settings.LLM_TELEMETRY_DB_ENABLED else None,
+    flush_size=settings.LLM_TELEMETRY_FLUSH_SIZE,
+    flush_interval_seconds=settings.LLM_TELEMETRY_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.LLM_TELEMETRY_MAX_BUFFER,
+)
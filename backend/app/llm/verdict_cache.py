@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import get_settings
+from app.core.database import side_session_maker
+from app.models.sentiment_verdict import SentimentVerdict
+
+logger = logging.getLogger(__name__)
+
+
+def verdict_cache_key(normalized_purpose: str, model: str, prompt_version: str) -> str:
+    """Build the cache key for a verdict"""
+    raw = f"{model}\x1f{prompt_version}\x1f{normalized_purpose}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """
+    Two-tier cache for sentiment verdicts.
+
+    The first tier is an in-process LRU with a TTL. The second tier is the
+    ``sentiment_verdicts`` table, shared by every worker and kept across
+    restarts. Database errors are logged and treated as misses so the cache
+    never fails a run.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl_seconds: float = 3600,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        db_ttl_seconds: float | None = None
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.session_maker = session_maker
+        self.db_ttl_seconds = db_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    async def get(self, key: str) -> tuple[dict[str, Any], str] | None:
+        """Return (verdict, tier) for a cached key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, verdict = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return verdict, "memory"
+            del self._entries[key]
+
+        if self.session_maker is None:
+            return None
+
+        try:
+            async with self.session_maker() as session:
+                query = select(SentimentVerdict).where(SentimentVerdict.cache_key == key)
+                if self.db_ttl_seconds:
+                    cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.db_ttl_seconds)
+                    query = query.where(SentimentVerdict.created_at >= cutoff)
+                row = (await session.execute(query)).scalar_one_or_none()
+        except Exception:
+            logger.warning("Sentiment verdict cache lookup failed", exc_info=True)
+            return None
+
+        if row is None:
+            return None
+
+        verdict = {"is_risky": row.is_risky, "assessment": row.assessment}
+        self._remember(key, verdict)
+        return verdict, "database"
+
+    async def set(
+        self,
+        key: str,
+        verdict: dict[str, Any],
+        normalized_purpose: str,
+        model: str,
+        prompt_version: str
+    ) -> None:
+        """Store a verdict in both tiers"""
+        self._remember(key, verdict)
+
+        if self.session_maker is None:
+            return
+
+        try:
+            async with self.session_maker() as session:
+                await session.execute(
+                    insert(SentimentVerdict)
+                    .values(
+                        cache_key=key,
+                        normalized_purpose=normalized_purpose,
+                        model=model,
+                        prompt_version=prompt_version,
+                        is_risky=verdict["is_risky"],
+                        assessment=verdict["assessment"],
+                    )
+                    # Rewriting an existing row restarts its database TTL,
+                    # so a verdict that expired there is served again
+                    .on_conflict_do_update(
+                        index_elements=["cache_key"],
+                        set_={
+                            "is_risky": verdict["is_risky"],
+                            "assessment": verdict["assessment"],
+                            "created_at": func.now(),
+                        }
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("Sentiment verdict cache write failed", exc_info=True)
+
+    def clear(self) -> None:
+        """Drop the in-process tier"""
+        self._entries.clear()
+
+    def _remember(self, key: str, verdict: dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, verdict)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+settings = get_settings()
+
+verdict_cache = VerdictCache(
+    maxsize=settings.SENTIMENT_CACHE_SIZE,
+    ttl_seconds=settings.SENTIMENT_CACHE_TTL_SECONDS,
+    session_maker=side_session_maker if settings.SENTIMENT_CACHE_DB_ENABLED else None,
+    db_ttl_seconds=settings.SENTIMENT_CACHE_DB_TTL_SECONDS,
+)
@@ -1,16 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.core.config import get_settings
-from app.core.database import get_db
-from app.api.routes import applications, pipelines, runs
+from app.core.database import engine, get_db, report_pool_usage
+from app.core.metrics import metrics
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.routes import applications, pipelines, runs, telemetry
+from app.llm.client import get_openai_client, close_openai_client
+from app.llm.circuit_breaker import circuit_breakers
+from app.llm.telemetry import llm_call_recorder
+from app.steps.purpose_classifier import load_purpose_classifier
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared OpenAI connection pool once per process
+    get_openai_client()
+    # Load the cascade mode local model once, before serving runs
+    load_purpose_classifier()
+    # Write buffered LLM call telemetry in the background
+    llm_call_recorder.start()
+    yield
+    await llm_call_recorder.stop()
+    await close_openai_client()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS
@@ -20,12 +43,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
 app.include_router(applications.router, prefix=settings.API_V1_STR)
 app.include_router(pipelines.router, prefix=settings.API_V1_STR)
 app.include_router(runs.router, prefix=settings.API_V1_STR)
+app.include_router(telemetry.router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
@@ -36,16 +61,28 @@ async def root():
 @app.get("/health")
 async def health_check(db: AsyncSession = Depends(get_db)):
     """Health check endpoint that verifies database connectivity"""
+    # Open breakers mean a degraded (keyword only) AI path, not an unhealthy API
+    breaker_states = {name: breaker.snapshot() for name, breaker in circuit_breakers.items()}
     try:
         # Test database connection
         await db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
-            "database": "connected"
+            "database": "connected",
+            "circuit_breakers": breaker_states
         }
     except Exception as e:
         return {
             "status": "unhealthy",
             "database": "disconnected",
-            "error": str(e)
+            "error": str(e),
+            "circuit_breakers": breaker_states
         }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Process metrics in the Prometheus text format"""
+    # Read at scrape time so returned connections are reflected too
+    report_pool_usage(engine.pool)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
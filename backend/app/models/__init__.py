@@ -1,5 +1,7 @@
 from app.models.application import Application
 from app.models.pipeline import Pipeline
 from app.models.run import Run
+from app.models.sentiment_verdict import SentimentVerdict
+from app.models.llm_call import LlmCall
 
-__all__ = ["Application", "Pipeline", "Run"]
+__all__ = ["Application", "Pipeline", "Run", "SentimentVerdict", "LlmCall"]
@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Integer, REAL, SmallInteger, String
+from app.core.database import Base
+
+
+class LlmCall(Base):
+    __tablename__ = "llm_calls"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    # No foreign key: telemetry outlives deleted pipelines
+    pipeline_id = Column(Integer, nullable=True)
+    operation = Column(String(32), nullable=False)
+    model = Column(String(100), nullable=False)
+    cache = Column(String(16), nullable=False)
+    outcome = Column(String(16), nullable=False)
+    fallback_reason = Column(String(32), nullable=True)
+    coalesced = Column(Boolean, nullable=False, default=False)
+    batched = Column(Boolean, nullable=False, default=False)
+    streamed = Column(Boolean, nullable=False, default=False)
+    hedged = Column(Boolean, nullable=False, default=False)
+    retries = Column(SmallInteger, nullable=False, default=0)
+    # Milliseconds, single precision is plenty
+    queue_wait_ms = Column(REAL, nullable=True)
+    connect_ms = Column(REAL, nullable=True)
+    first_token_ms = Column(REAL, nullable=True)
+    latency_ms = Column(REAL, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_llm_calls_created_at", "created_at"),
+        Index("ix_llm_calls_pipeline_id_created_at", "pipeline_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -12,5 +12,7 @@ class Pipeline(Base):
     description = Column(Text)
     steps = Column(JSONB, nullable=False)
     terminal_rules = Column(JSONB, nullable=False)
+    lazy_evaluation = Column(Boolean, nullable=False, default=False, server_default="false")
+    deadline_ms = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
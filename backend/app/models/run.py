@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -15,3 +15,11 @@ class Run(Base):
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Keyset pagination of GET /runs walks (created_at, id) newest first,
+    # optionally within one pipeline or application
+    __table_args__ = (
+        Index("ix_runs_created_at_id", "created_at", "id"),
+        Index("ix_runs_pipeline_id_created_at_id", "pipeline_id", "created_at", "id"),
+        Index("ix_runs_application_id_created_at_id", "application_id", "created_at", "id"),
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Boolean, Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class SentimentVerdict(Base):
+    __tablename__ = "sentiment_verdicts"
+
+    # sha256 of model, prompt version and normalized loan purpose
+    cache_key = Column(String(64), primary_key=True)
+    normalized_purpose = Column(Text, nullable=False)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    is_risky = Column(Boolean, nullable=False)
+    assessment = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,23 @@
-from app.schemas.application import ApplicationCreate, ApplicationResponse
+from app.schemas.application import ApplicationCreate, ApplicationResponse, BulkApplicationResponse, BulkRowError
 from app.schemas.pipeline import PipelineCreate, PipelineUpdate, PipelineResponse, StepConfig, TerminalRule
-from app.schemas.run import RunCreate, RunResponse, StepLog
+from app.schemas.run import (
+    ApplicationFilter,
+    RunBatchCreate,
+    RunBatchError,
+    RunBatchResponse,
+    RunCreate,
+    RunListItem,
+    RunResponse,
+    RunSummary,
+    StepLog,
+)
+from app.schemas.telemetry import LlmCallStats
 
 __all__ = [
     "ApplicationCreate",
     "ApplicationResponse",
+    "BulkApplicationResponse",
+    "BulkRowError",
     "PipelineCreate",
     "PipelineUpdate",
     "PipelineResponse",
@@ -12,5 +25,12 @@ __all__ = [
     "TerminalRule",
     "RunCreate",
     "RunResponse",
+    "RunListItem",
+    "RunSummary",
     "StepLog",
+    "ApplicationFilter",
+    "RunBatchCreate",
+    "RunBatchError",
+    "RunBatchResponse",
+    "LlmCallStats",
 ]
@@ -1,13 +1,15 @@
 from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
 from decimal import Decimal
 from datetime import datetime
 
 
 class ApplicationBase(BaseModel):
     applicant_name: str = Field(..., min_length=1, max_length=255)
-    amount: Decimal = Field(..., gt=0, decimal_places=2)
-    monthly_income: Decimal = Field(..., gt=0, decimal_places=2)
-    declared_debts: Decimal = Field(..., ge=0, decimal_places=2)
+    # max_digits matches the Numeric(12, 2) columns
+    amount: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    monthly_income: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    declared_debts: Decimal = Field(..., ge=0, max_digits=12, decimal_places=2)
     country: str = Field(..., min_length=2, max_length=10)
     loan_purpose: str = Field(..., min_length=1)
 
@@ -22,3 +24,17 @@ class ApplicationResponse(ApplicationBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkApplicationResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    # Created id per input row, in input order; None where the row was rejected
+    ids: list[int | None]
+    errors: list[BulkRowError]
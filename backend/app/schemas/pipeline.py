@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Any
+from typing import Any, Literal
 from datetime import datetime
 
 
@@ -7,6 +7,8 @@ class StepConfig(BaseModel):
     step_type: str
     order: int
     params: dict[str, Any] = Field(default_factory=dict)
+    timeout_ms: int | None = Field(default=None, gt=0)
+    on_timeout: Literal["pass", "fail"] = "fail"
 
 
 class TerminalRule(BaseModel):
@@ -20,6 +22,8 @@ class PipelineBase(BaseModel):
     description: str | None = None
     steps: list[StepConfig]
     terminal_rules: list[TerminalRule]
+    lazy_evaluation: bool = False
+    deadline_ms: int | None = Field(default=None, gt=0)
 
 
 class PipelineCreate(PipelineBase):
@@ -31,6 +35,8 @@ class PipelineUpdate(BaseModel):
     description: str | None = None
     steps: list[StepConfig] | None = None
     terminal_rules: list[TerminalRule] | None = None
+    lazy_evaluation: bool | None = None
+    deadline_ms: int | None = Field(default=None, gt=0)
 
 
 class PipelineResponse(PipelineBase):
@@ -1,12 +1,15 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import Any
 from datetime import datetime
+from decimal import Decimal
 
 
 class StepLog(BaseModel):
     step_type: str
     order: int
-    passed: bool
+    passed: bool | None
+    skipped: bool = False
+    timed_out: bool = False
     details: dict[str, Any]
     executed_at: datetime
 
@@ -27,3 +30,66 @@ class RunResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RunListItem(RunResponse):
+    # Filled in by GET /runs?include_names=true
+    applicant_name: str | None = None
+    pipeline_name: str | None = None
+
+
+class RunSummary(BaseModel):
+    """A run without its step logs, as listed by GET /runs?view=summary"""
+    id: int
+    application_id: int
+    pipeline_id: int
+    status: str
+    started_at: datetime
+    completed_at: datetime | None
+    created_at: datetime
+    applicant_name: str | None = None
+    pipeline_name: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ApplicationFilter(BaseModel):
+    country: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+
+    @model_validator(mode="after")
+    def check_criteria(self) -> "ApplicationFilter":
+        if all(value in (None, "") for value in self.model_dump().values()):
+            raise ValueError("Filter needs at least one criterion")
+        return self
+
+
+class RunBatchCreate(BaseModel):
+    pipeline_id: int
+    application_ids: list[int] | None = Field(default=None, min_length=1, max_length=100000)
+    filter: ApplicationFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "RunBatchCreate":
+        if (self.application_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of application_ids or filter")
+        return self
+
+
+class RunBatchError(BaseModel):
+    application_id: int
+    error: str
+
+
+class RunBatchResponse(BaseModel):
+    pipeline_id: int
+    applications: int
+    runs_created: int
+    failed: int
+    status_counts: dict[str, int]
+    run_ids: list[int]
+    errors: list[RunBatchError]
+    missing_application_ids: list[int]
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import date
+
+
+class LlmCallStats(BaseModel):
+    """LLM call telemetry aggregated per pipeline and UTC day"""
+    pipeline_id: int | None
+    day: date
+    calls: int
+    cache_hits: int
+    fallbacks: int
+    retries: int
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms_p50: float | None
+    latency_ms_p95: float | None
+    latency_ms_p99: float | None
+    first_token_ms_p50: float | None
+    first_token_ms_p95: float | None
+    queue_wait_ms_p95: float | None
+    connect_ms_p95: float | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,5 @@
 from app.services.step_registry import StepRegistry
 from app.services.pipeline_executor import PipelineExecutor
+from app.services.pipeline_cache import PipelineCache, pipeline_cache
 
-__all__ = ["StepRegistry", "PipelineExecutor"]
+__all__ = ["StepRegistry", "PipelineExecutor", "PipelineCache", "pipeline_cache"]
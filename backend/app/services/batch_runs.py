@@ -0,0 +1,157 @@
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Sequence
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.application import Application
+from app.models.run import Run
+from app.services.pipeline_executor import PipelineExecutor
+from app.services.run_inputs import APPLICATION_INPUTS, executor_inputs
+from app.services.streamed_reasons import pending_reason_ids
+
+
+class TooManyApplications(Exception):
+    """Raised when a batch selects more applications than allowed"""
+
+
+def application_filter_clauses(application_filter: dict[str, Any]) -> list[Any]:
+    """WHERE clauses for the application filter of a batch run request"""
+    clauses = []
+    if application_filter.get("country"):
+        clauses.append(Application.country == application_filter["country"])
+    if application_filter.get("created_from"):
+        clauses.append(Application.created_at >= application_filter["created_from"])
+    if application_filter.get("created_to"):
+        clauses.append(Application.created_at < application_filter["created_to"])
+    if application_filter.get("min_amount") is not None:
+        clauses.append(Application.amount >= application_filter["min_amount"])
+    if application_filter.get("max_amount") is not None:
+        clauses.append(Application.amount <= application_filter["max_amount"])
+    return clauses
+
+
+async def run_pipeline_batch(
+    db: AsyncSession,
+    pipeline_id: int,
+    executor: PipelineExecutor,
+    application_ids: Sequence[int] | None = None,
+    application_filter: dict[str, Any] | None = None,
+    chunk_size: int = 500,
+    concurrency: int = 32,
+    on_pending_reasons: Callable[[int, list[str]], None] | None = None,
+    max_applications: int | None = None
+) -> dict[str, Any]:
+    """
+    Run one pipeline over many applications.
+
+    Applications are loaded ``chunk_size`` at a time in id order, either from
+    ``application_ids`` or matching ``application_filter``. Up to
+    ``concurrency`` runs execute at once. Each chunk's runs are written with
+    one multi-row insert and committed, so a long batch keeps its progress.
+    Applications whose execution fails are reported and get no run.
+    ``on_pending_reasons`` receives runs with reasons still streaming.
+    A selection larger than ``max_applications`` raises ``TooManyApplications``
+    before any run executes.
+    """
+    if max_applications is not None:
+        if application_ids is not None:
+            selected = len(set(application_ids))
+        else:
+            clauses = application_filter_clauses(application_filter or {})
+            selected = (
+                await db.execute(select(func.count()).select_from(Application).where(*clauses))
+            ).scalar_one()
+        if selected > max_applications:
+            raise TooManyApplications(
+                f"Batch selects {selected} applications, more than the limit of {max_applications}"
+            )
+
+    semaphore = asyncio.Semaphore(concurrency)
+    counts: Counter[str] = Counter()
+    run_ids: list[int] = []
+    errors: list[dict[str, Any]] = []
+    loaded_ids: set[int] = set()
+
+    async def evaluate(application: Any) -> tuple[Any, dict[str, Any] | None]:
+        async with semaphore:
+            started_at = datetime.utcnow()
+            try:
+                final_status, step_logs = await executor.execute(**executor_inputs(application))
+            except Exception as e:
+                errors.append({"application_id": application.id, "error": f"Pipeline execution failed: {e}"})
+                return application, None
+            return application, {
+                "application_id": application.id,
+                "pipeline_id": pipeline_id,
+                "status": final_status,
+                "step_logs": step_logs,
+                "started_at": started_at,
+                "completed_at": datetime.utcnow(),
+            }
+
+    async for chunk in _application_chunks(db, application_ids, application_filter, chunk_size):
+        loaded_ids.update(application.id for application in chunk)
+        outcomes = await asyncio.gather(*(evaluate(application) for application in chunk))
+        rows = [row for _, row in outcomes if row is not None]
+        if not rows:
+            continue
+
+        result = await db.execute(insert(Run).returning(Run.id, sort_by_parameter_order=True), rows)
+        chunk_run_ids = result.scalars().all()
+        await db.commit()
+
+        for run_id, row in zip(chunk_run_ids, rows):
+            counts[row["status"]] += 1
+            reason_ids = pending_reason_ids(row["step_logs"])
+            if reason_ids and on_pending_reasons is not None:
+                on_pending_reasons(run_id, reason_ids)
+        run_ids.extend(chunk_run_ids)
+
+    return {
+        "pipeline_id": pipeline_id,
+        "applications": len(loaded_ids),
+        "runs_created": len(run_ids),
+        "failed": len(errors),
+        "status_counts": dict(counts),
+        "run_ids": run_ids,
+        "errors": errors,
+        "missing_application_ids": sorted(set(application_ids or ()) - loaded_ids),
+    }
+
+
+async def _application_chunks(
+    db: AsyncSession,
+    application_ids: Sequence[int] | None,
+    application_filter: dict[str, Any] | None,
+    chunk_size: int
+):
+    """Yield lists of application input rows, in id order"""
+    if application_ids is not None:
+        ids = sorted(set(application_ids))
+        for start in range(0, len(ids), chunk_size):
+            result = await db.execute(
+                select(*APPLICATION_INPUTS)
+                .where(Application.id.in_(ids[start:start + chunk_size]))
+                .order_by(Application.id)
+            )
+            chunk = result.all()
+            if chunk:
+                yield chunk
+        return
+
+    # Keyset pagination over the filter: each chunk starts after the last id
+    clauses = application_filter_clauses(application_filter or {})
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(*APPLICATION_INPUTS)
+            .where(Application.id > last_id, *clauses)
+            .order_by(Application.id)
+            .limit(chunk_size)
+        )
+        chunk = result.all()
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
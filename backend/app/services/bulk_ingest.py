@@ -0,0 +1,117 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.application import Application
+from app.schemas.application import ApplicationCreate
+
+
+class TooManyRows(Exception):
+    """Raised when a bulk request exceeds the configured row limit"""
+
+
+class InvalidRow:
+    """Placeholder for an input row that could not be parsed"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Yield one parsed value per non-empty line of an NDJSON byte stream"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    if buffer.strip():
+        yield _parse_line(buffer)
+
+
+def iter_json_array(body: bytes) -> AsyncIterator[Any]:
+    """Parse a JSON array body, raising ValueError if it is not one"""
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array of applications")
+    return _iterate(items)
+
+
+async def _iterate(items: list[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidRow(f"Invalid JSON: {e}")
+
+
+def validate_row(row: Any) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+    """Return (column values, []) for a valid row or (None, errors)"""
+    if isinstance(row, InvalidRow):
+        return None, [{"loc": [], "msg": row.message, "type": "json_invalid"}]
+    try:
+        application = ApplicationCreate.model_validate(row)
+    except ValidationError as e:
+        return None, [
+            {"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]}
+            for error in e.errors()
+        ]
+    return application.model_dump(), []
+
+
+async def ingest_applications(
+    db: AsyncSession,
+    rows: AsyncIterable[Any],
+    chunk_size: int = 1000,
+    max_rows: int | None = None
+) -> dict[str, Any]:
+    """
+    Validate and insert applications chunk by chunk.
+
+    Each chunk of valid rows is written with one multi-row
+    ``INSERT ... RETURNING id``. Invalid rows are reported by input index and
+    never stop the others. ``ids`` lines up with the input, None for rows
+    that were rejected.
+    """
+    ids: list[int | None] = []
+    errors: list[dict[str, Any]] = []
+    pending: list[tuple[int, dict[str, Any]]] = []
+
+    async def flush() -> None:
+        if not pending:
+            return
+        result = await db.execute(
+            insert(Application).returning(Application.id, sort_by_parameter_order=True),
+            [values for _, values in pending]
+        )
+        for (index, _), new_id in zip(pending, result.scalars().all()):
+            ids[index] = new_id
+        pending.clear()
+
+    async for row in rows:
+        index = len(ids)
+        if max_rows is not None and index >= max_rows:
+            raise TooManyRows(f"Too many rows: at most {max_rows} applications per request")
+        ids.append(None)
+        values, row_errors = validate_row(row)
+        if row_errors:
+            errors.append({"index": index, "errors": row_errors})
+            continue
+        pending.append((index, values))
+        if len(pending) >= chunk_size:
+            await flush()
+    await flush()
+
+    return {
+        "received": len(ids),
+        "inserted": len(ids) - len(errors),
+        "failed": len(errors),
+        "ids": ids,
+        "errors": errors,
+    }
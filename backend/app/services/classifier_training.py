@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+from typing import Any, Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_session_maker
+from app.models.run import Run
+from app.steps.purpose_classifier import PurposeClassifier
+
+# Matches runs whose step logs contain an AI sentiment verdict (JSONB @>)
+AI_VERDICT_FILTER = [{"step_type": "sentiment_check", "details": {"method": "ai_analysis"}}]
+
+
+def extract_examples(step_logs_rows: Iterable[list[dict[str, Any]]]) -> tuple[list[str], list[bool]]:
+    """Turn run step logs into (loan purpose, is_risky) training pairs"""
+    texts, labels = [], []
+    for step_logs in step_logs_rows:
+        for log in step_logs:
+            details = log.get("details") or {}
+            if log.get("step_type") == "sentiment_check" and details.get("method") == "ai_analysis":
+                texts.append(details["loan_purpose"])
+                labels.append(not log["passed"])
+    return texts, labels
+
+
+async def load_training_examples(db: AsyncSession) -> tuple[list[str], list[bool]]:
+    """Collect training pairs from the AI verdicts stored in runs.step_logs"""
+    query = (
+        select(Run.step_logs)
+        .where(Run.step_logs.contains(AI_VERDICT_FILTER))
+        .execution_options(yield_per=1000)
+    )
+    rows = [step_logs async for step_logs in await db.stream_scalars(query)]
+    return extract_examples(rows)
+
+
+async def train_from_runs(db: AsyncSession, output_path: str, **fit_options: Any) -> PurposeClassifier:
+    """Train a purpose classifier on historical AI verdicts and save it"""
+    texts, labels = await load_training_examples(db)
+    if len(set(labels)) < 2:
+        raise ValueError("Need both risky and safe AI verdicts to train the classifier")
+
+    classifier = PurposeClassifier().fit(texts, labels, **fit_options)
+    classifier.save(output_path)
+    return classifier
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the sentiment_check cascade classifier")
+    parser.add_argument("--output", required=True, help="Path of the .npz model to write")
+    parser.add_argument("--epochs", type=int, default=10)
+    args = parser.parse_args()
+
+    async with async_session_maker() as db:
+        await train_from_runs(db, args.output, epochs=args.epochs)
+    print(f"Saved classifier to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
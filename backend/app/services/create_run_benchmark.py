@@ -0,0 +1,135 @@
+"""
+Round trips and latency of the POST /runs database path, before and after.
+
+Runs the previous ORM path (separate SELECTs for application and pipeline,
+then add, flush and refresh the run) and the current path (one joined
+SELECT with the plan from the pipeline cache, then INSERT ... RETURNING)
+against the configured database, and prints statements per run and latency
+percentiles for both. Every iteration is rolled back, so no runs are kept.
+
+    python -m app.services.create_run_benchmark --application-id 1 --pipeline-id 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_session_maker, engine
+from app.models.application import Application
+from app.models.pipeline import Pipeline
+from app.models.run import Run
+from app.services.pipeline_cache import pipeline_cache
+from app.services.run_inputs import executor_inputs, insert_run, load_run_inputs
+
+
+class StatementCounter:
+    """Count statements sent to the database while the block runs"""
+
+    def __init__(self, sync_engine: Engine):
+        self.sync_engine = sync_engine
+        self.count = 0
+
+    def _count(self, *args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.sync_engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        event.remove(self.sync_engine, "before_cursor_execute", self._count)
+
+
+async def orm_create_run(db: AsyncSession, application_id: int, pipeline_id: int) -> int:
+    """The create_run database path before it was reduced to two statements"""
+    application = (
+        await db.execute(select(Application).where(Application.id == application_id))
+    ).scalar_one()
+    pipeline = (await db.execute(select(Pipeline).where(Pipeline.id == pipeline_id))).scalar_one()
+    executor = pipeline_cache.get_executor(pipeline)
+    final_status, step_logs = await executor.execute(**executor_inputs(application))
+    db_run = Run(
+        application_id=application_id,
+        pipeline_id=pipeline_id,
+        status=final_status,
+        step_logs=step_logs,
+        completed_at=datetime.utcnow()
+    )
+    db.add(db_run)
+    await db.flush()
+    await db.refresh(db_run)
+    return db_run.id
+
+
+async def core_create_run(db: AsyncSession, application_id: int, pipeline_id: int) -> int:
+    """The current create_run database path"""
+    application, executor = await load_run_inputs(db, application_id, pipeline_id)
+    final_status, step_logs = await executor.execute(**executor_inputs(application))
+    run = await insert_run(
+        db,
+        application_id=application_id,
+        pipeline_id=pipeline_id,
+        status=final_status,
+        step_logs=step_logs,
+        completed_at=datetime.utcnow()
+    )
+    return run["id"]
+
+
+async def measure(
+    create: Callable[[AsyncSession, int, int], Awaitable[int]],
+    application_id: int,
+    pipeline_id: int,
+    iterations: int
+) -> dict[str, float]:
+    """Statements per run and latency percentiles (ms) of one create path"""
+    latencies = []
+    statements = 0
+    for _ in range(iterations):
+        async with async_session_maker() as db:
+            # Check out the connection first so pool pre-pings are not counted
+            await db.connection()
+            with StatementCounter(engine.sync_engine) as counter:
+                started = time.perf_counter()
+                await create(db, application_id, pipeline_id)
+                latencies.append((time.perf_counter() - started) * 1000)
+            statements += counter.count
+            await db.rollback()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "statements": statements / iterations,
+        "p50_ms": quantiles[49],
+        "p95_ms": quantiles[94],
+        "mean_ms": statistics.fmean(latencies),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the POST /runs database path")
+    parser.add_argument("--application-id", type=int, required=True)
+    parser.add_argument("--pipeline-id", type=int, required=True)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    if args.iterations < 2:
+        parser.error("--iterations must be at least 2")
+
+    # Warm the plan cache and the connection pool so both paths start equal
+    await measure(core_create_run, args.application_id, args.pipeline_id, 5)
+
+    for name, create in (("orm", orm_create_run), ("core", core_create_run)):
+        result = await measure(create, args.application_id, args.pipeline_id, args.iterations)
+        print(
+            f"{name:>5}: {result['statements']:.1f} statements/run, "
+            f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+            f"mean {result['mean_ms']:.2f} ms"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
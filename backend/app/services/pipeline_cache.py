@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any
+from app.core.config import get_settings
+from app.services.pipeline_executor import PipelineExecutor
+
+
+class PipelineCache:
+    """LRU cache of compiled pipeline executors.
+
+    Entries are keyed by pipeline id plus ``updated_at``, so editing a pipeline
+    produces a new key and the stale plan is never served again.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[tuple[int, datetime | None], PipelineExecutor] = OrderedDict()
+        self._lock = Lock()
+
+    def get_cached(self, pipeline_id: int, updated_at: datetime | None) -> PipelineExecutor | None:
+        """Return the compiled executor for a pipeline version if it is cached"""
+        key = (pipeline_id, updated_at)
+
+        with self._lock:
+            executor = self._plans.get(key)
+            if executor is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+            return executor
+
+    def get_executor(self, pipeline: Any) -> PipelineExecutor:
+        """Return the compiled executor for a pipeline, compiling it on a miss"""
+        key = (pipeline.id, pipeline.updated_at)
+
+        with self._lock:
+            executor = self._plans.get(key)
+            if executor is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return executor
+
+        # Compile outside the lock; a concurrent miss on the same key just
+        # builds an equivalent plan and the last one stored wins
+        executor = PipelineExecutor(
+            steps_config=pipeline.steps,
+            terminal_rules=pipeline.terminal_rules,
+            lazy=bool(getattr(pipeline, "lazy_evaluation", False)),
+            deadline_ms=getattr(pipeline, "deadline_ms", None),
+            pipeline_id=pipeline.id
+        )
+
+        with self._lock:
+            self.misses += 1
+            for stale_key in [k for k in self._plans if k[0] == pipeline.id and k != key]:
+                del self._plans[stale_key]
+            self._plans[key] = executor
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+        return executor
+
+    def invalidate(self, pipeline_id: int) -> None:
+        """Drop every cached plan for a pipeline"""
+        with self._lock:
+            for key in [k for k in self._plans if k[0] == pipeline_id]:
+                del self._plans[key]
+
+    def clear(self) -> None:
+        """Drop all cached plans"""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+pipeline_cache = PipelineCache(maxsize=get_settings().PIPELINE_CACHE_SIZE)
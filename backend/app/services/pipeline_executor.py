@@ -1,14 +1,78 @@
+import asyncio
+from collections import Counter
 from datetime import datetime
 from decimal import Decimal
-from app.steps.base import StepResult
+import operator
+import numpy as np
+from app.steps.base import BaseStep, BatchStepResult, StepResult
+from app.steps.features import FeatureContext
 from app.services.step_registry import StepRegistry
 
 
+RISK_OPERATORS = {
+    "<=": operator.le,
+    "<": operator.lt,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+
 class PipelineExecutor:
-    def __init__(self, steps_config: list[dict], terminal_rules: list[dict]):
+    def __init__(
+        self,
+        steps_config: list[dict],
+        terminal_rules: list[dict],
+        lazy: bool = False,
+        deadline_ms: int | None = None,
+        pipeline_id: int | None = None
+    ):
+        self.lazy = lazy
+        self.deadline_ms = deadline_ms
+        self.pipeline_id = pipeline_id
         self.steps_config = sorted(steps_config, key=lambda x: x["order"])
         self.terminal_rules = sorted(terminal_rules, key=lambda x: x["order"])
 
+        # Resolve step classes and build step instances once. Steps keep no
+        # per-run state, so a compiled executor can serve concurrent runs.
+        self.steps = [
+            (step_config, self._build_step(step_config))
+            for step_config in self.steps_config
+        ]
+        self.dependencies = self._resolve_dependencies()
+
+    @staticmethod
+    def _build_step(step_config: dict) -> BaseStep:
+        """Resolve the step class and instantiate it with validated params"""
+        step_params = step_config.get("params") or {}
+        if not isinstance(step_params, dict):
+            raise ValueError(
+                f"Invalid params for step {step_config['step_type']}: expected an object"
+            )
+        step_class = StepRegistry.get_step_class(step_config["step_type"])
+        return step_class(params=step_params)
+
+    def _resolve_dependencies(self) -> list[tuple[int, ...]]:
+        """
+        Build the step DAG as a list of dependency indexes per step.
+
+        A declared dependency resolves to the latest step of that type ordered
+        before the dependent step, which is exactly what sequential execution
+        exposed through previous_results. Dependencies that are not configured
+        earlier in the pipeline are ignored and the step uses its fallback.
+        """
+        dependencies = []
+        for index, (_, step_instance) in enumerate(self.steps):
+            step_deps = []
+            for dep_type in step_instance.depends_on:
+                earlier = [
+                    i for i in range(index)
+                    if self.steps[i][0]["step_type"] == dep_type
+                ]
+                if earlier:
+                    step_deps.append(earlier[-1])
+            dependencies.append(tuple(step_deps))
+        return dependencies
+
     async def execute(
         self,
         applicant_name: str,
@@ -20,29 +84,54 @@ class PipelineExecutor:
     ) -> tuple[str, list[dict]]:
         """
         Execute the pipeline and return (final_status, step_logs)
+
+        Independent steps run concurrently; a step starts as soon as the steps
+        it depends on have finished. In lazy mode steps run one at a time in
+        configured order and the remaining steps are skipped once the terminal
+        rules can no longer change the outcome. Step logs keep the configured
+        order either way.
         """
+        inputs = {
+            "applicant_name": applicant_name,
+            "amount": amount,
+            "monthly_income": monthly_income,
+            "declared_debts": declared_debts,
+            "country": country,
+            "loan_purpose": loan_purpose,
+        }
+        # One feature context per run, shared by every step. It also carries
+        # the run deadline so steps can size their own calls to what is left.
+        deadline = None
+        if self.deadline_ms:
+            deadline = asyncio.get_running_loop().time() + self.deadline_ms / 1000
+        features = FeatureContext(**inputs, deadline=deadline, pipeline_id=self.pipeline_id)
+
+        if self.lazy:
+            outcomes, decision = await self._execute_lazy(inputs, features)
+        else:
+            outcomes, decision = await self._execute_concurrent(inputs, features), None
+
         step_logs = []
         step_results = {}
 
-        # Execute each step in order
-        for step_config in self.steps_config:
+        for (step_config, _), outcome in zip(self.steps, outcomes):
             step_type = step_config["step_type"]
-            step_params = step_config.get("params", {})
-
-            # Get step class and instantiate
-            step_class = StepRegistry.get_step_class(step_type)
-            step_instance = step_class(params=step_params)
-
-            # Execute step
-            result = await step_instance.execute(
-                applicant_name=applicant_name,
-                amount=amount,
-                monthly_income=monthly_income,
-                declared_debts=declared_debts,
-                country=country,
-                loan_purpose=loan_purpose,
-                previous_results=step_results
-            )
+
+            if outcome is None:
+                # Step skipped by lazy evaluation
+                step_logs.append({
+                    "step_type": step_type,
+                    "order": step_config["order"],
+                    "passed": None,
+                    "skipped": True,
+                    "details": {
+                        "reason": f"Skipped because the outcome was already decided as {decision}"
+                    },
+                    "executed_at": datetime.utcnow().isoformat()
+                })
+                continue
+
+            result, executed_at = outcome
 
             # Store result
             step_results[step_type] = result
@@ -53,8 +142,10 @@ class PipelineExecutor:
                 "order": step_config["order"],
                 "passed": result.passed,
                 "details": result.details,
-                "executed_at": datetime.utcnow().isoformat()
+                "executed_at": executed_at
             }
+            if result.details.get("timed_out"):
+                step_log["timed_out"] = True
             step_logs.append(step_log)
 
         # Evaluate terminal rules
@@ -62,41 +153,293 @@ class PipelineExecutor:
 
         return final_status, step_logs
 
+    async def execute_batch(
+        self,
+        applicant_name: np.ndarray,
+        amount: np.ndarray,
+        monthly_income: np.ndarray,
+        declared_debts: np.ndarray,
+        country: np.ndarray,
+        loan_purpose: np.ndarray
+    ) -> tuple[np.ndarray, dict[str, BatchStepResult]]:
+        """
+        Execute the pipeline over columnar inputs and return
+        (final_statuses, step_results), one status per application.
+
+        Every step runs over the whole batch in configured order, so lazy
+        evaluation does not apply here.
+        """
+        inputs = {
+            "applicant_name": np.asarray(applicant_name, dtype=object),
+            "amount": np.asarray(amount, dtype=float),
+            "monthly_income": np.asarray(monthly_income, dtype=float),
+            "declared_debts": np.asarray(declared_debts, dtype=float),
+            "country": np.asarray(country, dtype=object),
+            "loan_purpose": np.asarray(loan_purpose, dtype=object),
+        }
+
+        outcomes: list[BatchStepResult] = []
+        step_results: dict[str, BatchStepResult] = {}
+
+        for index, (step_config, step_instance) in enumerate(self.steps):
+            previous_results = {
+                self.steps[dep_index][0]["step_type"]: outcomes[dep_index]
+                for dep_index in self.dependencies[index]
+            }
+            result = await step_instance.execute_batch(**inputs, previous_results=previous_results)
+            outcomes.append(result)
+            step_results[step_config["step_type"]] = result
+
+        final_statuses = self._evaluate_terminal_rules_batch(step_results, len(inputs["amount"]))
+
+        return final_statuses, step_results
+
+    async def _execute_concurrent(
+        self,
+        inputs: dict,
+        features: FeatureContext
+    ) -> list[tuple[StepResult, str]]:
+        """Run every step, overlapping steps that do not depend on each other"""
+        # Dependencies always point at earlier steps, so every task a step
+        # waits on has been created before it
+        tasks: list[asyncio.Task] = []
+        for index in range(len(self.steps)):
+            tasks.append(asyncio.create_task(self._run_step(index, tasks, inputs, features)))
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _execute_lazy(
+        self,
+        inputs: dict,
+        features: FeatureContext
+    ) -> tuple[list[tuple[StepResult, str] | None], str | None]:
+        """Run steps in order until the terminal rules settle on an outcome"""
+        outcomes: list[tuple[StepResult, str] | None] = [None] * len(self.steps)
+        step_results: dict[str, StepResult] = {}
+        pending = Counter(step_config["step_type"] for step_config, _ in self.steps)
+
+        for index, (step_config, step_instance) in enumerate(self.steps):
+            decision = self._decided_outcome(step_results, pending)
+            if decision is not None:
+                return outcomes, decision
+
+            previous_results = {
+                self.steps[dep_index][0]["step_type"]: outcomes[dep_index][0]
+                for dep_index in self.dependencies[index]
+            }
+            result = await self._execute_step(index, inputs, previous_results, features)
+            outcomes[index] = (result, datetime.utcnow().isoformat())
+
+            step_type = step_config["step_type"]
+            step_results[step_type] = result
+            pending[step_type] -= 1
+            if not pending[step_type]:
+                del pending[step_type]
+
+        return outcomes, None
+
+    async def _run_step(
+        self,
+        index: int,
+        tasks: list[asyncio.Task],
+        inputs: dict,
+        features: FeatureContext
+    ) -> tuple[StepResult, str]:
+        """Wait for the step's dependencies, then execute it"""
+        step_config, step_instance = self.steps[index]
+
+        previous_results = {}
+        for dep_index in self.dependencies[index]:
+            dep_result, _ = await tasks[dep_index]
+            previous_results[self.steps[dep_index][0]["step_type"]] = dep_result
+
+        result = await self._execute_step(index, inputs, previous_results, features)
+        return result, datetime.utcnow().isoformat()
+
+    async def _execute_step(
+        self,
+        index: int,
+        inputs: dict,
+        previous_results: dict[str, StepResult],
+        features: FeatureContext
+    ) -> StepResult:
+        """
+        Execute a step within its own timeout and the run's remaining budget.
+
+        A step that runs out of time is cancelled and replaced by its
+        configured fallback outcome (``on_timeout``, failing by default).
+        """
+        step_config, step_instance = self.steps[index]
+        step_timeout = step_config.get("timeout_ms")
+        remaining = features.remaining_budget()
+
+        timeout = step_timeout / 1000 if step_timeout else None
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+            reason = f"Run deadline of {self.deadline_ms} ms exceeded"
+        else:
+            reason = f"Step exceeded its {step_timeout} ms timeout"
+
+        execution = step_instance.execute(
+            **inputs,
+            previous_results=previous_results,
+            features=features
+        )
+        if timeout is None:
+            return await execution
+
+        try:
+            return await asyncio.wait_for(execution, timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            on_timeout = step_config.get("on_timeout", "fail")
+            return StepResult(
+                passed=on_timeout == "pass",
+                details={
+                    "timed_out": True,
+                    "timeout_ms": round(timeout * 1000),
+                    "on_timeout": on_timeout,
+                    "reason": reason
+                }
+            )
+
     def _evaluate_terminal_rules(self, step_results: dict[str, StepResult]) -> str:
         """Evaluate terminal rules in order and return final status"""
+        for rule in self.terminal_rules:
+            if self._rule_matches(rule, step_results):
+                return rule["outcome"]
+
+        # Fallback if no rules matched
+        return "NEEDS_REVIEW"
+
+    def _evaluate_terminal_rules_batch(
+        self,
+        step_results: dict[str, BatchStepResult],
+        size: int
+    ) -> np.ndarray:
+        """Evaluate terminal rules in order over whole result columns"""
+        final_statuses = np.full(size, "NEEDS_REVIEW", dtype=object)
+        undecided = np.ones(size, dtype=bool)
+
+        for rule in self.terminal_rules:
+            matched = self._rule_matches_batch(rule, step_results, size) & undecided
+            final_statuses[matched] = rule["outcome"]
+            undecided &= ~matched
+
+        return final_statuses
+
+    @staticmethod
+    def _rule_matches_batch(
+        rule: dict,
+        step_results: dict[str, BatchStepResult],
+        size: int
+    ) -> np.ndarray:
+        """Vectorized counterpart of _rule_matches returning a boolean mask"""
+        condition = rule["condition"]
+        condition_type = condition.get("type")
+
+        if condition_type == "step_failed":
+            failed = np.zeros(size, dtype=bool)
+            for st in condition.get("step_types", []):
+                if st in step_results:
+                    failed |= ~step_results[st].passed
+            return failed
+
+        elif condition_type == "risk_threshold":
+            risk_result = step_results.get("risk_scoring")
+            compare = RISK_OPERATORS.get(condition.get("operator", "<="))
+            if risk_result is None or compare is None:
+                return np.zeros(size, dtype=bool)
+            risk_score = risk_result.details.get("risk_score")
+            if risk_score is None:
+                risk_score = np.full(size, 999)
+            risk_score = np.asarray(risk_score, dtype=float)
+            return compare(risk_score, condition.get("value", 45))
+
+        elif condition_type == "default":
+            return np.ones(size, dtype=bool)
+
+        return np.zeros(size, dtype=bool)
+
+    def _decided_outcome(
+        self,
+        step_results: dict[str, StepResult],
+        pending: Counter
+    ) -> str | None:
+        """
+        Return the final status if pending steps can no longer change it.
+
+        The outcome is fixed once some rule is already satisfied by settled
+        step results and every higher priority rule can no longer match.
+        """
         for rule in self.terminal_rules:
             condition = rule["condition"]
-            condition_type = condition.get("type")
-
-            if condition_type == "step_failed":
-                # Check if any of the specified steps failed
-                step_types = condition.get("step_types", [])
-                if any(
-                    step_results.get(st) and not step_results[st].passed
-                    for st in step_types
-                ):
+
+            if condition.get("type") == "step_failed":
+                # A settled failure satisfies the rule whatever else is pending
+                settled = {st: r for st, r in step_results.items() if st not in pending}
+                if self._rule_matches(rule, settled):
                     return rule["outcome"]
 
-            elif condition_type == "risk_threshold":
-                # Check risk score from risk_scoring step
-                risk_result = step_results.get("risk_scoring")
-                if risk_result:
-                    risk_score = risk_result.details.get("risk_score", 999)
-                    threshold = condition.get("value", 45)
-                    operator = condition.get("operator", "<=")
-
-                    if operator == "<=" and risk_score <= threshold:
-                        return rule["outcome"]
-                    elif operator == "<" and risk_score < threshold:
-                        return rule["outcome"]
-                    elif operator == ">=" and risk_score >= threshold:
-                        return rule["outcome"]
-                    elif operator == ">" and risk_score > threshold:
-                        return rule["outcome"]
-
-            elif condition_type == "default":
-                # Default rule always matches
+            if any(st in pending for st in self._rule_inputs(rule)):
+                return None
+
+            if self._rule_matches(rule, step_results):
                 return rule["outcome"]
 
-        # Fallback if no rules matched
+        # Every rule is settled and none matched
         return "NEEDS_REVIEW"
+
+    @staticmethod
+    def _rule_inputs(rule: dict) -> list[str]:
+        """Return the step types a terminal rule reads"""
+        condition = rule["condition"]
+        condition_type = condition.get("type")
+
+        if condition_type == "step_failed":
+            return condition.get("step_types", [])
+        if condition_type == "risk_threshold":
+            return ["risk_scoring"]
+        return []
+
+    @staticmethod
+    def _rule_matches(rule: dict, step_results: dict[str, StepResult]) -> bool:
+        """Check whether a single terminal rule matches the step results"""
+        condition = rule["condition"]
+        condition_type = condition.get("type")
+
+        if condition_type == "step_failed":
+            # Check if any of the specified steps failed
+            step_types = condition.get("step_types", [])
+            return any(
+                step_results.get(st) and not step_results[st].passed
+                for st in step_types
+            )
+
+        elif condition_type == "risk_threshold":
+            # Check risk score from risk_scoring step
+            risk_result = step_results.get("risk_scoring")
+            if risk_result:
+                risk_score = risk_result.details.get("risk_score", 999)
+                threshold = condition.get("value", 45)
+                operator = condition.get("operator", "<=")
+
+                if operator == "<=" and risk_score <= threshold:
+                    return True
+                elif operator == "<" and risk_score < threshold:
+                    return True
+                elif operator == ">=" and risk_score >= threshold:
+                    return True
+                elif operator == ">" and risk_score > threshold:
+                    return True
+            return False
+
+        elif condition_type == "default":
+            # Default rule always matches
+            return True
+
+        return False
@@ -0,0 +1,104 @@
+from typing import Any
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.application import Application
+from app.models.pipeline import Pipeline
+from app.models.run import Run
+from app.services.pipeline_cache import PipelineCache, pipeline_cache
+from app.services.pipeline_executor import PipelineExecutor
+
+# Only the columns the executor needs, loaded as plain rows
+APPLICATION_INPUTS = (
+    Application.id,
+    Application.applicant_name,
+    Application.amount,
+    Application.monthly_income,
+    Application.declared_debts,
+    Application.country,
+    Application.loan_purpose,
+)
+
+
+class PipelineCompileError(Exception):
+    """Raised when a pipeline's steps cannot be compiled into a plan"""
+
+
+def executor_inputs(application: Any) -> dict[str, Any]:
+    """Keyword arguments of ``PipelineExecutor.execute`` for an application row"""
+    return {
+        "applicant_name": application.applicant_name,
+        "amount": application.amount,
+        "monthly_income": application.monthly_income,
+        "declared_debts": application.declared_debts,
+        "country": application.country,
+        "loan_purpose": application.loan_purpose,
+    }
+
+
+async def load_run_inputs(
+    db: AsyncSession,
+    application_id: int,
+    pipeline_id: int,
+    cache: PipelineCache = pipeline_cache
+) -> tuple[Any | None, PipelineExecutor | None]:
+    """
+    Application inputs and compiled pipeline for one run.
+
+    One query reads the application together with the pipeline's id and
+    ``updated_at``; the plan comes from ``cache``, so the pipeline's steps
+    are only read (in a second query) when it has not been compiled yet.
+    Returns None in place of whichever does not exist, and no executor when
+    the application is missing. A plan that fails to compile (e.g. bad step
+    params) raises ``PipelineCompileError``.
+    """
+    result = await db.execute(
+        select(
+            *APPLICATION_INPUTS,
+            Pipeline.id.label("pipeline_id"),
+            Pipeline.updated_at.label("pipeline_updated_at")
+        )
+        .select_from(Application)
+        .outerjoin(Pipeline, Pipeline.id == pipeline_id)
+        .where(Application.id == application_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None, None
+    if row.pipeline_id is None:
+        return row, None
+
+    executor = cache.get_cached(row.pipeline_id, row.pipeline_updated_at)
+    if executor is None:
+        pipe_result = await db.execute(select(Pipeline).where(Pipeline.id == pipeline_id))
+        pipeline = pipe_result.scalar_one_or_none()
+        if pipeline is not None:
+            executor = compile_plan(pipeline, cache)
+    return row, executor
+
+
+def compile_plan(pipeline: Pipeline, cache: PipelineCache = pipeline_cache) -> PipelineExecutor:
+    """Compiled plan of a pipeline, raising ``PipelineCompileError`` for bad steps"""
+    try:
+        return cache.get_executor(pipeline)
+    except Exception as e:
+        raise PipelineCompileError(str(e)) from e
+
+
+async def insert_run(db: AsyncSession, **values: Any) -> dict[str, Any]:
+    """
+    Store a run with one ``INSERT ... RETURNING`` and return its columns.
+
+    No ORM object is created, so nothing is added to the session's identity
+    map and no refresh is needed for the server-side defaults.
+    """
+    result = await db.execute(
+        insert(Run).values(**values).returning(Run.id, Run.started_at, Run.created_at)
+    )
+    row = result.one()
+    return {
+        "id": row.id,
+        "started_at": row.started_at,
+        "created_at": row.created_at,
+        "completed_at": None,
+        **values,
+    }
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Any, Callable, Literal, Sequence
+from sqlalchemy import Select, or_, select, tuple_
+from sqlalchemy.orm import defer
+from app.models.application import Application
+from app.models.pipeline import Pipeline
+from app.models.run import Run
+
+RunSort = Literal[
+    "created_at", "-created_at",
+    "status", "-status",
+    "applicant_name", "-applicant_name",
+    "pipeline_name", "-pipeline_name",
+]
+
+# Sort key -> (column, converter for the cursor value). Every sort is broken
+# by run id so keyset pagination never skips or repeats rows.
+SORT_COLUMNS: dict[str, tuple[Any, Callable[[Any], Any]]] = {
+    "created_at": (Run.created_at, datetime.fromisoformat),
+    "status": (Run.status, str),
+    "applicant_name": (Application.applicant_name, str),
+    "pipeline_name": (Pipeline.name, str),
+}
+JOINED_SORTS = ("applicant_name", "pipeline_name")
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def needs_join(sort: str, search: str | None, include_names: bool) -> bool:
+    """Whether the query has to join applications and pipelines"""
+    return include_names or bool(search) or sort.lstrip("-") in JOINED_SORTS
+
+
+def run_list_query(
+    sort: str = "-created_at",
+    application_id: int | None = None,
+    pipeline_id: int | None = None,
+    statuses: Sequence[str] | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    search: str | None = None,
+    include_names: bool = False,
+    summary: bool = False,
+    after: dict[str, Any] | None = None,
+    limit: int = 100
+) -> Select:
+    """
+    One page of runs matching the filters, in ``sort`` order.
+
+    Rows are ``(Run, applicant_name, pipeline_name)`` when the query joins
+    applications and pipelines (see ``needs_join``), plain runs otherwise.
+    ``search`` matches applicant and pipeline names case-insensitively, and
+    the run id when it is a number. ``after`` is a decoded cursor position;
+    ``limit + 1`` rows are fetched so the caller can tell if a page follows.
+    With ``summary``, ``step_logs`` is left out of the SELECT, so its JSONB
+    is never read from disk; touching it on the loaded runs raises.
+    """
+    key = sort.lstrip("-")
+    descending = sort.startswith("-")
+    column = SORT_COLUMNS[key][0]
+
+    if needs_join(sort, search, include_names):
+        query = (
+            select(Run, Application.applicant_name, Pipeline.name)
+            .join(Application, Application.id == Run.application_id)
+            .join(Pipeline, Pipeline.id == Run.pipeline_id)
+        )
+    else:
+        query = select(Run)
+    if summary:
+        query = query.options(defer(Run.step_logs, raiseload=True))
+
+    if application_id:
+        query = query.where(Run.application_id == application_id)
+    if pipeline_id:
+        query = query.where(Run.pipeline_id == pipeline_id)
+    if statuses:
+        query = query.where(Run.status.in_(statuses))
+    if created_from:
+        query = query.where(Run.created_at >= created_from)
+    if created_to:
+        query = query.where(Run.created_at < created_to)
+    if search:
+        pattern = f"%{_escape_like(search.strip())}%"
+        matches = [
+            Application.applicant_name.ilike(pattern, escape="\\"),
+            Pipeline.name.ilike(pattern, escape="\\"),
+        ]
+        if search.strip().isdigit():
+            matches.append(Run.id == int(search.strip()))
+        query = query.where(or_(*matches))
+
+    if after is not None:
+        position = tuple_(column, Run.id)
+        cursor = tuple_(after["value"], after["id"])
+        query = query.where(position < cursor if descending else position > cursor)
+
+    if descending:
+        query = query.order_by(column.desc(), Run.id.desc())
+    else:
+        query = query.order_by(column.asc(), Run.id.asc())
+    return query.limit(limit + 1)
+
+
+def cursor_keys(sort: str) -> dict[str, Callable[[Any], Any]]:
+    """Converters for ``decode_cursor`` of a cursor issued for ``sort``"""
+    return {"sort": str, "value": SORT_COLUMNS[sort.lstrip("-")][1], "id": int}
+
+
+def cursor_position(sort: str, run: Run, applicant_name: str | None, pipeline_name: str | None) -> dict[str, Any]:
+    """Cursor position of a run in a listing sorted by ``sort``"""
+    key = sort.lstrip("-")
+    value = {
+        "created_at": run.created_at.isoformat(),
+        "status": run.status,
+        "applicant_name": applicant_name,
+        "pipeline_name": pipeline_name,
+    }[key]
+    return {"sort": sort, "value": value, "id": run.id}
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.llm.streaming import pending_reasons
+from app.models.run import Run
+
+
+def pending_reason_ids(step_logs: list[dict[str, Any]]) -> list[str]:
+    """Reason ids of step results whose streamed reason is still arriving"""
+    return [
+        log["details"]["reason_pending"]
+        for log in step_logs
+        if (log.get("details") or {}).get("reason_pending")
+    ]
+
+
+def attach_reasons(step_logs: list[dict[str, Any]], reasons: dict[str, str | None]) -> list[dict[str, Any]]:
+    """Copy of step_logs with collected reasons in place of the pending markers"""
+    updated = []
+    for log in step_logs:
+        details = log.get("details") or {}
+        reason_id = details.get("reason_pending")
+        if reason_id in reasons:
+            details = {name: value for name, value in details.items() if name != "reason_pending"}
+            reason = reasons[reason_id]
+            if reason is not None:
+                details["ai_assessment"] = reason
+            details["reason_attached"] = reason is not None
+            log = {**log, "details": details}
+        updated.append(log)
+    return updated
+
+
+async def attach_streamed_reasons(run_id: int, reason_ids: list[str], timeout: float | None = None) -> None:
+    """Wait for a stored run's background-streamed reasons and write them into its step logs"""
+    if timeout is None:
+        timeout = get_settings().SENTIMENT_STREAM_REASON_TIMEOUT_SECONDS
+    # Collected before opening a session so no connection is held while waiting
+    collected = await asyncio.gather(*(pending_reasons.collect(reason_id, timeout) for reason_id in reason_ids))
+    reasons = dict(zip(reason_ids, collected))
+
+    async with async_session_maker() as db:
+        run = await db.get(Run, run_id)
+        if run is None:
+            return
+        run.step_logs = attach_reasons(run.step_logs, reasons)
+        await db.commit()
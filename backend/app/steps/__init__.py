@@ -1,4 +1,5 @@
-from app.steps.base import BaseStep, StepResult
+from app.steps.base import BaseStep, BatchStepResult, StepResult
+from app.steps.features import FeatureContext
 from app.steps.dti_rule import DTIRuleStep
 from app.steps.amount_policy import AmountPolicyStep
 from app.steps.risk_scoring import RiskScoringStep
@@ -7,6 +8,8 @@ from app.steps.sentiment_check import SentimentCheckStep
 __all__ = [
     "BaseStep",
     "StepResult",
+    "BatchStepResult",
+    "FeatureContext",
     "DTIRuleStep",
     "AmountPolicyStep",
     "RiskScoringStep",
@@ -1,6 +1,8 @@
 from typing import Any
 from decimal import Decimal
-from app.steps.base import BaseStep, StepResult
+import numpy as np
+from app.steps.base import BaseStep, BatchStepResult, StepResult
+from app.steps.features import FeatureContext
 
 
 class AmountPolicyStep(BaseStep):
@@ -25,17 +27,55 @@ class AmountPolicyStep(BaseStep):
         declared_debts: Decimal,
         country: str,
         loan_purpose: str,
-        previous_results: dict[str, StepResult]
+        previous_results: dict[str, StepResult],
+        features: FeatureContext | None = None
     ) -> StepResult:
+        features = features or FeatureContext(
+            applicant_name, amount, monthly_income, declared_debts, country, loan_purpose
+        )
+        country_code = features.get("country_code")
+
         # Get country cap or default to OTHER
-        cap = self.params.get(country, self.params.get("OTHER", 20000))
+        cap = self.params.get(country_code, self.params.get("OTHER", 20000))
 
-        passed = float(amount) <= cap
+        passed = features.get("amount_float") <= cap
 
         details = {
-            "amount": float(amount),
-            "country": country,
+            "amount": features.get("amount_float"),
+            "country": country_code,
             "cap": cap
         }
 
         return StepResult(passed=passed, details=details)
+
+    async def execute_batch(
+        self,
+        applicant_name: np.ndarray,
+        amount: np.ndarray,
+        monthly_income: np.ndarray,
+        declared_debts: np.ndarray,
+        country: np.ndarray,
+        loan_purpose: np.ndarray,
+        previous_results: dict[str, BatchStepResult]
+    ) -> BatchStepResult:
+        amount = np.asarray(amount, dtype=float)
+
+        # Normalize and look up each distinct country once, then broadcast
+        # codes and caps back to rows
+        countries, row_index = np.unique(np.asarray(country, dtype=object), return_inverse=True)
+        codes = np.array([str(code).strip().upper() for code in countries], dtype=object)
+        caps = np.array([
+            self.params.get(code, self.params.get("OTHER", 20000))
+            for code in codes
+        ])
+        country = codes[row_index]
+        cap = caps[row_index]
+
+        return BatchStepResult(
+            passed=amount <= cap,
+            details={
+                "amount": amount,
+                "country": country,
+                "cap": cap
+            }
+        )
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 from decimal import Decimal
+import numpy as np
+from app.steps.features import FeatureContext
 
 
 class StepResult:
@@ -9,7 +11,35 @@ class StepResult:
         self.details = details
 
 
+class BatchStepResult:
+    """Columnar step result: one passed flag and one value per detail per row"""
+
+    def __init__(self, passed: np.ndarray, details: dict[str, np.ndarray]):
+        self.passed = passed
+        self.details = details
+
+    def __len__(self) -> int:
+        return len(self.passed)
+
+    def row(self, index: int) -> StepResult:
+        """Return the result for a single row"""
+        return StepResult(
+            passed=bool(self.passed[index]),
+            details={key: _to_python(values[index]) for key, values in self.details.items()}
+        )
+
+
+def _to_python(value: Any) -> Any:
+    """Convert NumPy scalars back to plain Python values"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
 class BaseStep(ABC):
+    # Step types whose results this step reads from ``previous_results``.
+    # The executor runs steps without a dependency path between them
+    # concurrently, and only passes declared dependencies to ``execute``.
+    depends_on: tuple[str, ...] = ()
+
     def __init__(self, params: dict[str, Any] | None = None):
         self.params = params or {}
 
@@ -22,11 +52,62 @@ class BaseStep(ABC):
         declared_debts: Decimal,
         country: str,
         loan_purpose: str,
-        previous_results: dict[str, StepResult]
+        previous_results: dict[str, StepResult],
+        features: FeatureContext | None = None
     ) -> StepResult:
-        """Execute the step and return result"""
+        """
+        Execute the step and return result.
+
+        ``features`` is the run's shared FeatureContext; steps read derived
+        values from it so they are computed once per run. Callers that invoke
+        a step directly may omit it.
+        """
         pass
 
+    async def execute_batch(
+        self,
+        applicant_name: np.ndarray,
+        amount: np.ndarray,
+        monthly_income: np.ndarray,
+        declared_debts: np.ndarray,
+        country: np.ndarray,
+        loan_purpose: np.ndarray,
+        previous_results: dict[str, BatchStepResult]
+    ) -> BatchStepResult:
+        """
+        Execute the step over columnar inputs, one array element per application.
+
+        The default implementation calls ``execute`` row by row; steps that can
+        be expressed as array arithmetic override it with a vectorized version.
+        """
+        results = []
+        for i in range(len(amount)):
+            results.append(await self.execute(
+                applicant_name=str(applicant_name[i]),
+                amount=Decimal(str(amount[i])),
+                monthly_income=Decimal(str(monthly_income[i])),
+                declared_debts=Decimal(str(declared_debts[i])),
+                country=str(country[i]),
+                loan_purpose=str(loan_purpose[i]),
+                previous_results={
+                    step_type: batch_result.row(i)
+                    for step_type, batch_result in previous_results.items()
+                }
+            ))
+
+        detail_keys = list(dict.fromkeys(key for result in results for key in result.details))
+        details = {}
+        for key in detail_keys:
+            column = np.empty(len(results), dtype=object)
+            for i, result in enumerate(results):
+                column[i] = result.details.get(key)
+            details[key] = column
+
+        return BatchStepResult(
+            passed=np.array([result.passed for result in results], dtype=bool),
+            details=details
+        )
+
     @classmethod
     @abstractmethod
     def get_step_type(cls) -> str:
@@ -1,6 +1,8 @@
 from typing import Any
 from decimal import Decimal
-from app.steps.base import BaseStep, StepResult
+import numpy as np
+from app.steps.base import BaseStep, BatchStepResult, StepResult
+from app.steps.features import FeatureContext
 
 
 class DTIRuleStep(BaseStep):
@@ -20,20 +22,55 @@ class DTIRuleStep(BaseStep):
         declared_debts: Decimal,
         country: str,
         loan_purpose: str,
-        previous_results: dict[str, StepResult]
+        previous_results: dict[str, StepResult],
+        features: FeatureContext | None = None
     ) -> StepResult:
+        features = features or FeatureContext(
+            applicant_name, amount, monthly_income, declared_debts, country, loan_purpose
+        )
         max_dti = self.params.get("max_dti", 0.40)
 
-        # Calculate DTI
-        dti = float(declared_debts) / float(monthly_income) if monthly_income > 0 else 1.0
+        dti = features.get("dti")
 
         passed = dti <= max_dti
 
         details = {
             "dti": round(dti, 4),
             "max_dti": max_dti,
-            "declared_debts": float(declared_debts),
-            "monthly_income": float(monthly_income)
+            "declared_debts": features.get("declared_debts_float"),
+            "monthly_income": features.get("monthly_income_float")
         }
 
         return StepResult(passed=passed, details=details)
+
+    async def execute_batch(
+        self,
+        applicant_name: np.ndarray,
+        amount: np.ndarray,
+        monthly_income: np.ndarray,
+        declared_debts: np.ndarray,
+        country: np.ndarray,
+        loan_purpose: np.ndarray,
+        previous_results: dict[str, BatchStepResult]
+    ) -> BatchStepResult:
+        max_dti = self.params.get("max_dti", 0.40)
+        monthly_income = np.asarray(monthly_income, dtype=float)
+        declared_debts = np.asarray(declared_debts, dtype=float)
+
+        # Calculate DTI, treating non-positive income as a DTI of 1.0
+        dti = np.divide(
+            declared_debts,
+            monthly_income,
+            out=np.ones_like(monthly_income),
+            where=monthly_income > 0
+        )
+
+        return BatchStepResult(
+            passed=dti <= max_dti,
+            details={
+                "dti": np.round(dti, 4),
+                "max_dti": np.full(len(dti), max_dti),
+                "declared_debts": declared_debts,
+                "monthly_income": monthly_income
+            }
+        )
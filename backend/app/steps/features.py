@@ -0,0 +1,117 @@
+import asyncio
+import unicodedata
+from decimal import Decimal
+from typing import Any, Callable
+
+
+class FeatureContext:
+    """
+    Per-run application inputs plus derived features computed on first use.
+
+    Features are registered declaratively with ``FeatureContext.register`` and
+    memoized per context, so steps sharing a run share the computed values.
+    Parameterized features (e.g. ``amount_to_cap``) are memoized per argument
+    set.
+    """
+
+    _features: dict[str, Callable[..., Any]] = {}
+
+    def __init__(
+        self,
+        applicant_name: str,
+        amount: Decimal,
+        monthly_income: Decimal,
+        declared_debts: Decimal,
+        country: str,
+        loan_purpose: str,
+        deadline: float | None = None,
+        pipeline_id: int | None = None
+    ):
+        self.applicant_name = applicant_name
+        self.amount = amount
+        self.monthly_income = monthly_income
+        self.declared_debts = declared_debts
+        self.country = country
+        self.loan_purpose = loan_purpose
+        # Absolute event loop time by which the run must finish, if bounded
+        self.deadline = deadline
+        # Pipeline being run, if known, for telemetry
+        self.pipeline_id = pipeline_id
+        self._values: dict[Any, Any] = {}
+
+    @classmethod
+    def register(cls, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Register a feature function taking the context (and optional kwargs)"""
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            cls._features[name] = func
+            return func
+        return decorator
+
+    @classmethod
+    def list_features(cls) -> list[str]:
+        """List registered feature names"""
+        return sorted(cls._features)
+
+    def remaining_budget(self) -> float | None:
+        """Seconds left before the run deadline, or None when unbounded"""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - asyncio.get_running_loop().time(), 0.0)
+
+    def get(self, name: str, **kwargs: Any) -> Any:
+        """Return a feature value, computing it on first request"""
+        key = (name, tuple(sorted(kwargs.items())))
+        if key not in self._values:
+            if name not in self._features:
+                raise ValueError(f"Unknown feature: {name}")
+            self._values[key] = self._features[name](self, **kwargs)
+        return self._values[key]
+
+
+def normalize_text(text: str) -> str:
+    """Casefold, strip diacritics and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+@FeatureContext.register("amount_float")
+def _amount_float(ctx: FeatureContext) -> float:
+    return float(ctx.amount)
+
+
+@FeatureContext.register("monthly_income_float")
+def _monthly_income_float(ctx: FeatureContext) -> float:
+    return float(ctx.monthly_income)
+
+
+@FeatureContext.register("declared_debts_float")
+def _declared_debts_float(ctx: FeatureContext) -> float:
+    return float(ctx.declared_debts)
+
+
+@FeatureContext.register("dti")
+def _dti(ctx: FeatureContext) -> float:
+    if ctx.monthly_income > 0:
+        return ctx.get("declared_debts_float") / ctx.get("monthly_income_float")
+    return 1.0
+
+
+@FeatureContext.register("amount_to_cap")
+def _amount_to_cap(ctx: FeatureContext, cap: float) -> float:
+    return ctx.get("amount_float") / cap
+
+
+@FeatureContext.register("country_code")
+def _country_code(ctx: FeatureContext) -> str:
+    return ctx.country.strip().upper()
+
+
+@FeatureContext.register("loan_purpose_lower")
+def _loan_purpose_lower(ctx: FeatureContext) -> str:
+    return ctx.loan_purpose.lower()
+
+
+@FeatureContext.register("loan_purpose_normalized")
+def _loan_purpose_normalized(ctx: FeatureContext) -> str:
+    return normalize_text(ctx.loan_purpose)
@@ -0,0 +1,101 @@
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+from app.steps.features import normalize_text
+
+
+class KeywordMatcher:
+    """
+    Single-pass multi-keyword matcher (Aho-Corasick automaton).
+
+    Keywords and text are compared after ``normalize_text``, so matching is
+    case and diacritic insensitive. The text is scanned once regardless of how
+    many keywords are loaded. With ``word_boundaries`` a keyword only matches
+    when it is not part of a longer word ("bet" matches "bet on" but not
+    "better").
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False):
+        self.keywords = list(keywords)
+        self.word_boundaries = word_boundaries
+
+        # Trie nodes: transitions, failure link, nearest failure ancestor
+        # that ends a pattern, and the keyword indexes ending at the node
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output_link: list[int] = [-1]
+        self._outputs: list[list[int]] = [[]]
+        self._depth: list[int] = [0]
+
+        for index, keyword in enumerate(self.keywords):
+            pattern = normalize_text(keyword)
+            if pattern:
+                self._add(pattern, index)
+        self._build_links()
+
+    def find(self, text: str, normalized: bool = False) -> list[str]:
+        """Return the keywords found in text, in keyword list order"""
+        if not normalized:
+            text = normalize_text(text)
+
+        goto, fail, output_link, outputs = self._goto, self._fail, self._output_link, self._outputs
+        matched: set[int] = set()
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            hit = node if outputs[node] else output_link[node]
+            while hit > 0:
+                if not self.word_boundaries or self._on_boundaries(text, position, self._depth[hit]):
+                    matched.update(outputs[hit])
+                hit = output_link[hit]
+
+        return [self.keywords[index] for index in sorted(matched)]
+
+    def _add(self, pattern: str, index: int) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output_link.append(-1)
+                self._outputs.append([])
+                self._depth.append(self._depth[node] + 1)
+            node = next_node
+        self._outputs[node].append(index)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                failed_to = self._fail[child]
+                self._output_link[child] = failed_to if self._outputs[failed_to] else self._output_link[failed_to]
+
+    @staticmethod
+    def _on_boundaries(text: str, end: int, length: int) -> bool:
+        start = end - length + 1
+        before = text[start - 1] if start > 0 else " "
+        after = text[end + 1] if end + 1 < len(text) else " "
+        return not _is_word_char(before) and not _is_word_char(after)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+@lru_cache(maxsize=128)
+def compile_keywords(keywords: tuple[str, ...], word_boundaries: bool = False) -> KeywordMatcher:
+    """Return a compiled matcher, shared by every step using the same keyword set"""
+    return KeywordMatcher(keywords, word_boundaries=word_boundaries)
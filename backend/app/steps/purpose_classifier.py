@@ -0,0 +1,141 @@
+import logging
+import zlib
+from typing import Iterable, Sequence
+import numpy as np
+from app.core.config import get_settings
+from app.steps.features import normalize_text
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+class PurposeClassifier:
+    """
+    Hashed n-gram logistic regression scoring how risky a loan purpose is.
+
+    Text is normalized with ``normalize_text`` and turned into word unigrams,
+    word bigrams and character n-grams, hashed into ``n_features`` signed
+    buckets (crc32, so hashes are stable across processes). ``predict_proba``
+    returns the probability that the purpose is risky.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        char_ngrams: tuple[int, int] = (3, 5),
+        weights: np.ndarray | None = None,
+        bias: float = 0.0
+    ):
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+        self.weights = weights if weights is not None else np.zeros(n_features, dtype=np.float64)
+        self.bias = bias
+
+    def predict_proba(self, text: str, normalized: bool = False) -> float:
+        """Probability that the purpose is risky"""
+        indices, values = self._vectorize(text if normalized else normalize_text(text))
+        return _sigmoid(float(self.weights[indices] @ values) + self.bias)
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[bool],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        seed: int = 0
+    ) -> "PurposeClassifier":
+        """Train with SGD on (purpose, is_risky) pairs"""
+        vectors = [self._vectorize(normalize_text(text)) for text in texts]
+        targets = np.asarray(labels, dtype=np.float64)
+        rng = np.random.default_rng(seed)
+
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for i in rng.permutation(len(vectors)):
+                indices, values = vectors[i]
+                error = _sigmoid(float(self.weights[indices] @ values) + self.bias) - targets[i]
+                # Regularize only the touched weights to keep updates sparse
+                gradient = error * values + l2 * self.weights[indices]
+                np.subtract.at(self.weights, indices, rate * gradient)
+                self.bias -= rate * error
+        return self
+
+    def save(self, path: str) -> None:
+        """Write the model to an .npz file"""
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                format_version=FORMAT_VERSION,
+                weights=self.weights,
+                bias=self.bias,
+                char_ngrams=np.asarray(self.char_ngrams)
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "PurposeClassifier":
+        """Read a model written by ``save``"""
+        with np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported classifier format: {int(data['format_version'])}")
+            weights = data["weights"]
+            return cls(
+                n_features=len(weights),
+                char_ngrams=tuple(int(n) for n in data["char_ngrams"]),
+                weights=weights,
+                bias=float(data["bias"])
+            )
+
+    def _vectorize(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        grams = list(_ngrams(text, self.char_ngrams))
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        hashes = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.int64)
+        indices = hashes % self.n_features
+        # The top hash bit picks the sign so colliding grams tend to cancel
+        signs = np.where((hashes >> 31) & 1, -1.0, 1.0)
+        return indices, signs / np.sqrt(len(grams))
+
+
+def _ngrams(text: str, char_ngrams: tuple[int, int]) -> Iterable[str]:
+    words = text.split()
+    for word in words:
+        yield f"w:{word}"
+    for first, second in zip(words, words[1:]):
+        yield f"b:{first} {second}"
+    padded = f" {text} "
+    low, high = char_ngrams
+    for n in range(low, high + 1):
+        for start in range(len(padded) - n + 1):
+            yield f"c:{padded[start:start + n]}"
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return float(1.0 / (1.0 + np.exp(-z)))
+    exp_z = np.exp(z)
+    return float(exp_z / (1.0 + exp_z))
+
+
+_classifier: PurposeClassifier | None = None
+
+
+def load_purpose_classifier(path: str | None = None) -> PurposeClassifier | None:
+    """Load the configured model into the process, keeping the AI path if it fails"""
+    global _classifier
+    path = path or get_settings().SENTIMENT_CLASSIFIER_PATH
+    if not path:
+        _classifier = None
+        return None
+    try:
+        _classifier = PurposeClassifier.load(path)
+    except (OSError, ValueError, KeyError):
+        logger.error("Could not load purpose classifier from %s; cascade mode disabled", path, exc_info=True)
+        _classifier = None
+    return _classifier
+
+
+def get_purpose_classifier() -> PurposeClassifier | None:
+    """Return the loaded local model, if any"""
+    return _classifier
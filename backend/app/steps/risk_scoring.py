@@ -1,9 +1,13 @@
 from typing import Any
 from decimal import Decimal
-from app.steps.base import BaseStep, StepResult
+import numpy as np
+from app.steps.base import BaseStep, BatchStepResult, StepResult
+from app.steps.features import FeatureContext
 
 
 class RiskScoringStep(BaseStep):
+    depends_on = ("amount_policy",)
+
     @classmethod
     def get_step_type(cls) -> str:
         return "risk_scoring"
@@ -20,12 +24,15 @@ class RiskScoringStep(BaseStep):
         declared_debts: Decimal,
         country: str,
         loan_purpose: str,
-        previous_results: dict[str, StepResult]
+        previous_results: dict[str, StepResult],
+        features: FeatureContext | None = None
     ) -> StepResult:
+        features = features or FeatureContext(
+            applicant_name, amount, monthly_income, declared_debts, country, loan_purpose
+        )
         approve_threshold = self.params.get("approve_threshold", 45)
 
-        # Calculate DTI
-        dti = float(declared_debts) / float(monthly_income) if monthly_income > 0 else 1.0
+        dti = features.get("dti")
 
         # Get max_allowed from amount_policy step or use default
         amount_policy_result = previous_results.get("amount_policy")
@@ -34,10 +41,10 @@ class RiskScoringStep(BaseStep):
         else:
             # Fallback defaults
             country_caps = {"ES": 30000, "FR": 25000, "DE": 35000}
-            max_allowed = country_caps.get(country, 20000)
+            max_allowed = country_caps.get(features.get("country_code"), 20000)
 
         # Calculate risk score: risk = (dti * 100) + (amount/max_allowed * 20)
-        risk = (dti * 100) + (float(amount) / max_allowed * 20)
+        risk = (dti * 100) + (features.get("amount_to_cap", cap=max_allowed) * 20)
 
         passed = risk <= approve_threshold
 
@@ -45,8 +52,55 @@ class RiskScoringStep(BaseStep):
             "risk_score": round(risk, 2),
             "approve_threshold": approve_threshold,
             "dti": round(dti, 4),
-            "amount": float(amount),
+            "amount": features.get("amount_float"),
             "max_allowed": max_allowed
         }
 
         return StepResult(passed=passed, details=details)
+
+    async def execute_batch(
+        self,
+        applicant_name: np.ndarray,
+        amount: np.ndarray,
+        monthly_income: np.ndarray,
+        declared_debts: np.ndarray,
+        country: np.ndarray,
+        loan_purpose: np.ndarray,
+        previous_results: dict[str, BatchStepResult]
+    ) -> BatchStepResult:
+        approve_threshold = self.params.get("approve_threshold", 45)
+        amount = np.asarray(amount, dtype=float)
+        monthly_income = np.asarray(monthly_income, dtype=float)
+        declared_debts = np.asarray(declared_debts, dtype=float)
+
+        # Calculate DTI
+        dti = np.divide(
+            declared_debts,
+            monthly_income,
+            out=np.ones_like(monthly_income),
+            where=monthly_income > 0
+        )
+
+        # Get max_allowed from amount_policy step or use default
+        amount_policy_result = previous_results.get("amount_policy")
+        if amount_policy_result:
+            max_allowed = np.asarray(amount_policy_result.details["cap"])
+        else:
+            country_caps = {"ES": 30000, "FR": 25000, "DE": 35000}
+            countries, row_index = np.unique(np.asarray(country, dtype=object), return_inverse=True)
+            max_allowed = np.array([
+                country_caps.get(str(code).strip().upper(), 20000) for code in countries
+            ])[row_index]
+
+        risk = (dti * 100) + (amount / max_allowed * 20)
+
+        return BatchStepResult(
+            passed=risk <= approve_threshold,
+            details={
+                "risk_score": np.round(risk, 2),
+                "approve_threshold": np.full(len(risk), approve_threshold),
+                "dti": np.round(dti, 4),
+                "amount": amount,
+                "max_allowed": max_allowed
+            }
+        )
@@ -1,8 +1,55 @@
-from typing import Any
+import json
+from typing import Any, Awaitable, Callable
 from decimal import Decimal
 from app.steps.base import BaseStep, StepResult
-from openai import AsyncOpenAI
+from app.steps.features import FeatureContext
+from app.steps.keyword_matcher import compile_keywords
+from app.steps.purpose_classifier import get_purpose_classifier
 from app.core.config import get_settings
+from app.llm.batcher import MicroBatcher
+from app.llm.call_info import current_call_info, record_call_info
+from app.llm.circuit_breaker import CircuitOpenError, sentiment_breaker
+from app.llm.client import get_openai_client
+from app.llm.hedging import sentiment_hedger
+from app.llm.rate_limiter import openai_rate_limiter
+from app.llm.single_flight import sentiment_single_flight
+from app.llm.streaming import pending_reasons, read_leading_verdict
+from app.llm.telemetry import (
+    CallTelemetry,
+    add_queue_wait,
+    current_telemetry,
+    fallback_reason,
+    llm_call_recorder,
+    mark_first_token,
+    mark_request_sent,
+    record_usage,
+)
+from app.llm.verdict_cache import verdict_cache, verdict_cache_key
+
+# Time reserved at the end of the run budget for the keyword fallback
+DEADLINE_MARGIN_SECONDS = 0.05
+
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are a loan risk analyzer. Analyze if the loan purpose indicates risky or speculative activities. Respond with only 'RISKY' or 'SAFE' followed by a brief reason."
+# Bump whenever SYSTEM_PROMPT changes so cached verdicts are not reused
+PROMPT_VERSION = "1"
+VERDICTS = ("RISKY", "SAFE")
+
+BATCH_SYSTEM_PROMPT = "You are a loan risk analyzer. For each numbered loan purpose, decide if it indicates risky or speculative activities. Respond with only a JSON object of the form {\"verdicts\": [{\"id\": <number>, \"verdict\": \"RISKY\" or \"SAFE\", \"reason\": \"<brief reason>\"}]} with exactly one entry per purpose."
+BATCH_PROMPT_VERSION = "batch-1"
+# Streamed answers are cut after the verdict word, so they are cached apart
+# from full answers
+STREAM_PROMPT_VERSION = "stream-1"
+BATCH_TOKENS_PER_ITEM = 60
+
+# Which tier produced each result method, recorded in cascade mode
+DECIDED_BY = {
+    "ai_analysis": "llm",
+    "keyword_match_fallback": "keyword",
+    "fallback_approval": "default",
+    "keyword_match": "keyword",
+    "keyword_check": "default",
+}
 
 
 class SentimentCheckStep(BaseStep):
@@ -13,9 +60,26 @@ class SentimentCheckStep(BaseStep):
     @classmethod
     def get_default_params(cls) -> dict[str, Any]:
         return {
-            "risky_keywords": ["gambling", "crypto", "cryptocurrency", "betting", "casino"]
+            "risky_keywords": ["gambling", "crypto", "cryptocurrency", "betting", "casino"],
+            "keyword_word_boundaries": False,
+            "cache_verdicts": True,
+            "coalesce_requests": True,
+            "batching": False,
+            "hedging": False,
+            "streaming": False,
+            "stream_reason": "drop",
+            "cascade": False,
+            "cascade_band": [0.1, 0.9]
         }
 
+    def __init__(self, params: dict[str, Any] | None = None):
+        super().__init__(params)
+        # Compiled once per step instance, i.e. once per compiled pipeline
+        self.keyword_matcher = compile_keywords(
+            tuple(self.params.get("risky_keywords", [])),
+            bool(self.params.get("keyword_word_boundaries", False))
+        )
+
     async def execute(
         self,
         applicant_name: str,
@@ -24,75 +88,59 @@ class SentimentCheckStep(BaseStep):
         declared_debts: Decimal,
         country: str,
         loan_purpose: str,
-        previous_results: dict[str, StepResult]
+        previous_results: dict[str, StepResult],
+        features: FeatureContext | None = None
     ) -> StepResult:
-        settings = get_settings()
-        risky_keywords = self.params.get("risky_keywords", [])
-
-        # Primary: Try OpenAI AI analysis if API key is available
-        if settings.OPENAI_API_KEY:
-            try:
-                client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-
-                response = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a loan risk analyzer. Analyze if the loan purpose indicates risky or speculative activities. Respond with only 'RISKY' or 'SAFE' followed by a brief reason."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Loan purpose: {loan_purpose}"
-                        }
-                    ],
-                    temperature=0,
-                    max_tokens=100
-                )
+        features = features or FeatureContext(
+            applicant_name, amount, monthly_income, declared_debts, country, loan_purpose
+        )
 
-                ai_response = response.choices[0].message.content.strip()
-                is_risky = ai_response.upper().startswith("RISKY")
+        if not self.params.get("cascade", False):
+            return await self._assess(loan_purpose, features)
 
+        # Cascade: the local model decides unless its risk probability falls
+        # in the uncertain band, in which case the usual AI/keyword path runs
+        classifier = get_purpose_classifier()
+        risk_probability = None
+        if classifier is not None:
+            risk_probability = round(classifier.predict_proba(
+                features.get("loan_purpose_normalized"), normalized=True
+            ), 4)
+            low, high = self.params.get("cascade_band", [0.1, 0.9])
+            if not low <= risk_probability <= high:
+                is_risky = risk_probability > high
                 return StepResult(
                     passed=not is_risky,
                     details={
-                        "method": "ai_analysis",
+                        "method": "local_model",
                         "loan_purpose": loan_purpose,
-                        "ai_assessment": ai_response,
-                        "reason": "AI detected risky purpose" if is_risky else "Purpose approved by AI"
+                        "risk_probability": risk_probability,
+                        "decided_by": "local_model",
+                        "reason": "Local model detected risky purpose" if is_risky else "Purpose approved by local model"
                     }
                 )
-            except Exception as e:
-                # If AI fails, fall back to keyword check
-                loan_purpose_lower = loan_purpose.lower()
-                found_keywords = [kw for kw in risky_keywords if kw in loan_purpose_lower]
-
-                if found_keywords:
-                    return StepResult(
-                        passed=False,
-                        details={
-                            "method": "keyword_match_fallback",
-                            "loan_purpose": loan_purpose,
-                            "found_keywords": found_keywords,
-                            "ai_error": str(e),
-                            "reason": "AI failed, keyword check detected risky purpose"
-                        }
-                    )
-                else:
-                    # Both AI and keywords failed, approve by default
-                    return StepResult(
-                        passed=True,
-                        details={
-                            "method": "fallback_approval",
-                            "loan_purpose": loan_purpose,
-                            "ai_error": str(e),
-                            "reason": "AI unavailable and no keywords matched, approved by default"
-                        }
-                    )
+
+        result = await self._assess(loan_purpose, features)
+        result.details["decided_by"] = DECIDED_BY[result.details["method"]]
+        if risk_probability is not None:
+            result.details["local_risk_probability"] = risk_probability
+        return result
+
+    async def _assess(self, loan_purpose: str, features: FeatureContext) -> StepResult:
+        settings = get_settings()
+
+        # Primary: Try OpenAI AI analysis if API key is available
+        if settings.OPENAI_API_KEY:
+            telemetry = CallTelemetry("sentiment", MODEL, features.pipeline_id)
+            telemetry_token = current_telemetry.set(telemetry)
+            try:
+                return await self._assess_with_ai(loan_purpose, features, telemetry)
+            finally:
+                current_telemetry.reset(telemetry_token)
+                llm_call_recorder.record(telemetry.finish())
 
         # Fallback: If no OpenAI key available, use keyword check
-        loan_purpose_lower = loan_purpose.lower()
-        found_keywords = [kw for kw in risky_keywords if kw in loan_purpose_lower]
+        found_keywords = self._find_keywords(features)
 
         if found_keywords:
             return StepResult(
@@ -114,3 +162,310 @@ class SentimentCheckStep(BaseStep):
                 "reason": "No AI available and no risky keywords detected"
             }
         )
+
+    async def _assess_with_ai(
+        self,
+        loan_purpose: str,
+        features: FeatureContext,
+        telemetry: CallTelemetry
+    ) -> StepResult:
+        cache_verdicts = self.params.get("cache_verdicts", True)
+        batching = self.params.get("batching", False)
+        streaming = self.params.get("streaming", False) and not batching
+        hedge = self.params.get("hedging", False)
+        keep_reason = self.params.get("stream_reason", "drop") == "background"
+        if batching:
+            prompt_version = BATCH_PROMPT_VERSION
+        elif streaming:
+            prompt_version = STREAM_PROMPT_VERSION
+        else:
+            prompt_version = PROMPT_VERSION
+        normalized_purpose = features.get("loan_purpose_normalized")
+        cache_key = verdict_cache_key(normalized_purpose, MODEL, prompt_version)
+
+        if cache_verdicts:
+            cached = await verdict_cache.get(cache_key)
+            telemetry.cache = cached[1] if cached is not None else "miss"
+            if cached is not None:
+                verdict, tier = cached
+                return self._ai_result(
+                    loan_purpose, verdict["is_risky"], verdict["assessment"],
+                    cached=True, cache_tier=tier
+                )
+
+        # Bound the call by what is left of the run deadline, minus a
+        # margin so a slow response still leaves room for the keyword
+        # fallback
+        request_options = {}
+        remaining = features.remaining_budget()
+        if remaining is not None:
+            request_options["timeout"] = max(remaining - DEADLINE_MARGIN_SECONDS, 0.0)
+
+        # Collects annotations (e.g. rate limiter wait) from the call
+        call_info: dict[str, Any] = {}
+        call_info_token = current_call_info.set(call_info)
+        try:
+            timeout = request_options.get("timeout")
+            if batching:
+                # Purposes arriving within the batch window share one call
+                ask = lambda: sentiment_batcher.submit(loan_purpose, timeout=timeout)
+            elif streaming:
+                # Decide on the leading verdict word instead of the whole answer
+                ask = lambda: _classify_streaming(
+                    loan_purpose, request_options, hedge=hedge, keep_reason=keep_reason
+                )
+            else:
+                ask = lambda: _classify(loan_purpose, request_options, hedge=hedge)
+
+            if self.params.get("coalesce_requests", True):
+                # Identical purposes already in flight share one call, as
+                # long as they ask for it the same way and expect the same
+                # answer shape
+                flight_key = (cache_key, streaming and keep_reason, hedge)
+                answer, coalesced = await sentiment_single_flight.do(flight_key, ask, timeout=timeout)
+            else:
+                answer, coalesced = await ask(), False
+            ai_response, batched, reason_id = answer, False, None
+            if batching:
+                ai_response, batched = answer
+            elif streaming:
+                ai_response, reason_id = answer
+
+            is_risky = ai_response.upper().startswith("RISKY")
+            telemetry.coalesced, telemetry.batched, telemetry.streamed = coalesced, batched, streaming
+            telemetry.hedged = call_info.get("hedged", False)
+
+            # The caller that made the upstream call stores the verdict
+            if cache_verdicts and not coalesced:
+                await verdict_cache.set(
+                    cache_key,
+                    {"is_risky": is_risky, "assessment": ai_response},
+                    normalized_purpose, MODEL, prompt_version
+                )
+
+            result = self._ai_result(
+                loan_purpose, is_risky, ai_response, cached=False, coalesced=coalesced
+            )
+            if batching:
+                result.details["batched"] = batched
+            if streaming:
+                result.details["streamed"] = True
+                if reason_id:
+                    # The full reason is attached once the run is stored
+                    result.details["reason_pending"] = reason_id
+            result.details.update(call_info)
+            return result
+        except Exception as e:
+            telemetry.outcome, telemetry.fallback_reason = "fallback", fallback_reason(e)
+            telemetry.hedged = call_info.get("hedged", False)
+
+            # If AI fails, fall back to keyword check
+            found_keywords = self._find_keywords(features)
+
+            if found_keywords:
+                return StepResult(
+                    passed=False,
+                    details={
+                        "method": "keyword_match_fallback",
+                        "loan_purpose": loan_purpose,
+                        "found_keywords": found_keywords,
+                        "ai_error": str(e),
+                        "circuit_open": isinstance(e, CircuitOpenError),
+                        "reason": "AI failed, keyword check detected risky purpose",
+                        **call_info
+                    }
+                )
+            else:
+                # Both AI and keywords failed, approve by default
+                return StepResult(
+                    passed=True,
+                    details={
+                        "method": "fallback_approval",
+                        "loan_purpose": loan_purpose,
+                        "ai_error": str(e),
+                        "circuit_open": isinstance(e, CircuitOpenError),
+                        "reason": "AI unavailable and no keywords matched, approved by default",
+                        **call_info
+                    }
+                )
+        finally:
+            current_call_info.reset(call_info_token)
+
+    def _find_keywords(self, features: FeatureContext) -> list[str]:
+        return self.keyword_matcher.find(features.get("loan_purpose_normalized"), normalized=True)
+
+    @staticmethod
+    def _ai_result(
+        loan_purpose: str,
+        is_risky: bool,
+        assessment: str,
+        cached: bool,
+        cache_tier: str | None = None,
+        coalesced: bool = False
+    ) -> StepResult:
+        details = {
+            "method": "ai_analysis",
+            "loan_purpose": loan_purpose,
+            "ai_assessment": assessment,
+            "cached": cached,
+            "coalesced": coalesced,
+            "reason": "AI detected risky purpose" if is_risky else "Purpose approved by AI"
+        }
+        if cache_tier:
+            details["cache_tier"] = cache_tier
+        return StepResult(passed=not is_risky, details=details)
+
+
+async def _create_completion(
+    hedge: bool = False,
+    read: Callable[[Any], Awaitable[Any]] | None = None,
+    **request: Any
+) -> Any:
+    """
+    Send a chat completion through the circuit breaker and shared rate limiter.
+
+    ``read`` consumes the response (e.g. a stream) inside the measured call,
+    so breaker latency and hedging see the time until it returns.
+    """
+    # An open breaker fails fast before queueing for a token or slot
+    sentiment_breaker.check()
+    if not hedge:
+        return await _send_completion(request, read)
+
+    response, hedged = await sentiment_hedger.run(lambda: _send_completion(dict(request), read))
+    if hedged:
+        record_call_info(hedged=True)
+    return response
+
+
+async def _send_completion(
+    request: dict[str, Any],
+    read: Callable[[Any], Awaitable[Any]] | None = None
+) -> Any:
+    timeout = request.get("timeout")
+    async with openai_rate_limiter.acquire(max_wait=timeout) as waited:
+        add_queue_wait(waited)
+        if waited:
+            record_call_info(rate_limit_wait_ms=round(waited * 1000, 1))
+        if timeout is not None:
+            request["timeout"] = max(timeout - waited, 0.0)
+        client = get_openai_client()
+
+        async def call() -> Any:
+            mark_request_sent()
+            response = await client.chat.completions.create(**request)
+            if read:
+                return await read(response)
+            # Without streaming the first token arrives with the whole answer
+            mark_first_token()
+            record_usage(response)
+            return response
+
+        # Latency and errors are measured on the upstream call alone
+        return await sentiment_breaker.call(call)
+
+
+def _messages(loan_purpose: str) -> list[dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Loan purpose: {loan_purpose}"
+        }
+    ]
+
+
+async def _classify(
+    loan_purpose: str,
+    request_options: dict[str, Any] | None = None,
+    hedge: bool = False
+) -> str:
+    """Ask the model for a single verdict"""
+    response = await _create_completion(
+        hedge=hedge,
+        model=MODEL,
+        messages=_messages(loan_purpose),
+        temperature=0,
+        max_tokens=100,
+        **(request_options or {})
+    )
+
+    return response.choices[0].message.content.strip()
+
+
+async def _classify_streaming(
+    loan_purpose: str,
+    request_options: dict[str, Any] | None = None,
+    hedge: bool = False,
+    keep_reason: bool = False
+) -> tuple[str, str | None]:
+    """Ask for a single verdict, returning once the leading verdict word streams in"""
+    text, rest = await _create_completion(
+        hedge=hedge,
+        read=lambda stream: read_leading_verdict(stream, VERDICTS, keep_rest=keep_reason),
+        model=MODEL,
+        messages=_messages(loan_purpose),
+        temperature=0,
+        max_tokens=100,
+        stream=True,
+        **(request_options or {})
+    )
+
+    return text.strip(), pending_reasons.register(rest) if rest is not None else None
+
+
+async def _classify_batch(loan_purposes: list[str]) -> list[str | None]:
+    """Ask the model for one verdict per purpose in a single structured call"""
+    numbered = "\n".join(f"{i}. {purpose}" for i, purpose in enumerate(loan_purposes, start=1))
+
+    response = await _create_completion(
+        model=MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": BATCH_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Loan purposes:\n{numbered}"
+            }
+        ],
+        temperature=0,
+        max_tokens=BATCH_TOKENS_PER_ITEM * len(loan_purposes),
+        response_format={"type": "json_object"}
+    )
+
+    return parse_batch_verdicts(response.choices[0].message.content, len(loan_purposes))
+
+
+def parse_batch_verdicts(content: str | None, count: int) -> list[str | None]:
+    """Map a batch response to per-purpose assessments, None where unusable"""
+    assessments: list[str | None] = [None] * count
+    try:
+        verdicts = json.loads(content or "")["verdicts"]
+    except (ValueError, KeyError, TypeError):
+        return assessments
+    if not isinstance(verdicts, list):
+        return assessments
+
+    for entry in verdicts:
+        if not isinstance(entry, dict):
+            continue
+        item_id, verdict = entry.get("id"), str(entry.get("verdict", "")).strip().upper()
+        if not isinstance(item_id, int) or not 1 <= item_id <= count or verdict not in ("RISKY", "SAFE"):
+            continue
+        reason = str(entry.get("reason") or "").strip()
+        assessments[item_id - 1] = f"{verdict} - {reason}" if reason else verdict
+    return assessments
+
+
+sentiment_batcher = MicroBatcher(
+    send_batch=_classify_batch,
+    send_one=_classify,
+    max_batch_size=get_settings().SENTIMENT_BATCH_MAX_SIZE,
+    max_wait_seconds=get_settings().SENTIMENT_BATCH_MAX_WAIT_MS / 1000,
+    operation="sentiment"
+)
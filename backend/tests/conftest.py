@@ -7,6 +7,10 @@ from app.main import app
 from app.core.database import Base, get_db
 from app.models.application import Application
 from app.models.pipeline import Pipeline
+from app.services.pipeline_cache import pipeline_cache
+from app.llm.verdict_cache import verdict_cache
+from app.llm.circuit_breaker import sentiment_breaker
+from app.llm.telemetry import llm_call_recorder
 
 # Test database URL - use 'db' as host when running in Docker, 'localhost' otherwise
 import os
@@ -14,6 +18,40 @@ DB_HOST = os.getenv("DB_HOST", "db")
 TEST_DATABASE_URL = f"postgresql+asyncpg://loan_user:loan_pass@{DB_HOST}:5432/loan_orchestrator_test"
 
 
+@pytest.fixture(autouse=True)
+def clear_pipeline_cache():
+    """Drop compiled pipelines so ids reused across tests never share a plan"""
+    pipeline_cache.clear()
+    yield
+    pipeline_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_verdict_cache(monkeypatch):
+    """Start each test with an empty verdict cache and no database tier"""
+    monkeypatch.setattr(verdict_cache, "session_maker", None)
+    verdict_cache.clear()
+    yield
+    verdict_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_llm_telemetry(monkeypatch):
+    """Keep LLM call telemetry in metrics only, never buffered for the database"""
+    monkeypatch.setattr(llm_call_recorder, "session_maker", None)
+    llm_call_recorder.clear()
+    yield
+    llm_call_recorder.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker():
+    """Close the sentiment breaker so failures in one test never trip another"""
+    sentiment_breaker.reset()
+    yield
+    sentiment_breaker.reset()
+
+
 @pytest.fixture(scope="session")
 async def test_engine():
     """Create test database engine"""
@@ -1,5 +1,16 @@
+import json
 import pytest
 from decimal import Decimal
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import text
+from app.core.config import Settings
+from app.llm.telemetry import CallTelemetry, LlmCallRecorder
+from app.llm.verdict_cache import VerdictCache, verdict_cache_key
+from app.models.run import Run
+from app.services.classifier_training import train_from_runs
+from app.services.create_run_benchmark import StatementCounter
+from app.steps.purpose_classifier import PurposeClassifier
 
 
 @pytest.mark.api
@@ -40,6 +51,60 @@ class TestApplicationsAPI:
 
         assert response.status_code == 422  # Validation error
 
+    async def test_bulk_create_json_array(self, client):
+        """Test creating applications in bulk from a JSON array"""
+        rows = [
+            {
+                "applicant_name": f"Applicant {i}",
+                "amount": 10000 + i,
+                "monthly_income": 4000,
+                "declared_debts": 500,
+                "country": "ES",
+                "loan_purpose": "home renovation"
+            }
+            for i in range(3)
+        ]
+        rows.insert(1, {"applicant_name": "Broken", "country": "ES"})
+
+        response = await client.post("/api/v1/applications/bulk", json=rows)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["inserted"], data["failed"]) == (4, 3, 1)
+        assert data["ids"][1] is None
+        assert data["errors"][0]["index"] == 1
+
+        created = await client.get(f"/api/v1/applications/{data['ids'][3]}")
+        assert created.json()["applicant_name"] == "Applicant 2"
+
+    async def test_bulk_create_ndjson(self, client):
+        """Test creating applications in bulk from an NDJSON body"""
+        row = {
+            "applicant_name": "Ana",
+            "amount": 12000,
+            "monthly_income": 4000,
+            "declared_debts": 500,
+            "country": "ES",
+            "loan_purpose": "home renovation"
+        }
+        body = "\n".join(json.dumps(row) for _ in range(5)) + "\n"
+
+        response = await client.post(
+            "/api/v1/applications/bulk",
+            content=body,
+            headers={"content-type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 5
+        assert None not in response.json()["ids"]
+
+    async def test_bulk_create_rejects_non_array(self, client):
+        """Test that a JSON body that is not an array is rejected"""
+        response = await client.post("/api/v1/applications/bulk", json={"applicant_name": "Ana"})
+
+        assert response.status_code == 422
+
     async def test_list_applications(self, client, sample_application):
         """Test listing all applications"""
         response = await client.get("/api/v1/applications")
@@ -50,6 +115,52 @@ class TestApplicationsAPI:
         assert len(data) >= 1
         assert any(app["id"] == sample_application.id for app in data)
 
+    async def test_list_applications_pages(self, client):
+        """Test walking the application list with the next-page cursor"""
+        rows = [
+            {
+                "applicant_name": f"Applicant {i}",
+                "amount": 10000,
+                "monthly_income": 4000,
+                "declared_debts": 500,
+                "country": "ES",
+                "loan_purpose": "home renovation"
+            }
+            for i in range(5)
+        ]
+        ids = (await client.post("/api/v1/applications/bulk", json=rows)).json()["ids"]
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = await client.get("/api/v1/applications", params=params)
+            assert len(response.json()) <= 2
+            seen.extend(app["id"] for app in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+            params = {"limit": 2, "after": cursor}
+
+        assert seen == sorted(ids)
+
+    async def test_list_applications_invalid_cursor(self, client):
+        """Test that a cursor that was not issued by the API is rejected"""
+        response = await client.get("/api/v1/applications", params={"after": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    async def test_list_endpoints_reject_skip(self, client, sample_application):
+        """Test that the removed skip offset is refused instead of silently returning page one"""
+        for path in ["/api/v1/applications", "/api/v1/pipelines", "/api/v1/runs"]:
+            response = await client.get(path, params={"skip": 100})
+
+            assert response.status_code == 400
+            assert "X-Next-Cursor" in response.json()["detail"]
+
+        response = await client.get("/api/v1/applications", params={"skip": 0})
+        assert response.status_code == 200
+        assert [application["id"] for application in response.json()] == [sample_application.id]
+
     async def test_get_application_by_id(self, client, sample_application):
         """Test getting specific application"""
         response = await client.get(f"/api/v1/applications/{sample_application.id}")
@@ -179,6 +290,13 @@ class TestPipelinesAPI:
         assert len(data) >= 1
         assert any(p["id"] == sample_pipeline.id for p in data)
 
+    async def test_list_pipelines_last_page(self, client, sample_pipeline):
+        """Test that the last page of pipelines has no next-page cursor"""
+        response = await client.get("/api/v1/pipelines", params={"limit": 1})
+
+        assert [p["id"] for p in response.json()] == [sample_pipeline.id]
+        assert "x-next-cursor" not in response.headers
+
     async def test_get_pipeline_by_id(self, client, sample_pipeline):
         """Test getting specific pipeline"""
         response = await client.get(f"/api/v1/pipelines/{sample_pipeline.id}")
@@ -262,6 +380,25 @@ class TestRunsAPI:
         assert "started_at" in data
         assert "completed_at" in data
 
+    async def test_create_run_statements(self, client, test_engine, sample_application, sample_pipeline):
+        """Test that a run with a cached plan costs one SELECT and one INSERT"""
+        run_data = {
+            "application_id": sample_application.id,
+            "pipeline_id": sample_pipeline.id
+        }
+        # The first run compiles and caches the plan
+        await client.post("/api/v1/runs", json=run_data)
+
+        with StatementCounter(test_engine.sync_engine) as counter:
+            response = await client.post("/api/v1/runs", json=run_data)
+
+        assert response.status_code == 201
+        assert counter.count == 2
+        data = response.json()
+        assert data["id"] > 0
+        assert len(data["step_logs"]) > 0
+        assert data["created_at"] is not None
+
     async def test_create_run_nonexistent_application(self, client, sample_pipeline):
         """Test creating run with nonexistent application"""
         run_data = {
@@ -284,6 +421,25 @@ class TestRunsAPI:
 
         assert response.status_code == 404
 
+    async def test_create_run_invalid_step_params(self, client, sample_application):
+        """Test that a pipeline whose steps fail to compile returns a handled error"""
+        pipeline_data = {
+            "name": "Broken Keywords",
+            "steps": [
+                {"step_type": "sentiment_check", "order": 1, "params": {"risky_keywords": [5]}}
+            ],
+            "terminal_rules": [{"order": 1, "condition": {"type": "default"}, "outcome": "APPROVED"}]
+        }
+        pipeline = (await client.post("/api/v1/pipelines", json=pipeline_data)).json()
+
+        response = await client.post(
+            "/api/v1/runs",
+            json={"application_id": sample_application.id, "pipeline_id": pipeline["id"]}
+        )
+
+        assert response.status_code == 500
+        assert response.json()["detail"].startswith("Pipeline execution failed")
+
     async def test_get_run_by_id(self, client, sample_application, sample_pipeline):
         """Test getting specific run"""
         # First create a run
@@ -421,6 +577,346 @@ class TestRunsAPI:
         data = response.json()
         assert data["status"] == "NEEDS_REVIEW"
 
+    async def test_lazy_pipeline_skips_undecidable_steps(self, client, db_session, sample_pipeline):
+        """Test that a lazy pipeline skips steps once the outcome is fixed"""
+        from app.models.application import Application
+
+        # Luis fails DTI, which already maps to REJECTED
+        application = Application(
+            applicant_name="Luis",
+            amount=Decimal("28000.00"),
+            monthly_income=Decimal("2000.00"),
+            declared_debts=Decimal("1200.00"),
+            country="OTHER",
+            loan_purpose="business expansion"
+        )
+        db_session.add(application)
+        await db_session.commit()
+        await db_session.refresh(application)
+
+        update_response = await client.put(
+            f"/api/v1/pipelines/{sample_pipeline.id}",
+            json={"lazy_evaluation": True}
+        )
+        assert update_response.json()["lazy_evaluation"] is True
+
+        response = await client.post("/api/v1/runs", json={
+            "application_id": application.id,
+            "pipeline_id": sample_pipeline.id
+        })
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["status"] == "REJECTED"
+        assert [log["skipped"] for log in data["step_logs"]] == [False, True, True, True]
+
+    async def test_list_runs_pages(self, client, sample_application, sample_pipeline):
+        """Test that run pages follow each other newest first without gaps"""
+        batch = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id]
+        })
+        for _ in range(4):
+            await client.post("/api/v1/runs", json={
+                "application_id": sample_application.id,
+                "pipeline_id": sample_pipeline.id
+            })
+
+        first = await client.get("/api/v1/runs", params={"pipeline_id": sample_pipeline.id, "limit": 3})
+        second = await client.get("/api/v1/runs", params={
+            "pipeline_id": sample_pipeline.id,
+            "limit": 3,
+            "after": first.headers["x-next-cursor"]
+        })
+
+        runs = first.json() + second.json()
+        assert len(runs) == 5
+        assert len({run["id"] for run in runs}) == 5
+        assert runs[-1]["id"] == batch.json()["run_ids"][0]
+        assert "x-next-cursor" not in second.headers
+
+    async def test_list_runs_filters_and_names(self, client, db_session, sample_application, sample_pipeline):
+        """Test status filters, applicant search and embedded names on the run list"""
+        from app.models.application import Application
+
+        application = Application(
+            applicant_name="Luis",
+            amount=Decimal("28000.00"),
+            monthly_income=Decimal("2000.00"),
+            declared_debts=Decimal("1200.00"),
+            country="OTHER",
+            loan_purpose="business expansion"
+        )
+        db_session.add(application)
+        await db_session.commit()
+        await db_session.refresh(application)
+        await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id, application.id]
+        })
+
+        rejected = await client.get("/api/v1/runs", params={"status": "REJECTED", "include_names": True})
+        searched = await client.get("/api/v1/runs", params={"search": "luI"})
+        by_name = await client.get("/api/v1/runs", params={"sort": "applicant_name", "include_names": True})
+
+        assert [run["applicant_name"] for run in rejected.json()] == ["Luis"]
+        assert rejected.json()[0]["pipeline_name"] == sample_pipeline.name
+        assert [run["application_id"] for run in searched.json()] == [application.id]
+        assert searched.json()[0]["applicant_name"] is None
+        assert [run["applicant_name"] for run in by_name.json()] == ["John Doe", "Luis"]
+
+    async def test_list_runs_cursor_tied_to_sort(self, client, sample_application, sample_pipeline):
+        """Test that a cursor cannot be reused with another sort order"""
+        await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id]
+        })
+        await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id]
+        })
+
+        first = await client.get("/api/v1/runs", params={"limit": 1, "sort": "status"})
+        response = await client.get("/api/v1/runs", params={
+            "limit": 1,
+            "sort": "-status",
+            "after": first.headers["x-next-cursor"]
+        })
+
+        assert response.status_code == 400
+
+    async def test_list_runs_summary_view(self, client, sample_application, sample_pipeline):
+        """Test that the summary view lists runs without their step logs"""
+        batch = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id]
+        })
+        run_id = batch.json()["run_ids"][0]
+
+        summary = await client.get("/api/v1/runs", params={"view": "summary", "include_names": True})
+        full = await client.get(f"/api/v1/runs/{run_id}")
+
+        assert summary.status_code == 200
+        run = summary.json()[0]
+        assert "step_logs" not in run
+        assert (run["id"], run["status"]) == (run_id, full.json()["status"])
+        assert run["applicant_name"] == sample_application.applicant_name
+        assert len(full.json()["step_logs"]) > 0
+
+    async def test_list_runs_unknown_sort(self, client):
+        """Test that unknown sort keys are rejected"""
+        response = await client.get("/api/v1/runs", params={"sort": "step_logs"})
+
+        assert response.status_code == 422
+
+    async def test_batch_runs_by_ids(self, client, db_session, sample_application, sample_pipeline):
+        """Test running a pipeline over a list of applications"""
+        from app.models.application import Application
+
+        application = Application(
+            applicant_name="Luis",
+            amount=Decimal("28000.00"),
+            monthly_income=Decimal("2000.00"),
+            declared_debts=Decimal("1200.00"),
+            country="OTHER",
+            loan_purpose="business expansion"
+        )
+        db_session.add(application)
+        await db_session.commit()
+        await db_session.refresh(application)
+
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [sample_application.id, application.id, 999999]
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["applications"], data["runs_created"], data["failed"]) == (2, 2, 0)
+        assert data["status_counts"]["REJECTED"] == 1
+        assert data["missing_application_ids"] == [999999]
+
+        run = await client.get(f"/api/v1/runs/{data['run_ids'][1]}")
+        assert run.json()["application_id"] == application.id
+        assert run.json()["status"] == "REJECTED"
+
+    async def test_batch_runs_by_filter(self, client, sample_application, sample_pipeline):
+        """Test running a pipeline over the applications matching a filter"""
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "filter": {"country": sample_application.country}
+        })
+
+        assert response.status_code == 200
+        assert response.json()["runs_created"] == 1
+
+    async def test_batch_runs_needs_one_selection(self, client, sample_pipeline):
+        """Test that a batch needs exactly one of application ids or a filter"""
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "application_ids": [1],
+            "filter": {"country": "ES"}
+        })
+
+        assert response.status_code == 422
+
+    async def test_batch_runs_invalid_step_params(self, client, sample_application):
+        """Test that a batch on a pipeline whose steps fail to compile returns a handled error"""
+        pipeline = (await client.post("/api/v1/pipelines", json={
+            "name": "Broken Keywords",
+            "steps": [
+                {"step_type": "sentiment_check", "order": 1, "params": {"risky_keywords": [5]}}
+            ],
+            "terminal_rules": [{"order": 1, "condition": {"type": "default"}, "outcome": "APPROVED"}]
+        })).json()
+
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": pipeline["id"],
+            "application_ids": [sample_application.id]
+        })
+
+        assert response.status_code == 500
+        assert response.json()["detail"].startswith("Pipeline execution failed")
+
+    async def test_batch_runs_empty_filter(self, client, sample_pipeline):
+        """Test that a filter without any criterion is rejected instead of selecting everything"""
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": sample_pipeline.id,
+            "filter": {}
+        })
+
+        assert response.status_code == 422
+
+    async def test_batch_runs_over_limit(self, client, sample_application, sample_pipeline):
+        """Test that a filter selecting more applications than allowed is refused"""
+        with patch("app.api.routes.runs.get_settings") as mock_settings:
+            mock_settings.return_value = Settings(RUNS_BATCH_MAX_APPLICATIONS=0)
+            response = await client.post("/api/v1/runs/batch", json={
+                "pipeline_id": sample_pipeline.id,
+                "filter": {"country": sample_application.country}
+            })
+
+        assert response.status_code == 413
+        assert (await client.get("/api/v1/runs")).json() == []
+
+    async def test_batch_runs_nonexistent_pipeline(self, client):
+        """Test batch runs for a pipeline that does not exist"""
+        response = await client.post("/api/v1/runs/batch", json={
+            "pipeline_id": 99999,
+            "application_ids": [1]
+        })
+
+        assert response.status_code == 404
+
+
+@pytest.mark.api
+class TestVerdictCacheDatabase:
+    """Test the shared Postgres tier of the verdict cache"""
+
+    async def test_verdict_shared_across_workers(self, test_engine):
+        """Test that a verdict written by one worker is read by another"""
+        session_maker = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        writer = VerdictCache(maxsize=10, ttl_seconds=60, session_maker=session_maker)
+        reader = VerdictCache(maxsize=10, ttl_seconds=60, session_maker=session_maker)
+        key = verdict_cache_key("car purchase", "gpt-4o-mini", "1")
+        verdict = {"is_risky": False, "assessment": "SAFE - Vehicle purchase"}
+
+        await writer.set(key, verdict, "car purchase", "gpt-4o-mini", "1")
+        # A duplicate write from a racing worker just rewrites the same row
+        await writer.set(key, verdict, "car purchase", "gpt-4o-mini", "1")
+
+        assert await reader.get(key) == (verdict, "database")
+        assert await reader.get(key) == (verdict, "memory")
+
+    async def test_expired_verdict_is_refreshed(self, test_engine):
+        """Test that re-setting a verdict past its database TTL serves it from the database again"""
+        session_maker = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        writer = VerdictCache(maxsize=10, ttl_seconds=60, session_maker=session_maker, db_ttl_seconds=86400)
+        key = verdict_cache_key("crypto trading", "gpt-4o-mini", "1")
+        stale = {"is_risky": True, "assessment": "RISKY - Speculative"}
+        fresh = {"is_risky": True, "assessment": "RISKY - Speculative trading"}
+
+        await writer.set(key, stale, "crypto trading", "gpt-4o-mini", "1")
+        async with session_maker() as session:
+            await session.execute(
+                text("UPDATE sentiment_verdicts SET created_at = now() - interval '2 days' WHERE cache_key = :key"),
+                {"key": key}
+            )
+            await session.commit()
+
+        assert await VerdictCache(session_maker=session_maker, db_ttl_seconds=86400).get(key) is None
+
+        await writer.set(key, fresh, "crypto trading", "gpt-4o-mini", "1")
+
+        reader = VerdictCache(session_maker=session_maker, db_ttl_seconds=86400)
+        assert await reader.get(key) == (fresh, "database")
+
+
+@pytest.mark.api
+class TestClassifierTraining:
+    """Test training the cascade classifier from stored runs"""
+
+    async def test_train_from_runs(self, db_session, sample_application, sample_pipeline, tmp_path):
+        """Test that AI verdicts in step logs train and save a model"""
+        verdicts = [("casino weekend", False), ("sports betting", False), ("home renovation", True), ("car purchase", True)]
+        for purpose, passed in verdicts * 3:
+            db_session.add(Run(
+                application_id=sample_application.id,
+                pipeline_id=sample_pipeline.id,
+                status="APPROVED" if passed else "REJECTED",
+                step_logs=[{
+                    "step_type": "sentiment_check",
+                    "order": 4,
+                    "passed": passed,
+                    "details": {"method": "ai_analysis", "loan_purpose": purpose}
+                }]
+            ))
+        await db_session.commit()
+        path = str(tmp_path / "purpose.npz")
+
+        classifier = await train_from_runs(db_session, path, epochs=20)
+
+        assert classifier.predict_proba("casino weekend") > 0.5
+        assert classifier.predict_proba("home renovation") < 0.5
+        assert PurposeClassifier.load(path).predict_proba("casino weekend") == classifier.predict_proba("casino weekend")
+
+
+@pytest.mark.api
+class TestLlmTelemetry:
+    """Test storing and querying LLM call telemetry"""
+
+    async def test_percentiles_per_pipeline_and_day(self, client, db_session, test_engine):
+        """Test that stored calls aggregate into daily per-pipeline percentiles"""
+        await db_session.execute(text("TRUNCATE TABLE llm_calls"))
+        await db_session.commit()
+        session_maker = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        recorder = LlmCallRecorder(session_maker=session_maker, flush_size=1000)
+        for latency in range(1, 101):
+            telemetry = CallTelemetry("sentiment", "gpt-4o-mini", pipeline_id=1)
+            telemetry.cache = "miss" if latency % 4 else "memory"
+            telemetry.prompt_tokens, telemetry.completion_tokens = 50, 5
+            telemetry.latency_ms = float(latency)
+            recorder.record(telemetry)
+        other = CallTelemetry("sentiment", "gpt-4o-mini", pipeline_id=2)
+        other.outcome, other.fallback_reason, other.latency_ms = "fallback", "timeout", 900.0
+        recorder.record(other)
+
+        assert await recorder.flush() == 101
+
+        response = await client.get("/api/v1/telemetry/llm-calls")
+
+        assert response.status_code == 200
+        stats = {row["pipeline_id"]: row for row in response.json()}
+        assert stats[1]["calls"] == 100
+        assert stats[1]["cache_hits"] == 25
+        assert stats[1]["prompt_tokens"] == 5000
+        assert stats[1]["latency_ms_p50"] == pytest.approx(50.5)
+        assert stats[1]["latency_ms_p99"] == pytest.approx(99.01)
+        assert stats[2]["fallbacks"] == 1
+
+        filtered = await client.get("/api/v1/telemetry/llm-calls", params={"pipeline_id": 2})
+        assert [row["pipeline_id"] for row in filtered.json()] == [2]
+
 
 @pytest.mark.api
 class TestHealthCheck:
@@ -434,6 +930,7 @@ class TestHealthCheck:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["database"] == "connected"
+        assert data["circuit_breakers"]["sentiment"]["state"] == "closed"
 
     async def test_root_endpoint(self, client):
         """Test root endpoint"""
@@ -443,3 +940,12 @@ class TestHealthCheck:
         data = response.json()
         assert "message" in data
         assert "version" in data
+
+    async def test_metrics_endpoint(self, client):
+        """Test that process metrics are exposed in the Prometheus text format"""
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE llm_coalesced_requests_total counter" in response.text
+        assert 'llm_circuit_state{breaker="sentiment"} 0' in response.text
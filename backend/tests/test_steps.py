@@ -1,11 +1,20 @@
+import asyncio
+import json
 import pytest
+import numpy as np
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch, MagicMock
 from app.steps.dti_rule import DTIRuleStep
 from app.steps.amount_policy import AmountPolicyStep
 from app.steps.risk_scoring import RiskScoringStep
-from app.steps.sentiment_check import SentimentCheckStep
-from app.steps.base import StepResult
+from app.steps.sentiment_check import SentimentCheckStep, parse_batch_verdicts
+from app.steps.base import StepResult, BatchStepResult
+from app.steps.features import FeatureContext, normalize_text
+from app.llm.circuit_breaker import sentiment_breaker
+from app.steps.keyword_matcher import KeywordMatcher, compile_keywords
+from app.steps.purpose_classifier import PurposeClassifier, load_purpose_classifier
+from app.llm.streaming import pending_reasons
 
 
 @pytest.mark.unit
@@ -318,6 +327,27 @@ class TestRiskScoringStep:
         assert result.passed is True
 
 
+class FakeStream:
+    """Async chat completion stream yielding the given content pieces"""
+
+    def __init__(self, pieces):
+        self.pieces = list(pieces)
+        self.read = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or self.read == len(self.pieces):
+            raise StopAsyncIteration
+        self.read += 1
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.pieces[self.read - 1]))])
+
+    async def close(self):
+        self.closed = True
+
+
 @pytest.mark.unit
 class TestSentimentCheckStep:
     """Test Sentiment Check Step"""
@@ -379,7 +409,7 @@ class TestSentimentCheckStep:
         mock_response.choices[0].message.content = "RISKY - This is for gambling purposes"
 
         with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
-             patch('app.steps.sentiment_check.AsyncOpenAI') as mock_openai:
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
 
             mock_settings.return_value.OPENAI_API_KEY = "test-key"
             mock_client = AsyncMock()
@@ -411,7 +441,7 @@ class TestSentimentCheckStep:
         mock_response.choices[0].message.content = "SAFE - Home renovation is a legitimate purpose"
 
         with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
-             patch('app.steps.sentiment_check.AsyncOpenAI') as mock_openai:
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
 
             mock_settings.return_value.OPENAI_API_KEY = "test-key"
             mock_client = AsyncMock()
@@ -439,7 +469,7 @@ class TestSentimentCheckStep:
         })
 
         with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
-             patch('app.steps.sentiment_check.AsyncOpenAI') as mock_openai:
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
 
             mock_settings.return_value.OPENAI_API_KEY = "test-key"
             mock_client = AsyncMock()
@@ -463,6 +493,145 @@ class TestSentimentCheckStep:
             assert "gambling" in result.details["found_keywords"]
             assert "ai_error" in result.details
 
+    async def test_ai_call_bounded_by_run_deadline(self):
+        """Test that the OpenAI call timeout is sized to the remaining run budget"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"]})
+        features = FeatureContext(
+            applicant_name="John Doe",
+            amount=Decimal("15000"),
+            monthly_income=Decimal("5000"),
+            declared_debts=Decimal("200"),
+            country="ES",
+            loan_purpose="home renovation",
+            deadline=asyncio.get_running_loop().time() + 2
+        )
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "SAFE - Legitimate purpose"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="home renovation",
+                previous_results={},
+                features=features
+            )
+
+            assert result.passed is True
+            timeout = mock_client.chat.completions.create.call_args.kwargs["timeout"]
+            assert 1.5 < timeout < 2
+
+    async def test_ai_verdict_served_from_cache(self):
+        """Test that purposes normalizing to the same text reuse one AI verdict"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"]})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "SAFE - Legitimate purpose"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+
+            results = []
+            for purpose in ["Home renovation", "  home   RENOVATION "]:
+                results.append(await step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose=purpose,
+                    previous_results={}
+                ))
+
+            assert mock_client.chat.completions.create.await_count == 1
+            assert results[0].details["cached"] is False
+            assert results[1].passed is True
+            assert results[1].details["cached"] is True
+            assert results[1].details["cache_tier"] == "memory"
+            assert results[1].details["loan_purpose"] == "  home   RENOVATION "
+
+    async def test_ai_verdict_cache_disabled(self):
+        """Test that cache_verdicts=False always calls the AI"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"], "cache_verdicts": False})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "SAFE - Legitimate purpose"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+
+            for _ in range(2):
+                result = await step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose="home renovation",
+                    previous_results={}
+                )
+
+            assert mock_client.chat.completions.create.await_count == 2
+            assert result.details["cached"] is False
+
+    async def test_ai_failure_not_cached(self):
+        """Test that fallback results are never stored as verdicts"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"]})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "SAFE - Legitimate purpose"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[Exception("API Error"), mock_response]
+            )
+            mock_openai.return_value = mock_client
+
+            methods = []
+            for _ in range(2):
+                result = await step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose="home renovation",
+                    previous_results={}
+                )
+                methods.append(result.details["method"])
+
+            assert methods == ["fallback_approval", "ai_analysis"]
+            assert result.details["cached"] is False
+
     async def test_case_insensitive_keyword_match(self):
         """Test that keyword matching is case insensitive"""
         step = SentimentCheckStep(params={
@@ -484,3 +653,753 @@ class TestSentimentCheckStep:
 
             assert result.passed is False
             assert "gambling" in result.details["found_keywords"]
+
+
+    async def test_concurrent_identical_purposes_coalesced(self):
+        """Test that concurrent runs with the same purpose share one AI call"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"], "cache_verdicts": False})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "RISKY - Speculative"
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.02)
+            return mock_response
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+            mock_openai.return_value = mock_client
+
+            results = await asyncio.gather(*[
+                step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose=purpose,
+                    previous_results={}
+                )
+                for purpose in ["Crypto trading", "crypto  trading", "CRYPTO trading"]
+            ])
+
+            assert mock_client.chat.completions.create.await_count == 1
+            assert all(result.passed is False for result in results)
+            assert [result.details["coalesced"] for result in results] == [False, True, True]
+
+    async def test_batched_purposes_share_one_call(self):
+        """Test that concurrent purposes are classified in one structured call"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"], "batching": True})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = json.dumps({"verdicts": [
+            {"id": 1, "verdict": "SAFE", "reason": "Home improvement"},
+            {"id": 2, "verdict": "RISKY", "reason": "Speculative"},
+        ]})
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+
+            results = await asyncio.gather(*[
+                step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose=purpose,
+                    previous_results={}
+                )
+                for purpose in ["home renovation", "crypto trading"]
+            ])
+
+            assert mock_client.chat.completions.create.await_count == 1
+            call = mock_client.chat.completions.create.call_args.kwargs
+            assert call["response_format"] == {"type": "json_object"}
+            assert "1. home renovation\n2. crypto trading" in call["messages"][1]["content"]
+            assert [result.passed for result in results] == [True, False]
+            assert results[1].details["ai_assessment"] == "RISKY - Speculative"
+            assert all(result.details["batched"] for result in results)
+
+    def test_parse_batch_verdicts(self):
+        """Test that unusable batch entries map to None for per-item retries"""
+        content = json.dumps({"verdicts": [
+            {"id": 1, "verdict": "safe", "reason": "Fine"},
+            {"id": 3, "verdict": "MAYBE"},
+            {"id": 9, "verdict": "RISKY"},
+            "garbage",
+            {"id": 4, "verdict": "RISKY"},
+        ]})
+
+        assert parse_batch_verdicts(content, 4) == ["SAFE - Fine", None, None, "RISKY"]
+        assert parse_batch_verdicts("not json", 2) == [None, None]
+        assert parse_batch_verdicts('{"verdicts": {}}', 1) == [None]
+
+    async def test_open_circuit_skips_ai(self):
+        """Test that an open breaker sends runs straight to the keyword path"""
+        step = SentimentCheckStep(params={"risky_keywords": ["casino"]})
+        failing_call = AsyncMock(side_effect=RuntimeError("upstream error"))
+        for _ in range(sentiment_breaker.min_calls):
+            with pytest.raises(RuntimeError):
+                await sentiment_breaker.call(failing_call)
+        assert sentiment_breaker.state == "open"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_openai.return_value = mock_client
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="casino trip",
+                previous_results={}
+            )
+
+            mock_client.chat.completions.create.assert_not_called()
+            assert result.passed is False
+            assert result.details["method"] == "keyword_match_fallback"
+            assert result.details["circuit_open"] is True
+
+    @pytest.mark.parametrize("risk_probability, passed", [(0.02, True), (0.97, False)])
+    async def test_cascade_confident_local_verdict(self, risk_probability, passed):
+        """Test that a confident local model decides without calling the AI"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"], "cascade": True})
+        classifier = MagicMock()
+        classifier.predict_proba.return_value = risk_probability
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai, \
+             patch('app.steps.sentiment_check.get_purpose_classifier', return_value=classifier):
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="Home  Renovation",
+                previous_results={}
+            )
+
+            mock_openai.assert_not_called()
+            classifier.predict_proba.assert_called_once_with("home renovation", normalized=True)
+            assert result.passed is passed
+            assert result.details["method"] == "local_model"
+            assert result.details["decided_by"] == "local_model"
+            assert result.details["risk_probability"] == risk_probability
+
+    async def test_cascade_uncertain_band_calls_ai(self):
+        """Test that purposes in the uncertain band are sent to the AI"""
+        step = SentimentCheckStep(params={
+            "risky_keywords": ["gambling"],
+            "cascade": True,
+            "cascade_band": [0.3, 0.7]
+        })
+        classifier = MagicMock()
+        classifier.predict_proba.return_value = 0.5
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "RISKY - Speculative investment"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai, \
+             patch('app.steps.sentiment_check.get_purpose_classifier', return_value=classifier):
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_openai.return_value = mock_client
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="startup investment",
+                previous_results={}
+            )
+
+            assert result.passed is False
+            assert result.details["method"] == "ai_analysis"
+            assert result.details["decided_by"] == "llm"
+            assert result.details["local_risk_probability"] == 0.5
+
+    async def test_cascade_without_model_uses_usual_path(self):
+        """Test that cascade mode without a loaded model falls through"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"], "cascade": True})
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_purpose_classifier', return_value=None):
+            mock_settings.return_value.OPENAI_API_KEY = None
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="gambling debts",
+                previous_results={}
+            )
+
+            assert result.details["method"] == "keyword_match"
+            assert result.details["decided_by"] == "keyword"
+            assert "local_risk_probability" not in result.details
+
+    async def test_ai_call_telemetry_recorded(self):
+        """Test that every AI lookup records cache, tokens, timings and fallback reason"""
+        step = SentimentCheckStep(params={"risky_keywords": ["casino"]})
+        features = FeatureContext(
+            "John Doe", Decimal("15000"), Decimal("5000"), Decimal("200"), "ES", "casino trip", pipeline_id=7
+        )
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "RISKY - Gambling activity"
+        mock_response.usage = SimpleNamespace(prompt_tokens=52, completion_tokens=6)
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai, \
+             patch('app.steps.sentiment_check.llm_call_recorder') as recorder:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[mock_response, asyncio.TimeoutError()]
+            )
+            mock_openai.return_value = mock_client
+
+            inputs = dict(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                previous_results={}
+            )
+            await step.execute(loan_purpose="casino trip", features=features, **inputs)
+            await step.execute(loan_purpose="casino trip", **inputs)
+            await step.execute(loan_purpose="casino night", **inputs)
+
+        called, cached, failed = [call.args[0] for call in recorder.record.call_args_list]
+        assert (called.pipeline_id, called.cache, called.outcome) == (7, "miss", "ok")
+        assert (called.prompt_tokens, called.completion_tokens) == (52, 6)
+        assert called.first_token_ms is not None and called.latency_ms >= called.first_token_ms
+        assert cached.cache == "memory" and cached.prompt_tokens is None
+        assert (failed.outcome, failed.fallback_reason) == ("fallback", "timeout")
+
+    async def test_streaming_decides_on_leading_verdict(self):
+        """Test that streaming mode decides on the first token and closes the stream"""
+        step = SentimentCheckStep(params={"risky_keywords": [], "streaming": True})
+        stream = FakeStream(["RIS", "KY", " -", " Gambling", " activity"])
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=stream)
+            mock_openai.return_value = mock_client
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="casino trip",
+                previous_results={}
+            )
+
+            assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+            assert result.passed is False
+            assert result.details["method"] == "ai_analysis"
+            assert result.details["ai_assessment"] == "RISKY"
+            assert result.details["streamed"] is True
+            assert "reason_pending" not in result.details
+            assert stream.read == 2
+            assert stream.closed is True
+
+    async def test_streaming_keeps_reason_in_background(self):
+        """Test that the background reason mode leaves a collectable reason id"""
+        step = SentimentCheckStep(params={
+            "risky_keywords": [], "streaming": True, "stream_reason": "background"
+        })
+        stream = FakeStream(["SAFE", " -", " Home", " renovation"])
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=stream)
+            mock_openai.return_value = mock_client
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="home renovation",
+                previous_results={}
+            )
+
+        assert result.passed is True
+        assert result.details["ai_assessment"] == "SAFE"
+        reason_id = result.details["reason_pending"]
+        assert await pending_reasons.collect(reason_id, timeout=1) == "SAFE - Home renovation"
+        assert stream.closed is True
+
+    async def test_streaming_and_plain_runs_not_coalesced(self):
+        """Test that concurrent streaming and non-streaming runs on one purpose each get their own call"""
+        plain = SentimentCheckStep(params={"risky_keywords": []})
+        streaming = SentimentCheckStep(params={"risky_keywords": [], "streaming": True})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "RISKY - Speculative"
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.02)
+            if kwargs.get("stream"):
+                return FakeStream(["RISKY", " -", " Speculative"])
+            return mock_response
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+            mock_openai.return_value = mock_client
+
+            results = await asyncio.gather(*[
+                step.execute(
+                    applicant_name="John Doe",
+                    amount=Decimal("15000"),
+                    monthly_income=Decimal("5000"),
+                    declared_debts=Decimal("200"),
+                    country="ES",
+                    loan_purpose="Crypto trading",
+                    previous_results={}
+                )
+                for step in [plain, streaming, plain, streaming]
+            ])
+
+        assert mock_client.chat.completions.create.await_count == 2
+        assert all(result.details["method"] == "ai_analysis" for result in results)
+        assert all(result.passed is False for result in results)
+        assert [result.details["ai_assessment"] for result in results] == [
+            "RISKY - Speculative", "RISKY", "RISKY - Speculative", "RISKY"
+        ]
+        assert [result.details["coalesced"] for result in results] == [False, False, True, True]
+
+    async def test_streamed_verdict_not_served_to_plain_runs(self):
+        """Test that a verdict cut short by streaming is cached apart from full answers"""
+        plain = SentimentCheckStep(params={"risky_keywords": []})
+        streaming = SentimentCheckStep(params={"risky_keywords": [], "streaming": True})
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "SAFE - Home improvement"
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings, \
+             patch('app.steps.sentiment_check.get_openai_client') as mock_openai:
+
+            mock_settings.return_value.OPENAI_API_KEY = "test-key"
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[FakeStream(["SAFE", " -", " Home"]), mock_response]
+            )
+            mock_openai.return_value = mock_client
+
+            inputs = dict(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="home renovation",
+                previous_results={}
+            )
+            streamed = await streaming.execute(**inputs)
+            full = await plain.execute(**inputs)
+            streamed_again = await streaming.execute(**inputs)
+
+        assert streamed.details["ai_assessment"] == "SAFE"
+        assert full.details["cached"] is False
+        assert full.details["ai_assessment"] == "SAFE - Home improvement"
+        assert streamed_again.details["cached"] is True
+        assert streamed_again.details["ai_assessment"] == "SAFE"
+        assert mock_client.chat.completions.create.await_count == 2
+
+    async def test_keyword_word_boundaries(self):
+        """Test that word boundary matching ignores keywords inside longer words"""
+        step = SentimentCheckStep(params={
+            "risky_keywords": ["bet", "crypto"],
+            "keyword_word_boundaries": True
+        })
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings:
+            mock_settings.return_value.OPENAI_API_KEY = None
+
+            result = await step.execute(
+                applicant_name="John Doe",
+                amount=Decimal("15000"),
+                monthly_income=Decimal("5000"),
+                declared_debts=Decimal("200"),
+                country="ES",
+                loan_purpose="Better alphabet books, then Crypto-mining",
+                previous_results={}
+            )
+
+            assert result.passed is False
+            assert result.details["found_keywords"] == ["crypto"]
+
+
+@pytest.mark.unit
+class TestKeywordMatcher:
+    """Test the compiled multi-keyword matcher"""
+
+    def test_substring_matches_in_keyword_order(self):
+        """Test that every keyword found is reported once, in list order"""
+        matcher = KeywordMatcher(["casino", "crypto", "betting", "bet"])
+
+        assert matcher.find("crypto betting at the casino, crypto again") == [
+            "casino", "crypto", "betting", "bet"
+        ]
+        assert matcher.find("home renovation") == []
+
+    def test_overlapping_keywords(self):
+        """Test that keywords sharing suffixes and prefixes are all found"""
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+
+        assert matcher.find("ushers") == ["he", "she", "hers"]
+
+    def test_case_and_diacritic_insensitive(self):
+        """Test that keywords and text are compared after normalization"""
+        matcher = KeywordMatcher(["Casino", "apuestas en línea", "crème"])
+
+        assert matcher.find("CASINÒ and Apuestas   en LINEA, creme brulee") == [
+            "Casino", "apuestas en línea", "crème"
+        ]
+
+    def test_word_boundaries(self):
+        """Test that boundary mode requires non-word characters around a match"""
+        matcher = KeywordMatcher(["bet", "bet on", "casino"], word_boundaries=True)
+
+        assert matcher.find("better casinos") == []
+        assert matcher.find("I bet on_the casino") == ["bet", "casino"]
+        assert matcher.find("bet on black") == ["bet", "bet on"]
+
+    def test_large_keyword_list(self):
+        """Test matching against tens of thousands of keywords"""
+        keywords = [f"term{i:05d}" for i in range(50000)] + ["gambling"]
+        matcher = KeywordMatcher(keywords, word_boundaries=True)
+
+        assert matcher.find("gambling on term04242 and term4") == ["term04242", "gambling"]
+
+    def test_compiled_once_per_keyword_set(self):
+        """Test that steps with the same keywords share one compiled matcher"""
+        first = SentimentCheckStep(params={"risky_keywords": ["casino", "crypto"]})
+        second = SentimentCheckStep(params={"risky_keywords": ["casino", "crypto"]})
+        bounded = SentimentCheckStep(params={
+            "risky_keywords": ["casino", "crypto"],
+            "keyword_word_boundaries": True
+        })
+
+        assert first.keyword_matcher is second.keyword_matcher
+        assert first.keyword_matcher is not bounded.keyword_matcher
+        assert compile_keywords(("casino", "crypto"), False) is first.keyword_matcher
+
+
+PURPOSES = [
+    ("home renovation", False), ("kitchen renovation", False), ("car purchase", False),
+    ("new car for work", False), ("university tuition", False), ("wedding expenses", False),
+    ("medical bills", False), ("home repairs", False), ("casino weekend", True),
+    ("sports betting", True), ("crypto trading", True), ("buy bitcoin and crypto", True),
+    ("poker tournament buy-in", True), ("online betting account", True),
+]
+
+
+@pytest.mark.unit
+class TestPurposeClassifier:
+    """Test the local hashed n-gram purpose classifier"""
+
+    def test_learns_to_separate_purposes(self):
+        """Test that training separates risky from safe purposes"""
+        texts, labels = zip(*PURPOSES)
+        classifier = PurposeClassifier(n_features=2 ** 12).fit(texts, labels, epochs=30)
+
+        assert classifier.predict_proba("betting on horses") > 0.5
+        assert classifier.predict_proba("Renovación de la casa, home renovation") < 0.5
+        assert classifier.predict_proba("CRYPTO  Trading") == classifier.predict_proba("crypto trading")
+
+    def test_untrained_model_is_uncertain(self):
+        """Test that a model without training answers 0.5"""
+        assert PurposeClassifier(n_features=16).predict_proba("anything") == 0.5
+        assert PurposeClassifier(n_features=16).predict_proba("") == 0.5
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved model loads with identical predictions"""
+        texts, labels = zip(*PURPOSES)
+        classifier = PurposeClassifier(n_features=2 ** 10, char_ngrams=(2, 4)).fit(texts, labels)
+        path = str(tmp_path / "purpose.npz")
+        classifier.save(path)
+
+        loaded = PurposeClassifier.load(path)
+
+        assert loaded.char_ngrams == (2, 4)
+        assert loaded.n_features == 2 ** 10
+        for text, _ in PURPOSES:
+            assert loaded.predict_proba(text) == classifier.predict_proba(text)
+
+    def test_load_failure_disables_cascade(self, tmp_path):
+        """Test that a missing model file leaves no classifier loaded"""
+        assert load_purpose_classifier(str(tmp_path / "missing.npz")) is None
+
+
+def make_features(**overrides) -> FeatureContext:
+    """Build a feature context with default application inputs"""
+    inputs = {
+        "applicant_name": "John Doe",
+        "amount": Decimal("15000"),
+        "monthly_income": Decimal("4000"),
+        "declared_debts": Decimal("1000"),
+        "country": "ES",
+        "loan_purpose": "Home Renovation",
+    }
+    inputs.update(overrides)
+    return FeatureContext(**inputs)
+
+
+@pytest.mark.unit
+class TestFeatureContext:
+    """Test per-run derived feature context"""
+
+    def test_dti_feature(self):
+        """Test DTI derived feature, including zero income"""
+        assert make_features().get("dti") == 0.25
+        assert make_features(monthly_income=Decimal("0")).get("dti") == 1.0
+
+    def test_features_are_memoized(self, monkeypatch):
+        """Test that a feature is computed once per context"""
+        calls = []
+
+        def counting_feature(ctx):
+            calls.append(1)
+            return len(ctx.loan_purpose)
+
+        monkeypatch.setitem(FeatureContext._features, "purpose_length", counting_feature)
+        features = make_features()
+
+        assert features.get("purpose_length") == 15
+        assert features.get("purpose_length") == 15
+        assert len(calls) == 1
+        # A fresh context recomputes
+        make_features().get("purpose_length")
+        assert len(calls) == 2
+
+    def test_parameterized_feature(self):
+        """Test that parameterized features are memoized per argument set"""
+        features = make_features()
+
+        assert features.get("amount_to_cap", cap=30000) == 0.5
+        assert features.get("amount_to_cap", cap=15000) == 1.0
+
+    def test_register_feature(self, monkeypatch):
+        """Test registering a new derived feature declaratively"""
+        monkeypatch.setattr(FeatureContext, "_features", dict(FeatureContext._features))
+
+        @FeatureContext.register("income_after_debts")
+        def income_after_debts(ctx):
+            return ctx.get("monthly_income_float") - ctx.get("declared_debts_float")
+
+        assert "income_after_debts" in FeatureContext.list_features()
+        assert make_features().get("income_after_debts") == 3000.0
+
+    def test_unknown_feature(self):
+        """Test requesting a feature that is not registered"""
+        with pytest.raises(ValueError, match="Unknown feature"):
+            make_features().get("nonexistent_feature")
+
+    def test_text_features(self):
+        """Test normalized country and loan purpose features"""
+        features = make_features(country=" es ", loan_purpose="  Café   RENOVATION ")
+
+        assert features.get("country_code") == "ES"
+        assert features.get("loan_purpose_lower") == "  café   renovation "
+        assert features.get("loan_purpose_normalized") == "cafe renovation"
+        assert normalize_text("Ｃｒｙｐｔｏ") == "crypto"
+
+    async def test_steps_share_context(self):
+        """Test that steps read derived values from a shared context"""
+        features = make_features()
+        inputs = {
+            "applicant_name": features.applicant_name,
+            "amount": features.amount,
+            "monthly_income": features.monthly_income,
+            "declared_debts": features.declared_debts,
+            "country": features.country,
+            "loan_purpose": features.loan_purpose,
+        }
+
+        await DTIRuleStep(params={"max_dti": 0.4}).execute(
+            **inputs, previous_results={}, features=features
+        )
+        result = await RiskScoringStep(params={"approve_threshold": 45}).execute(
+            **inputs, previous_results={}, features=features
+        )
+
+        assert ("dti", ()) in features._values
+        assert result.details["dti"] == 0.25
+
+    async def test_lowercase_country_uses_country_cap(self):
+        """Test that amount policy normalizes the country code"""
+        step = AmountPolicyStep(params={"ES": 30000, "OTHER": 20000})
+
+        result = await step.execute(
+            applicant_name="John Doe",
+            amount=Decimal("25000"),
+            monthly_income=Decimal("3000"),
+            declared_debts=Decimal("600"),
+            country="es",
+            loan_purpose="home renovation",
+            previous_results={}
+        )
+
+        assert result.passed is True
+        assert result.details["cap"] == 30000
+        assert result.details["country"] == "ES"
+
+BATCH_ROWS = [
+    # (amount, monthly_income, declared_debts, country)
+    ("12000", "4000", "500", "ES"),
+    ("28000", "2000", "1200", "OTHER"),
+    ("20000", "3000", "900", "FR"),
+    ("35000", "5000", "2000", "DE"),
+    ("15000", "1000", "400", "IT"),
+    ("5000", "0", "100", "ES"),
+]
+
+
+def batch_columns(rows=BATCH_ROWS):
+    """Build columnar NumPy inputs from (amount, income, debts, country) rows"""
+    return {
+        "applicant_name": np.array([f"Applicant {i}" for i in range(len(rows))], dtype=object),
+        "amount": np.array([float(r[0]) for r in rows]),
+        "monthly_income": np.array([float(r[1]) for r in rows]),
+        "declared_debts": np.array([float(r[2]) for r in rows]),
+        "country": np.array([r[3] for r in rows], dtype=object),
+        "loan_purpose": np.array(["home renovation"] * len(rows), dtype=object),
+    }
+
+
+async def scalar_results(step, rows=BATCH_ROWS, previous_results=None):
+    """Run a step row by row for comparison with its batch implementation"""
+    results = []
+    for i, (amount, income, debts, country) in enumerate(rows):
+        results.append(await step.execute(
+            applicant_name=f"Applicant {i}",
+            amount=Decimal(amount),
+            monthly_income=Decimal(income),
+            declared_debts=Decimal(debts),
+            country=country,
+            loan_purpose="home renovation",
+            previous_results=previous_results[i] if previous_results else {}
+        ))
+    return results
+
+
+def assert_batch_matches(batch: BatchStepResult, results: list[StepResult]):
+    """Assert that every batch row equals the corresponding scalar result"""
+    assert len(batch) == len(results)
+    for i, result in enumerate(results):
+        row = batch.row(i)
+        assert row.passed == result.passed
+        assert row.details == pytest.approx(result.details)
+
+
+@pytest.mark.unit
+class TestBatchExecution:
+    """Test vectorized execute_batch against per-row execute"""
+
+    async def test_dti_rule_batch_matches_scalar(self):
+        """Test vectorized DTI rule, including zero income"""
+        step = DTIRuleStep(params={"max_dti": 0.4})
+
+        batch = await step.execute_batch(**batch_columns(), previous_results={})
+
+        assert batch.passed.dtype == bool
+        assert_batch_matches(batch, await scalar_results(step))
+
+    async def test_amount_policy_batch_matches_scalar(self):
+        """Test vectorized country cap lookup, including unlisted countries"""
+        step = AmountPolicyStep(params={"DE": 35000, "ES": 30000, "FR": 25000, "OTHER": 20000})
+
+        batch = await step.execute_batch(**batch_columns(), previous_results={})
+
+        assert_batch_matches(batch, await scalar_results(step))
+
+    async def test_risk_scoring_batch_uses_amount_policy_caps(self):
+        """Test vectorized risk scoring with caps from a batch amount policy result"""
+        amount_step = AmountPolicyStep(params={"ES": 10000, "OTHER": 50000})
+        risk_step = RiskScoringStep(params={"approve_threshold": 45})
+        columns = batch_columns()
+
+        amount_batch = await amount_step.execute_batch(**columns, previous_results={})
+        batch = await risk_step.execute_batch(
+            **columns,
+            previous_results={"amount_policy": amount_batch}
+        )
+
+        amount_results = await scalar_results(amount_step)
+        expected = await scalar_results(
+            risk_step,
+            previous_results=[{"amount_policy": r} for r in amount_results]
+        )
+        assert_batch_matches(batch, expected)
+
+    async def test_risk_scoring_batch_fallback_caps(self):
+        """Test vectorized risk scoring without an amount policy result"""
+        step = RiskScoringStep(params={"approve_threshold": 45})
+
+        batch = await step.execute_batch(**batch_columns(), previous_results={})
+
+        assert_batch_matches(batch, await scalar_results(step))
+
+    async def test_default_batch_falls_back_to_execute(self):
+        """Test that steps without a vectorized version run row by row"""
+        step = SentimentCheckStep(params={"risky_keywords": ["gambling"]})
+        columns = batch_columns(BATCH_ROWS[:2])
+        columns["loan_purpose"] = np.array(["gambling debts", "home renovation"], dtype=object)
+
+        with patch('app.steps.sentiment_check.get_settings') as mock_settings:
+            mock_settings.return_value.OPENAI_API_KEY = None
+            batch = await step.execute_batch(**columns, previous_results={})
+
+        assert batch.passed.tolist() == [False, True]
+        assert batch.details["found_keywords"][0] == ["gambling"]
+        assert batch.details["found_keywords"][1] is None
@@ -15,43 +15,46 @@ describe('runsApi', () => {
     vi.clearAllMocks();
   });
 
-  describe('getAll', () => {
-    it('should fetch all runs', async () => {
+  describe('list', () => {
+    it('should fetch one page of runs with the next cursor', async () => {
       const mockRuns = [
-        {
-          id: 1,
-          application_id: 1,
-          pipeline_id: 1,
-          status: 'APPROVED',
-          step_logs: [],
-          started_at: '2025-10-25T10:00:00Z',
-          completed_at: '2025-10-25T10:00:05Z',
-        },
         {
           id: 2,
           application_id: 2,
           pipeline_id: 1,
           status: 'REJECTED',
-          step_logs: [],
           started_at: '2025-10-25T11:00:00Z',
           completed_at: '2025-10-25T11:00:05Z',
+          applicant_name: 'Jane Smith',
+          pipeline_name: 'Standard Pipeline',
         },
       ];
 
-      vi.mocked(apiClient.get).mockResolvedValue({ data: mockRuns });
-
-      const result = await runsApi.getAll();
+      vi.mocked(apiClient.get).mockResolvedValue({
+        data: mockRuns,
+        headers: { 'x-next-cursor': 'abc' },
+      });
+
+      const params = {
+        status: 'REJECTED' as const,
+        search: 'jane',
+        include_names: true,
+        view: 'summary' as const,
+        limit: 50,
+      };
+      const result = await runsApi.list(params);
 
-      expect(apiClient.get).toHaveBeenCalledWith('/api/v1/runs');
-      expect(result).toEqual(mockRuns);
+      expect(apiClient.get).toHaveBeenCalledWith('/api/v1/runs', { params });
+      expect(result).toEqual({ items: mockRuns, nextCursor: 'abc' });
     });
 
-    it('should handle empty runs array', async () => {
-      vi.mocked(apiClient.get).mockResolvedValue({ data: [] });
+    it('should report no next cursor on the last page', async () => {
+      vi.mocked(apiClient.get).mockResolvedValue({ data: [], headers: {} });
 
-      const result = await runsApi.getAll();
+      const result = await runsApi.list();
 
-      expect(result).toEqual([]);
+      expect(apiClient.get).toHaveBeenCalledWith('/api/v1/runs', { params: {} });
+      expect(result).toEqual({ items: [], nextCursor: null });
     });
   });
 
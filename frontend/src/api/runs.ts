@@ -1,11 +1,14 @@
 import apiClient from './client';
-import { Run, CreateRunRequest } from '@/types';
+import { Run, CreateRunRequest, RunListParams, RunPage, RunSummary } from '@/types';
 
 export const runsApi = {
-  // Get all runs
-  getAll: async (): Promise<Run[]> => {
-    const response = await apiClient.get<Run[]>('/api/v1/runs');
-    return response.data;
+  // Get one page of runs; the cursor of the next page comes in a header
+  list: async (params: RunListParams = {}): Promise<RunPage> => {
+    const response = await apiClient.get<RunSummary[]>('/api/v1/runs', { params });
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] ?? null,
+    };
   },
 
   // Get run by ID
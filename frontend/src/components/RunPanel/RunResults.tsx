@@ -92,7 +92,13 @@ const RunResults: React.FC<RunResultsProps> = ({ run }) => {
                 <Typography variant="body1" sx={{ flexGrow: 1 }}>
                   {log.step_type}
                 </Typography>
-                {log.passed ? (
+                {log.skipped ? (
+                  <Chip
+                    label="Skipped"
+                    color="default"
+                    size="small"
+                  />
+                ) : log.passed ? (
                   <Chip
                     icon={<CheckCircleIcon />}
                     label="Passed"
@@ -2,14 +2,15 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { renderHook, waitFor } from '@testing-library/react';
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
-import { useRuns, useRun, useCreateRun } from './useRuns';
+import { useRuns, useRun, useCreateRun, RUNS_PAGE_SIZE } from './useRuns';
 import { runsApi } from '@/api';
+import type { RunListFilters } from '@/types';
 import type { ReactNode } from 'react';
 
 // Mock the API
 vi.mock('@/api', () => ({
   runsApi: {
-    getAll: vi.fn(),
+    list: vi.fn(),
     getById: vi.fn(),
     create: vi.fn(),
   },
@@ -33,34 +34,94 @@ describe('useRuns', () => {
     vi.clearAllMocks();
   });
 
-  it('should fetch all runs', async () => {
-    const mockRuns = [
-      {
-        id: 1,
-        application_id: 1,
-        pipeline_id: 1,
-        status: 'APPROVED' as const,
-        step_logs: [],
-        started_at: '2025-10-25T10:00:00Z',
-        completed_at: '2025-10-25T10:00:05Z',
-      },
-    ];
-
-    vi.mocked(runsApi.getAll).mockResolvedValue(mockRuns);
+  it('should fetch the first page of runs with the filters', async () => {
+    const mockPage = {
+      items: [
+        {
+          id: 1,
+          application_id: 1,
+          pipeline_id: 1,
+          status: 'APPROVED' as const,
+          started_at: '2025-10-25T10:00:00Z',
+          completed_at: '2025-10-25T10:00:05Z',
+          applicant_name: 'John Doe',
+          pipeline_name: 'Standard Pipeline',
+        },
+      ],
+      nextCursor: null,
+    };
+
+    vi.mocked(runsApi.list).mockResolvedValue(mockPage);
+
+    const { result } = renderHook(() => useRuns({ status: 'APPROVED', sort: '-created_at' }), {
+      wrapper: createWrapper(),
+    });
+
+    await waitFor(() => expect(result.current.isSuccess).toBe(true));
+
+    expect(runsApi.list).toHaveBeenCalledWith({
+      status: 'APPROVED',
+      sort: '-created_at',
+      include_names: true,
+      view: 'summary',
+      limit: RUNS_PAGE_SIZE,
+      after: undefined,
+    });
+    expect(result.current.data?.pages).toEqual([mockPage]);
+    expect(result.current.hasNextPage).toBe(false);
+  });
+
+  it('should fetch the next page with the cursor', async () => {
+    vi.mocked(runsApi.list)
+      .mockResolvedValueOnce({ items: [], nextCursor: 'cursor-1' })
+      .mockResolvedValueOnce({ items: [], nextCursor: null });
 
     const { result } = renderHook(() => useRuns(), {
       wrapper: createWrapper(),
     });
 
+    await waitFor(() => expect(result.current.hasNextPage).toBe(true));
+
+    result.current.fetchNextPage();
+
+    await waitFor(() => expect(result.current.data?.pages.length).toBe(2));
+
+    expect(runsApi.list).toHaveBeenLastCalledWith(
+      expect.objectContaining({ after: 'cursor-1' })
+    );
+    expect(result.current.hasNextPage).toBe(false);
+  });
+
+  it('should keep the previous runs while new filters load', async () => {
+    const firstPage = { items: [], nextCursor: 'cursor-1' };
+    let resolveFiltered: (page: typeof firstPage) => void = () => {};
+    vi.mocked(runsApi.list)
+      .mockResolvedValueOnce(firstPage)
+      .mockReturnValueOnce(new Promise((resolve) => (resolveFiltered = resolve)));
+
+    const { result, rerender } = renderHook(({ filters }) => useRuns(filters), {
+      wrapper: createWrapper(),
+      initialProps: { filters: {} as RunListFilters },
+    });
+
     await waitFor(() => expect(result.current.isSuccess).toBe(true));
 
-    expect(runsApi.getAll).toHaveBeenCalled();
-    expect(result.current.data).toEqual(mockRuns);
+    rerender({ filters: { status: 'REJECTED' } });
+
+    await waitFor(() => expect(runsApi.list).toHaveBeenCalledTimes(2));
+    expect(result.current.isLoading).toBe(false);
+    expect(result.current.isPlaceholderData).toBe(true);
+    expect(result.current.data?.pages).toEqual([firstPage]);
+
+    resolveFiltered({ items: [], nextCursor: null });
+
+    await waitFor(() => expect(result.current.isPlaceholderData).toBe(false));
+    expect(result.current.hasNextPage).toBe(false);
   });
 
   it('should handle errors when fetching runs', async () => {
     const error = new Error('Failed to fetch');
-    vi.mocked(runsApi.getAll).mockRejectedValue(error);
+    vi.mocked(runsApi.list).mockRejectedValue(error);
 
     const { result } = renderHook(() => useRuns(), {
       wrapper: createWrapper(),
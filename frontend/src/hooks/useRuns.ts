@@ -1,13 +1,33 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import {
+  keepPreviousData,
+  useQuery,
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from '@tanstack/react-query';
 import { runsApi } from '@/api';
-import { CreateRunRequest } from '@/types';
+import { CreateRunRequest, RunListFilters } from '@/types';
 
 const QUERY_KEY = 'runs';
+export const RUNS_PAGE_SIZE = 50;
 
-export const useRuns = () => {
-  return useQuery({
-    queryKey: [QUERY_KEY],
-    queryFn: runsApi.getAll,
+// Filtered, sorted run summaries with application and pipeline names, one
+// server page at a time. Step logs come from useRun. The previous results stay
+// in place while a new filter loads, so the page never drops back to a loader.
+export const useRuns = (filters: RunListFilters = {}) => {
+  return useInfiniteQuery({
+    queryKey: [QUERY_KEY, 'list', filters],
+    queryFn: ({ pageParam }) =>
+      runsApi.list({
+        ...filters,
+        include_names: true,
+        view: 'summary',
+        limit: RUNS_PAGE_SIZE,
+        after: pageParam,
+      }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+    placeholderData: keepPreviousData,
   });
 };
 
@@ -3,127 +3,109 @@ import { render, screen, waitFor } from '@/test/test-utils';
 import { fireEvent } from '@testing-library/react';
 import Runs from './Runs';
 import * as useRunsModule from '@/hooks/useRuns';
-import * as useApplicationsModule from '@/hooks/useApplications';
-import * as usePipelinesModule from '@/hooks/usePipelines';
+import { runsApi } from '@/api';
+import { RunPage, RunSummary, StepLog } from '@/types';
 
 // Mock the hooks
 vi.mock('@/hooks/useRuns');
-vi.mock('@/hooks/useApplications');
-vi.mock('@/hooks/usePipelines');
 
-describe('Runs Page', () => {
-  const mockApplications = [
-    {
-      id: 1,
-      applicant_name: 'John Doe',
-      amount: '10000',
-      monthly_income: '5000',
-      declared_debts: '1000',
-      country: 'US',
-      loan_purpose: 'home renovation',
-      created_at: '2025-10-25T10:00:00Z',
-    },
-    {
-      id: 2,
-      applicant_name: 'Jane Smith',
-      amount: '20000',
-      monthly_income: '6000',
-      declared_debts: '2000',
-      country: 'DE',
-      loan_purpose: 'car purchase',
-      created_at: '2025-10-25T11:00:00Z',
-    },
-  ];
+// useRuns result holding a single page of runs, as the server returned them
+const mockRunsResult = (items: RunSummary[] | undefined, overrides: Record<string, any> = {}) =>
+  ({
+    data: items ? { pages: [{ items, nextCursor: null }], pageParams: [undefined] } : undefined,
+    isLoading: false,
+    error: null,
+    hasNextPage: false,
+    fetchNextPage: vi.fn(),
+    isFetchingNextPage: false,
+    ...overrides,
+  }) as any;
 
-  const mockPipelines = [
-    {
-      id: 1,
-      name: 'Standard Pipeline',
-      description: 'Standard approval pipeline',
-      steps: [],
-      terminal_rules: [],
-      created_at: '2025-10-25T09:00:00Z',
-      updated_at: '2025-10-25T09:00:00Z',
-    },
-  ];
+const lastFilters = () => vi.mocked(useRunsModule.useRuns).mock.lastCall?.[0];
 
-  const mockRuns = [
+describe('Runs Page', () => {
+  // Newest first, as GET /runs?view=summary returns them by default
+  const mockRuns: RunSummary[] = [
     {
-      id: 1,
+      id: 3,
       application_id: 1,
       pipeline_id: 1,
-      status: 'APPROVED' as const,
-      step_logs: [
-        {
-          step_type: 'dti_rule' as const,
-          order: 1,
-          passed: true,
-          details: { dti: 0.2, max_dti: 0.4 },
-          executed_at: '2025-10-25T10:00:01Z',
-        },
-        {
-          step_type: 'amount_policy' as const,
-          order: 2,
-          passed: true,
-          details: { cap: 35000, amount: 10000, country: 'US' },
-          executed_at: '2025-10-25T10:00:02Z',
-        },
-      ],
-      started_at: '2025-10-25T10:00:00Z',
-      completed_at: '2025-10-25T10:00:05Z',
+      status: 'NEEDS_REVIEW' as const,
+      started_at: '2025-10-25T12:00:00Z',
+      completed_at: '2025-10-25T12:00:05Z',
+      applicant_name: 'John Doe',
+      pipeline_name: 'Standard Pipeline',
     },
     {
       id: 2,
       application_id: 2,
       pipeline_id: 1,
       status: 'REJECTED' as const,
-      step_logs: [
-        {
-          step_type: 'dti_rule' as const,
-          order: 1,
-          passed: false,
-          details: { dti: 0.5, max_dti: 0.4 },
-          executed_at: '2025-10-25T11:00:01Z',
-        },
-      ],
       started_at: '2025-10-25T11:00:00Z',
       completed_at: '2025-10-25T11:00:03Z',
+      applicant_name: 'Jane Smith',
+      pipeline_name: 'Standard Pipeline',
     },
     {
-      id: 3,
+      id: 1,
       application_id: 1,
       pipeline_id: 1,
-      status: 'NEEDS_REVIEW' as const,
-      step_logs: [],
-      started_at: '2025-10-25T12:00:00Z',
-      completed_at: '2025-10-25T12:00:05Z',
+      status: 'APPROVED' as const,
+      started_at: '2025-10-25T10:00:00Z',
+      completed_at: '2025-10-25T10:00:05Z',
+      applicant_name: 'John Doe',
+      pipeline_name: 'Standard Pipeline',
     },
   ];
 
+  // Step logs, as GET /runs/{id} returns them
+  const mockStepLogs: Record<number, StepLog[]> = {
+    1: [
+      {
+        step_type: 'dti_rule' as const,
+        order: 1,
+        passed: true,
+        details: { dti: 0.2, max_dti: 0.4 },
+        executed_at: '2025-10-25T10:00:01Z',
+      },
+      {
+        step_type: 'amount_policy' as const,
+        order: 2,
+        passed: true,
+        details: { cap: 35000, amount: 10000, country: 'US' },
+        executed_at: '2025-10-25T10:00:02Z',
+      },
+    ],
+    2: [
+      {
+        step_type: 'dti_rule' as const,
+        order: 1,
+        passed: false,
+        details: { dti: 0.5, max_dti: 0.4 },
+        executed_at: '2025-10-25T11:00:01Z',
+      },
+    ],
+    3: [],
+  };
+
   beforeEach(() => {
     vi.clearAllMocks();
 
-    // Set default mocks
-    vi.mocked(useApplicationsModule.useApplications).mockReturnValue({
-      data: mockApplications,
-      isLoading: false,
-      error: null,
-    } as any);
-
-    vi.mocked(usePipelinesModule.usePipelines).mockReturnValue({
-      data: mockPipelines,
-      isLoading: false,
-      error: null,
-    } as any);
+    vi.mocked(useRunsModule.useRun).mockImplementation(
+      (id) =>
+        ({
+          data: id ? { ...mockRuns.find((run) => run.id === id), step_logs: mockStepLogs[id] } : undefined,
+          isLoading: false,
+          error: null,
+        }) as any
+    );
   });
 
   describe('Loading State', () => {
     it('should show loading spinner when fetching runs', () => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: undefined,
-        isLoading: true,
-        error: null,
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(
+        mockRunsResult(undefined, { isLoading: true })
+      );
 
       render(<Runs />);
 
@@ -133,11 +115,9 @@ describe('Runs Page', () => {
 
   describe('Error State', () => {
     it('should show error message when fetch fails', () => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: undefined,
-        isLoading: false,
-        error: new Error('Network error'),
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(
+        mockRunsResult(undefined, { error: new Error('Network error') })
+      );
 
       render(<Runs />);
 
@@ -148,11 +128,7 @@ describe('Runs Page', () => {
 
   describe('Empty State', () => {
     it('should show empty message when no runs exist', () => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: [],
-        isLoading: false,
-        error: null,
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult([]));
 
       render(<Runs />);
 
@@ -163,28 +139,27 @@ describe('Runs Page', () => {
 
   describe('Runs Display', () => {
     beforeEach(() => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: mockRuns,
-        isLoading: false,
-        error: null,
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult(mockRuns));
+    });
+
+    it('should request the newest runs without filters', () => {
+      render(<Runs />);
+
+      expect(lastFilters()).toEqual({ status: undefined, search: undefined, sort: '-created_at' });
     });
 
     it('should display runs in table', () => {
       render(<Runs />);
 
-      // Check that application names are displayed (may appear multiple times)
+      // Names come embedded in the runs (may appear multiple times)
       expect(screen.getAllByText('John Doe').length).toBeGreaterThan(0);
       expect(screen.getAllByText('Jane Smith').length).toBeGreaterThan(0);
-
-      // Check that pipeline name is displayed
       expect(screen.getAllByText('Standard Pipeline').length).toBeGreaterThan(0);
     });
 
     it('should display statistics', () => {
       render(<Runs />);
 
-      // Total runs
       expect(screen.getByText('Total Runs')).toBeInTheDocument();
 
       // Check for statistics section existence (may appear in filters too)
@@ -193,27 +168,20 @@ describe('Runs Page', () => {
       expect(screen.getAllByText('Needs Review').length).toBeGreaterThan(0);
     });
 
-    it('should sort runs by most recent first', () => {
+    it('should keep the order the server returned', () => {
       render(<Runs />);
 
       const rows = screen.getAllByRole('row');
       // Each run creates 2 rows (main + collapsible). Skip header (index 0).
-      // First data row should be run ID 3 (most recent)
       expect(rows[1]).toHaveTextContent('3');
-      // Run ID 2 starts at index 3 (skip collapsible row at index 2)
       expect(rows[3]).toHaveTextContent('2');
-      // Run ID 1 starts at index 5 (skip collapsible row at index 4)
       expect(rows[5]).toHaveTextContent('1');
     });
   });
 
   describe('Expandable Rows', () => {
     beforeEach(() => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: mockRuns,
-        isLoading: false,
-        error: null,
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult(mockRuns));
     });
 
     it('should expand row to show step logs when clicked', async () => {
@@ -232,13 +200,35 @@ describe('Runs Page', () => {
       });
     });
 
+    it('should fetch step logs only for expanded rows', () => {
+      render(<Runs />);
+
+      expect(vi.mocked(useRunsModule.useRun).mock.calls.every(([id]) => id === null)).toBe(true);
+
+      fireEvent.click(screen.getAllByRole('button')[1]);
+
+      expect(useRunsModule.useRun).toHaveBeenLastCalledWith(2);
+    });
+
+    it('should show a loading message while step logs load', () => {
+      vi.mocked(useRunsModule.useRun).mockReturnValue({
+        data: undefined,
+        isLoading: true,
+        error: null,
+      } as any);
+
+      render(<Runs />);
+      fireEvent.click(screen.getAllByRole('button')[0]);
+
+      expect(screen.getByText(/loading step logs/i)).toBeInTheDocument();
+    });
+
     it('should show step details when row is expanded', async () => {
       render(<Runs />);
 
-      // Find the expand button for run ID 1 (which has step logs)
-      // Run ID 1 is sorted last (oldest), so it's the third run
+      // Run ID 1 (which has passing step logs) is the third run
       const expandButtons = screen.getAllByRole('button');
-      fireEvent.click(expandButtons[2]); // Third expand button
+      fireEvent.click(expandButtons[2]);
 
       await waitFor(() => {
         expect(screen.getByText('dti_rule')).toBeInTheDocument();
@@ -266,175 +256,135 @@ describe('Runs Page', () => {
     });
   });
 
-  describe('Search Functionality', () => {
+  describe('Server-side Filters', () => {
     beforeEach(() => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: mockRuns,
-        isLoading: false,
-        error: null,
-      } as any);
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult(mockRuns));
     });
 
-    it('should filter runs by application name', () => {
+    it('should search on the server once typing pauses', async () => {
       render(<Runs />);
 
       const searchInput = screen.getByPlaceholderText(/search by run id, application, or pipeline/i);
-      fireEvent.change(searchInput, { target: { value: 'jane' } });
+      fireEvent.change(searchInput, { target: { value: ' jane ' } });
 
-      // Should show only Jane Smith's run
-      expect(screen.getByText('Jane Smith')).toBeInTheDocument();
-      expect(screen.queryByText('John Doe')).not.toBeInTheDocument();
+      expect(lastFilters()?.search).toBeUndefined();
+      await waitFor(() => {
+        expect(lastFilters()?.search).toBe('jane');
+      });
     });
 
-    it('should filter runs by run ID', () => {
+    it('should filter by status on the server', () => {
       render(<Runs />);
 
-      const searchInput = screen.getByPlaceholderText(/search by run id, application, or pipeline/i);
-      fireEvent.change(searchInput, { target: { value: '2' } });
+      const statusFilter = screen.getByLabelText(/filter by status/i);
+      fireEvent.mouseDown(statusFilter);
+      fireEvent.click(screen.getByRole('option', { name: /rejected/i }));
 
-      // Should show only run ID 2
-      // Each run creates 2 rows, so: 1 header + 2 data rows = 3 total
-      const rows = screen.getAllByRole('row');
-      expect(rows.length).toBe(3);
+      expect(lastFilters()?.status).toBe('REJECTED');
     });
 
-    it('should show empty message when search has no results', () => {
+    it('should sort on the server', () => {
       render(<Runs />);
 
-      const searchInput = screen.getByPlaceholderText(/search by run id, application, or pipeline/i);
-      fireEvent.change(searchInput, { target: { value: 'nonexistent' } });
-
-      expect(screen.getByText(/no runs match your filters/i)).toBeInTheDocument();
-    });
-  });
+      const sortSelect = screen.getByLabelText(/sort by/i);
+      fireEvent.mouseDown(sortSelect);
+      fireEvent.click(screen.getByRole('option', { name: /oldest first/i }));
 
-  describe('Status Filter', () => {
-    beforeEach(() => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: mockRuns,
-        isLoading: false,
-        error: null,
-      } as any);
+      expect(lastFilters()?.sort).toBe('created_at');
     });
 
-    it('should filter runs by APPROVED status', () => {
+    it('should show empty message when filters match nothing', () => {
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult([]));
       render(<Runs />);
 
       const statusFilter = screen.getByLabelText(/filter by status/i);
       fireEvent.mouseDown(statusFilter);
+      fireEvent.click(screen.getByRole('option', { name: /approved/i }));
 
-      const approvedOption = screen.getByRole('option', { name: /approved/i });
-      fireEvent.click(approvedOption);
-
-      // Should only show approved runs (run ID 1)
-      // 1 header + 2 data rows (1 run * 2) = 3 total rows
-      const rows = screen.getAllByRole('row');
-      expect(rows.length).toBe(3);
+      expect(screen.getByText(/no runs match your filters/i)).toBeInTheDocument();
     });
+  });
 
-    it('should filter runs by REJECTED status', () => {
-      render(<Runs />);
-
-      const statusFilter = screen.getByLabelText(/filter by status/i);
-      fireEvent.mouseDown(statusFilter);
-
-      const rejectedOption = screen.getByRole('option', { name: /rejected/i });
-      fireEvent.click(rejectedOption);
-
-      // Should only show rejected runs (run ID 2)
-      // 1 header + 2 data rows (1 run * 2) = 3 total rows
-      const rows = screen.getAllByRole('row');
-      expect(rows.length).toBe(3);
-    });
+  describe('Refetching', () => {
+    it('should keep the filters mounted while a filtered page loads', async () => {
+      // The real hook, so a filter change goes through a pending request
+      const actual = await vi.importActual<typeof useRunsModule>('@/hooks/useRuns');
+      vi.mocked(useRunsModule.useRuns).mockImplementation(actual.useRuns);
+      let resolveSearch: (page: RunPage) => void = () => {};
+      const list = vi
+        .spyOn(runsApi, 'list')
+        .mockResolvedValueOnce({ items: mockRuns, nextCursor: null })
+        .mockReturnValueOnce(new Promise((resolve) => (resolveSearch = resolve)));
 
-    it('should filter runs by NEEDS_REVIEW status', () => {
       render(<Runs />);
+      await screen.findByText('Jane Smith');
 
-      const statusFilter = screen.getByLabelText(/filter by status/i);
-      fireEvent.mouseDown(statusFilter);
+      const searchInput = screen.getByPlaceholderText(/search by run id, application, or pipeline/i);
+      searchInput.focus();
+      fireEvent.change(searchInput, { target: { value: 'jane' } });
 
-      const needsReviewOption = screen.getByRole('option', { name: /needs review/i });
-      fireEvent.click(needsReviewOption);
+      await waitFor(() => expect(list).toHaveBeenCalledTimes(2));
+      expect(screen.queryByText(/loading run history/i)).not.toBeInTheDocument();
+      expect(screen.getByPlaceholderText(/search by run id, application, or pipeline/i)).toBe(searchInput);
+      expect(searchInput).toHaveFocus();
+      expect(screen.getByLabelText(/filter by status/i)).toBeInTheDocument();
+      expect(screen.getByRole('progressbar')).toBeInTheDocument();
+      expect(screen.getAllByText('John Doe')).toHaveLength(2);
 
-      // Should only show needs review runs (run ID 3)
-      // 1 header + 2 data rows (1 run * 2) = 3 total rows
-      const rows = screen.getAllByRole('row');
-      expect(rows.length).toBe(3);
+      resolveSearch({ items: [mockRuns[1]], nextCursor: null });
+
+      await waitFor(() => expect(screen.queryByText('John Doe')).not.toBeInTheDocument());
+      expect(screen.getByText('Jane Smith')).toBeInTheDocument();
+      expect(screen.queryByRole('progressbar')).not.toBeInTheDocument();
+      list.mockRestore();
     });
   });
 
-  describe('Combined Filters', () => {
-    beforeEach(() => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: mockRuns,
-        isLoading: false,
-        error: null,
-      } as any);
-    });
+  describe('Paging', () => {
+    it('should load the next page on request', () => {
+      const fetchNextPage = vi.fn();
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(
+        mockRunsResult(mockRuns, { hasNextPage: true, fetchNextPage })
+      );
 
-    it('should apply both search and status filters', () => {
       render(<Runs />);
 
-      // Search for "John" (appears in 2 runs: ID 1 and 3)
-      const searchInput = screen.getByPlaceholderText(/search by run id, application, or pipeline/i);
-      fireEvent.change(searchInput, { target: { value: 'john' } });
-
-      // Filter by APPROVED status (only run ID 1)
-      const statusFilter = screen.getByLabelText(/filter by status/i);
-      fireEvent.mouseDown(statusFilter);
-      const approvedOption = screen.getByRole('option', { name: /approved/i });
-      fireEvent.click(approvedOption);
+      expect(screen.getByText('Runs Shown')).toBeInTheDocument();
+      fireEvent.click(screen.getByRole('button', { name: /load more/i }));
 
-      // Should show only run ID 1
-      // 1 header + 2 data rows (1 run * 2) = 3 total rows
-      const rows = screen.getAllByRole('row');
-      expect(rows.length).toBe(3);
+      expect(fetchNextPage).toHaveBeenCalled();
     });
-  });
 
-  describe('Fallback Display', () => {
-    it('should show fallback text when application is not found', () => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: [
-          {
-            id: 99,
-            application_id: 999, // Non-existent application
-            pipeline_id: 1,
-            status: 'APPROVED' as const,
-            step_logs: [],
-            started_at: '2025-10-25T10:00:00Z',
-            completed_at: '2025-10-25T10:00:05Z',
-          },
-        ],
-        isLoading: false,
-        error: null,
-      } as any);
+    it('should hide the load more button on the last page', () => {
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(mockRunsResult(mockRuns));
 
       render(<Runs />);
 
-      expect(screen.getByText('App #999')).toBeInTheDocument();
+      expect(screen.queryByRole('button', { name: /load more/i })).not.toBeInTheDocument();
     });
+  });
 
-    it('should show fallback text when pipeline is not found', () => {
-      vi.mocked(useRunsModule.useRuns).mockReturnValue({
-        data: [
+  describe('Fallback Display', () => {
+    it('should show fallback text when names are missing', () => {
+      vi.mocked(useRunsModule.useRuns).mockReturnValue(
+        mockRunsResult([
           {
             id: 99,
-            application_id: 1,
-            pipeline_id: 999, // Non-existent pipeline
+            application_id: 999,
+            pipeline_id: 998,
             status: 'APPROVED' as const,
-            step_logs: [],
             started_at: '2025-10-25T10:00:00Z',
             completed_at: '2025-10-25T10:00:05Z',
+            applicant_name: null,
+            pipeline_name: null,
           },
-        ],
-        isLoading: false,
-        error: null,
-      } as any);
+        ])
+      );
 
       render(<Runs />);
 
-      expect(screen.getByText('Pipeline #999')).toBeInTheDocument();
+      expect(screen.getByText('App #999')).toBeInTheDocument();
+      expect(screen.getByText('Pipeline #998')).toBeInTheDocument();
     });
   });
 });
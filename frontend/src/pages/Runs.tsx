@@ -1,4 +1,4 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect } from 'react';
 import {
   Box,
   Typography,
@@ -17,6 +17,8 @@ import {
   Stack,
   Grid,
   Alert,
+  Button,
+  LinearProgress,
 } from '@mui/material';
 import {
   KeyboardArrowDown as ExpandMoreIcon,
@@ -24,17 +26,19 @@ import {
 } from '@mui/icons-material';
 import { format } from 'date-fns';
 import { Loading, StatusChip } from '@/components/common';
-import { useRuns } from '@/hooks/useRuns';
-import { useApplications } from '@/hooks/useApplications';
-import { usePipelines } from '@/hooks/usePipelines';
-import { Run, RunStatus } from '@/types';
+import { useRun, useRuns } from '@/hooks/useRuns';
+import { RunListFilters, RunSortKey, RunStatus, RunSummary } from '@/types';
 
 const RunRow: React.FC<{
-  run: Run;
+  run: RunSummary;
   applicationName: string;
   pipelineName: string;
 }> = ({ run, applicationName, pipelineName }) => {
   const [open, setOpen] = useState(false);
+  // The list carries no step logs; load them when the row is first expanded
+  const { data: details, isLoading: detailsLoading, error: detailsError } = useRun(
+    open ? run.id : null
+  );
 
   return (
     <>
@@ -64,49 +68,57 @@ const RunRow: React.FC<{
               <Typography variant="h6" gutterBottom component="div">
                 Step Execution Logs
               </Typography>
-              <Table size="small">
-                <TableHead>
-                  <TableRow>
-                    <TableCell>Step Type</TableCell>
-                    <TableCell>Order</TableCell>
-                    <TableCell>Status</TableCell>
-                    <TableCell>Executed At</TableCell>
-                    <TableCell>Details</TableCell>
-                  </TableRow>
-                </TableHead>
-                <TableBody>
-                  {run.step_logs.map((log, index) => (
-                    <TableRow key={index}>
-                      <TableCell>{log.step_type}</TableCell>
-                      <TableCell>{log.order}</TableCell>
-                      <TableCell>
-                        <Chip
-                          label={log.passed ? 'Passed' : 'Failed'}
-                          color={log.passed ? 'success' : 'error'}
-                          size="small"
-                        />
-                      </TableCell>
-                      <TableCell>
-                        {format(new Date(log.executed_at), 'HH:mm:ss')}
-                      </TableCell>
-                      <TableCell>
-                        <Typography
-                          variant="body2"
-                          component="pre"
-                          sx={{
-                            fontFamily: 'monospace',
-                            fontSize: '0.75rem',
-                            whiteSpace: 'pre-wrap',
-                            wordBreak: 'break-word',
-                          }}
-                        >
-                          {JSON.stringify(log.details, null, 2)}
-                        </Typography>
-                      </TableCell>
+              {detailsLoading && <Loading message="Loading step logs..." />}
+              {detailsError && (
+                <Alert severity="error">
+                  Failed to load step logs: {(detailsError as Error).message}
+                </Alert>
+              )}
+              {details && (
+                <Table size="small">
+                  <TableHead>
+                    <TableRow>
+                      <TableCell>Step Type</TableCell>
+                      <TableCell>Order</TableCell>
+                      <TableCell>Status</TableCell>
+                      <TableCell>Executed At</TableCell>
+                      <TableCell>Details</TableCell>
                     </TableRow>
-                  ))}
-                </TableBody>
-              </Table>
+                  </TableHead>
+                  <TableBody>
+                    {details.step_logs.map((log, index) => (
+                      <TableRow key={index}>
+                        <TableCell>{log.step_type}</TableCell>
+                        <TableCell>{log.order}</TableCell>
+                        <TableCell>
+                          <Chip
+                            label={log.skipped ? 'Skipped' : log.passed ? 'Passed' : 'Failed'}
+                            color={log.skipped ? 'default' : log.passed ? 'success' : 'error'}
+                            size="small"
+                          />
+                        </TableCell>
+                        <TableCell>
+                          {format(new Date(log.executed_at), 'HH:mm:ss')}
+                        </TableCell>
+                        <TableCell>
+                          <Typography
+                            variant="body2"
+                            component="pre"
+                            sx={{
+                              fontFamily: 'monospace',
+                              fontSize: '0.75rem',
+                              whiteSpace: 'pre-wrap',
+                              wordBreak: 'break-word',
+                            }}
+                          >
+                            {JSON.stringify(log.details, null, 2)}
+                          </Typography>
+                        </TableCell>
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              )}
             </Box>
           </Collapse>
         </TableCell>
@@ -115,60 +127,62 @@ const RunRow: React.FC<{
   );
 };
 
+const SORT_OPTIONS: { value: RunSortKey; label: string }[] = [
+  { value: '-created_at', label: 'Newest first' },
+  { value: 'created_at', label: 'Oldest first' },
+  { value: 'applicant_name', label: 'Applicant (A-Z)' },
+  { value: 'pipeline_name', label: 'Pipeline (A-Z)' },
+  { value: 'status', label: 'Status' },
+];
+
+const SEARCH_DEBOUNCE_MS = 300;
+
 const Runs: React.FC = () => {
   const [statusFilter, setStatusFilter] = useState<RunStatus | 'ALL'>('ALL');
   const [searchTerm, setSearchTerm] = useState('');
+  const [search, setSearch] = useState('');
+  const [sort, setSort] = useState<RunSortKey>('-created_at');
 
-  const { data: runs, isLoading: runsLoading, error: runsError } = useRuns();
-  const { data: applications } = useApplications();
-  const { data: pipelines } = usePipelines();
-
-  // Create lookup maps for applications and pipelines
-  const applicationMap = useMemo(() => {
-    if (!applications) return new Map();
-    return new Map(applications.map((app) => [app.id, app.applicant_name]));
-  }, [applications]);
-
-  const pipelineMap = useMemo(() => {
-    if (!pipelines) return new Map();
-    return new Map(pipelines.map((pipeline) => [pipeline.id, pipeline.name]));
-  }, [pipelines]);
+  // Wait for a pause in typing before asking the server
+  useEffect(() => {
+    const timer = setTimeout(() => setSearch(searchTerm.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
-  // Filter and search runs
-  const filteredRuns = useMemo(() => {
-    if (!runs) return [];
-
-    return runs.filter((run) => {
-      // Status filter
-      if (statusFilter !== 'ALL' && run.status !== statusFilter) {
-        return false;
-      }
+  const filters = useMemo<RunListFilters>(
+    () => ({
+      status: statusFilter === 'ALL' ? undefined : statusFilter,
+      search: search || undefined,
+      sort,
+    }),
+    [statusFilter, search, sort]
+  );
+  const isFiltered = statusFilter !== 'ALL' || search !== '';
 
-      // Search filter
-      if (searchTerm) {
-        const searchLower = searchTerm.toLowerCase();
-        const applicationName = applicationMap.get(run.application_id) || '';
-        const pipelineName = pipelineMap.get(run.pipeline_id) || '';
+  const {
+    data,
+    isLoading: runsLoading,
+    error: runsError,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+    isPlaceholderData,
+  } = useRuns(filters);
 
-        return (
-          run.id.toString().includes(searchLower) ||
-          applicationName.toLowerCase().includes(searchLower) ||
-          pipelineName.toLowerCase().includes(searchLower)
-        );
-      }
+  // Filtering, search and sorting happen on the server, pages arrive in order
+  const runs = useMemo(() => data?.pages.flatMap((page) => page.items) ?? [], [data]);
 
-      return true;
+  const statusCounts = useMemo(() => {
+    const counts: Record<RunStatus, number> = { APPROVED: 0, REJECTED: 0, NEEDS_REVIEW: 0 };
+    runs.forEach((run) => {
+      counts[run.status] = (counts[run.status] ?? 0) + 1;
     });
-  }, [runs, statusFilter, searchTerm, applicationMap, pipelineMap]);
+    return counts;
+  }, [runs]);
 
-  // Sort runs by started_at descending (most recent first)
-  const sortedRuns = useMemo(() => {
-    return [...filteredRuns].sort(
-      (a, b) => new Date(b.started_at).getTime() - new Date(a.started_at).getTime()
-    );
-  }, [filteredRuns]);
-
-  if (runsLoading) {
+  // Only the first load replaces the page; later filter changes keep the
+  // controls mounted and show the previous runs until the new ones arrive
+  if (runsLoading && !data) {
     return <Loading message="Loading run history..." />;
   }
 
@@ -225,16 +239,32 @@ const Runs: React.FC = () => {
               <MenuItem value="NEEDS_REVIEW">Needs Review</MenuItem>
             </TextField>
           </Grid>
+          <Grid item xs={12} sm={6} md={4}>
+            <TextField
+              fullWidth
+              select
+              size="small"
+              label="Sort by"
+              value={sort}
+              onChange={(e) => setSort(e.target.value as RunSortKey)}
+            >
+              {SORT_OPTIONS.map((option) => (
+                <MenuItem key={option.value} value={option.value}>
+                  {option.label}
+                </MenuItem>
+              ))}
+            </TextField>
+          </Grid>
         </Grid>
       </Paper>
 
-      {/* Statistics */}
-      {runs && runs.length > 0 && (
+      {/* Statistics for the runs loaded so far */}
+      {runs.length > 0 && (
         <Paper sx={{ p: 2, mb: 3 }}>
           <Stack direction="row" spacing={3}>
             <Box>
               <Typography variant="body2" color="text.secondary">
-                Total Runs
+                {hasNextPage ? 'Runs Shown' : 'Total Runs'}
               </Typography>
               <Typography variant="h6">{runs.length}</Typography>
             </Box>
@@ -243,7 +273,7 @@ const Runs: React.FC = () => {
                 Approved
               </Typography>
               <Typography variant="h6" color="success.main">
-                {runs.filter((r) => r.status === 'APPROVED').length}
+                {statusCounts.APPROVED}
               </Typography>
             </Box>
             <Box>
@@ -251,7 +281,7 @@ const Runs: React.FC = () => {
                 Rejected
               </Typography>
               <Typography variant="h6" color="error.main">
-                {runs.filter((r) => r.status === 'REJECTED').length}
+                {statusCounts.REJECTED}
               </Typography>
             </Box>
             <Box>
@@ -259,7 +289,7 @@ const Runs: React.FC = () => {
                 Needs Review
               </Typography>
               <Typography variant="h6" color="warning.main">
-                {runs.filter((r) => r.status === 'NEEDS_REVIEW').length}
+                {statusCounts.NEEDS_REVIEW}
               </Typography>
             </Box>
           </Stack>
@@ -267,17 +297,15 @@ const Runs: React.FC = () => {
       )}
 
       {/* Runs Table */}
+      {isPlaceholderData && <LinearProgress sx={{ mb: 1 }} />}
       <TableContainer component={Paper}>
-        {sortedRuns.length === 0 ? (
+        {runs.length === 0 ? (
           <Box sx={{ p: 4, textAlign: 'center' }}>
             <Typography variant="body1" color="text.secondary">
-              {runs && runs.length > 0
-                ? 'No runs match your filters'
-                : 'No runs have been executed yet'}
+              {isFiltered ? 'No runs match your filters' : 'No runs have been executed yet'}
             </Typography>
             <Typography variant="body2" color="text.secondary" sx={{ mt: 1 }}>
-              {runs && runs.length === 0 &&
-                'Go to the Run Panel to execute a pipeline on an application'}
+              {!isFiltered && 'Go to the Run Panel to execute a pipeline on an application'}
             </Typography>
           </Box>
         ) : (
@@ -294,18 +322,26 @@ const Runs: React.FC = () => {
               </TableRow>
             </TableHead>
             <TableBody>
-              {sortedRuns.map((run) => (
+              {runs.map((run) => (
                 <RunRow
                   key={run.id}
                   run={run}
-                  applicationName={applicationMap.get(run.application_id) || `App #${run.application_id}`}
-                  pipelineName={pipelineMap.get(run.pipeline_id) || `Pipeline #${run.pipeline_id}`}
+                  applicationName={run.applicant_name || `App #${run.application_id}`}
+                  pipelineName={run.pipeline_name || `Pipeline #${run.pipeline_id}`}
                 />
               ))}
             </TableBody>
           </Table>
         )}
       </TableContainer>
+
+      {hasNextPage && (
+        <Box sx={{ mt: 2, textAlign: 'center' }}>
+          <Button variant="outlined" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };
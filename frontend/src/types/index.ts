@@ -26,6 +26,8 @@ export interface StepConfig {
   step_type: StepType;
   order: number;
   params: Record<string, any>;
+  timeout_ms?: number | null;
+  on_timeout?: 'pass' | 'fail';
 }
 
 export interface TerminalRuleCondition {
@@ -47,6 +49,8 @@ export interface Pipeline {
   description: string;
   steps: StepConfig[];
   terminal_rules: TerminalRule[];
+  lazy_evaluation?: boolean;
+  deadline_ms?: number | null;
   created_at: string;
   updated_at: string;
 }
@@ -66,7 +70,9 @@ export type RunStatus = 'APPROVED' | 'REJECTED' | 'NEEDS_REVIEW';
 export interface StepLog {
   step_type: StepType;
   order: number;
-  passed: boolean;
+  passed: boolean | null;
+  skipped?: boolean;
+  timed_out?: boolean;
   details: Record<string, any>;
   executed_at: string;
 }
@@ -86,6 +92,47 @@ export interface CreateRunRequest {
   pipeline_id: number;
 }
 
+// A run as listed by GET /runs; names are filled in with include_names
+export interface RunListItem extends Run {
+  applicant_name?: string | null;
+  pipeline_name?: string | null;
+}
+
+// A run listed with view=summary: no step logs, fetch them from GET /runs/{id}
+export type RunSummary = Omit<RunListItem, 'step_logs'>;
+
+export type RunSortKey =
+  | '-created_at'
+  | 'created_at'
+  | 'status'
+  | '-status'
+  | 'applicant_name'
+  | '-applicant_name'
+  | 'pipeline_name'
+  | '-pipeline_name';
+
+export interface RunListFilters {
+  status?: RunStatus;
+  search?: string;
+  sort?: RunSortKey;
+  application_id?: number;
+  pipeline_id?: number;
+  created_from?: string;
+  created_to?: string;
+}
+
+export interface RunListParams extends RunListFilters {
+  after?: string;
+  limit?: number;
+  include_names?: boolean;
+  view?: 'full' | 'summary';
+}
+
+export interface RunPage {
+  items: RunSummary[];
+  nextCursor: string | null;
+}
+
 // Step Definition Types (for UI)
 export interface StepDefinition {
   type: StepType;